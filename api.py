@@ -1,11 +1,17 @@
 import asyncio
+import os
 from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 import main as scraper_main
+from utils import metrics
+from utils.browser_pool import BrowserPool
 from utils.logger import Logger
+from utils.run_queue import SUCCEEDED, RunQueue
+from utils.streaming import STREAM_FORMATS, iter_stream_events
 
 
 app = FastAPI(title="Upwork Job Scraper API", version="1.0.0")
@@ -57,6 +63,24 @@ async def on_startup() -> None:
     if not hasattr(scraper_main, "logger") or scraper_main.logger is None:
         logger_obj = Logger(level="DEBUG")
         scraper_main.logger = logger_obj.get_logger()
+    # Keep warm browsers for the whole server lifetime instead of launching one per request
+    app.state.browser_pool = BrowserPool(
+        size=int(os.environ.get("BROWSER_POOL_SIZE", 2)),
+        max_uses=int(os.environ.get("BROWSER_POOL_MAX_USES", 20)),
+    )
+    await app.state.browser_pool.start()
+    # Background runs submitted through /runs/*
+    app.state.run_queue = RunQueue(
+        lambda input_data, progress: scraper_main.main(input_data, browser_pool=app.state.browser_pool, progress=progress),
+        concurrency=int(os.environ.get("MAX_CONCURRENT_RUNS", 2)),
+    )
+    app.state.run_queue.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await app.state.run_queue.stop()
+    await app.state.browser_pool.close()
 
 
 @app.get("/health")
@@ -64,78 +88,155 @@ async def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def validate_credentials(username: Optional[str], password: Optional[str]) -> None:
+    if username and not password:
+        raise HTTPException(status_code=400, detail="Username provided but password is missing")
+    elif password and not username:
+        raise HTTPException(status_code=400, detail="Password provided but username is missing")
+
+
+def build_keyword_input(payload: KeywordRequest) -> Dict[str, Any]:
+    validate_credentials(payload.username, payload.password)
+    return {
+        "credentials": {"username": payload.username, "password": payload.password},
+        "search": {"query": payload.query, "limit": payload.limit},
+        "general": {"save_csv": True},
+    }
+
+
+def build_advanced_input(payload: AdvancedSearchRequest) -> Dict[str, Any]:
+    validate_credentials(payload.username, payload.password)
+
+    # Build search configuration from advanced request
+    search_config = {
+        "query": payload.query,
+        "limit": payload.limit
+    }
+
+    # Add optional filters
+    if payload.category:
+        search_config["category"] = payload.category
+    if payload.hourly_min is not None:
+        search_config["hourly_min"] = payload.hourly_min
+    if payload.hourly_max is not None:
+        search_config["hourly_max"] = payload.hourly_max
+    if payload.hires_min is not None:
+        search_config["hires_min"] = payload.hires_min
+    if payload.hires_max is not None:
+        search_config["hires_max"] = payload.hires_max
+    if payload.payment_verified is not None:
+        search_config["payment_verified"] = payload.payment_verified
+    if payload.hourly is not None:
+        search_config["hourly"] = payload.hourly
+    if payload.fixed is not None:
+        search_config["fixed"] = payload.fixed
+    if payload.sort and payload.sort != "relevance":
+        search_config["sort"] = payload.sort
+
+    return {
+        "credentials": {"username": payload.username, "password": payload.password},
+        "search": search_config,
+        "general": {"save_csv": True},
+    }
+
+
 @app.post("/run/keyword")
 async def run_with_keyword(payload: KeywordRequest) -> Dict[str, Any]:
+    input_data = build_keyword_input(payload)
+    progress = {}
     try:
-        # Validate credentials if provided
-        if payload.username and not payload.password:
-            raise HTTPException(status_code=400, detail="Username provided but password is missing")
-        elif payload.password and not payload.username:
-            raise HTTPException(status_code=400, detail="Password provided but username is missing")
-        
-        input_data: Dict[str, Any] = {
-            "credentials": {"username": payload.username, "password": payload.password},
-            "search": {"query": payload.query, "limit": payload.limit},
-            "general": {"save_csv": True},
-        }
-        results = await scraper_main.main(input_data)
-        return {"count": len(results), "results": results}
+        results = await scraper_main.main(input_data, browser_pool=app.state.browser_pool, progress=progress)
+        return {"count": len(results), "results": results, "timing": progress.get("timing")}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 @app.post("/run/advanced")
 async def run_with_advanced_filters(payload: AdvancedSearchRequest) -> Dict[str, Any]:
+    input_data = build_advanced_input(payload)
+    progress = {}
     try:
-        # Validate credentials if provided
-        if payload.username and not payload.password:
-            raise HTTPException(status_code=400, detail="Username provided but password is missing")
-        elif payload.password and not payload.username:
-            raise HTTPException(status_code=400, detail="Password provided but username is missing")
-        
-        # Build search configuration from advanced request
-        search_config = {
-            "query": payload.query,
-            "limit": payload.limit
-        }
-        
-        # Add optional filters
-        if payload.category:
-            search_config["category"] = payload.category
-        if payload.hourly_min is not None:
-            search_config["hourly_min"] = payload.hourly_min
-        if payload.hourly_max is not None:
-            search_config["hourly_max"] = payload.hourly_max
-        if payload.hires_min is not None:
-            search_config["hires_min"] = payload.hires_min
-        if payload.hires_max is not None:
-            search_config["hires_max"] = payload.hires_max
-        if payload.payment_verified is not None:
-            search_config["payment_verified"] = payload.payment_verified
-        if payload.hourly is not None:
-            search_config["hourly"] = payload.hourly
-        if payload.fixed is not None:
-            search_config["fixed"] = payload.fixed
-        if payload.sort and payload.sort != "relevance":
-            search_config["sort"] = payload.sort
-        
-        input_data: Dict[str, Any] = {
-            "credentials": {"username": payload.username, "password": payload.password},
-            "search": search_config,
-            "general": {"save_csv": True},
-        }
-        results = await scraper_main.main(input_data)
-        return {"count": len(results), "results": results}
+        results = await scraper_main.main(input_data, browser_pool=app.state.browser_pool, progress=progress)
+        return {"count": len(results), "results": results, "timing": progress.get("timing")}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 @app.post("/run/json")
 async def run_with_json(payload: JsonInputRequest) -> Dict[str, Any]:
+    progress = {}
     try:
-        results = await scraper_main.main(payload.input)
-        return {"count": len(results), "results": results}
+        results = await scraper_main.main(payload.input, browser_pool=app.state.browser_pool, progress=progress)
+        return {"count": len(results), "results": results, "timing": progress.get("timing")}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+# Non-blocking runs: submit returns a run ID at once, then poll the status and fetch the results
+
+@app.post("/runs/keyword", status_code=202)
+async def submit_keyword_run(payload: KeywordRequest) -> Dict[str, Any]:
+    return await app.state.run_queue.submit(build_keyword_input(payload))
+
+
+@app.post("/runs/advanced", status_code=202)
+async def submit_advanced_run(payload: AdvancedSearchRequest) -> Dict[str, Any]:
+    return await app.state.run_queue.submit(build_advanced_input(payload))
+
+
+@app.post("/runs/json", status_code=202)
+async def submit_json_run(payload: JsonInputRequest) -> Dict[str, Any]:
+    return await app.state.run_queue.submit(payload.input)
+
+
+@app.get("/runs")
+async def list_runs() -> Dict[str, Any]:
+    return {"runs": app.state.run_queue.list_runs()}
+
+
+@app.get("/runs/{run_id}")
+async def get_run(run_id: str) -> Dict[str, Any]:
+    status = app.state.run_queue.status(run_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown run ID")
+    return status
+
+
+@app.get("/runs/{run_id}/results")
+async def get_run_results(run_id: str) -> Dict[str, Any]:
+    status = app.state.run_queue.status(run_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown run ID")
+    if status["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Run is {status['status']}, results are not available")
+    results = app.state.run_queue.results(run_id)
+    return {"count": len(results), "results": results, "timing": status["progress"].get("timing")}
+
+
+# Streaming runs: every job is sent as soon as it is scraped, followed by a summary event
+
+def stream_response(input_data: Dict[str, Any], format: str) -> StreamingResponse:
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(STREAM_FORMATS)}")
+    jobs = scraper_main.stream_jobs(input_data, browser_pool=app.state.browser_pool)
+    return StreamingResponse(iter_stream_events(jobs, format), media_type=STREAM_FORMATS[format])
+
+
+@app.post("/stream/keyword")
+async def stream_keyword_run(payload: KeywordRequest, format: str = "ndjson") -> StreamingResponse:
+    return stream_response(build_keyword_input(payload), format)
+
+
+@app.post("/stream/advanced")
+async def stream_advanced_run(payload: AdvancedSearchRequest, format: str = "ndjson") -> StreamingResponse:
+    return stream_response(build_advanced_input(payload), format)
+
+
+@app.post("/stream/json")
+async def stream_json_run(payload: JsonInputRequest, format: str = "ndjson") -> StreamingResponse:
+    return stream_response(payload.input, format)
@@ -1,11 +1,17 @@
 import asyncio
+import os
+import threading
 from typing import Any, Dict
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flasgger import Swagger
 
 import main as scraper_main
+from utils import metrics
+from utils.browser_pool import BrowserPool
 from utils.logger import Logger
+from utils.run_queue import SUCCEEDED, RunQueue
+from utils.streaming import STREAM_FORMATS, iter_stream_events
 
 
 app = Flask(__name__)
@@ -34,11 +40,184 @@ def ensure_logger() -> None:
         scraper_main.logger = logger_obj.get_logger()
 
 
+# Playwright objects are bound to the event loop that created them, so every run is executed on
+# one long-lived loop thread where the shared browser pool lives (instead of asyncio.run per request)
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="scraper-loop", daemon=True).start()
+browser_pool = BrowserPool(
+    size=int(os.environ.get("BROWSER_POOL_SIZE", 2)),
+    max_uses=int(os.environ.get("BROWSER_POOL_MAX_USES", 20)),
+)
+
+
+run_queue = RunQueue(
+    lambda input_data, progress: scraper_main.main(input_data, browser_pool=browser_pool, progress=progress),
+    concurrency=int(os.environ.get("MAX_CONCURRENT_RUNS", 2)),
+)
+
+
+def run_on_loop(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def call_on_loop(fn, *args):
+    # the run queue and the runs' progress counters are only changed on the loop's thread, read them there too
+    async def call():
+        return fn(*args)
+    return run_on_loop(call())
+
+
+def run_scraper(input_data: Dict[str, Any], progress: Dict[str, Any] | None = None) -> list:
+    return run_on_loop(scraper_main.main(input_data, browser_pool=browser_pool, progress=progress))
+
+
+def validate_credentials(username, password) -> None:
+    if username and not password:
+        raise ValueError("Username provided but password is missing")
+    elif password and not username:
+        raise ValueError("Password provided but username is missing")
+
+
+def build_keyword_input(payload: Dict[str, Any]) -> Dict[str, Any]:
+    query = payload.get("query")
+    if not query or not isinstance(query, str):
+        raise ValueError("Field 'query' (string) is required")
+    limit = payload.get("limit", 50)
+    try:
+        limit = int(limit)
+    except Exception:
+        raise ValueError("Field 'limit' must be an integer")
+    # Extract optional credentials
+    username = payload.get("username")
+    password = payload.get("password")
+    validate_credentials(username, password)
+    return {
+        "credentials": {"username": username, "password": password},
+        "search": {"query": query, "limit": limit},
+        "general": {"save_csv": True},
+    }
+
+
+def build_advanced_input(payload: Dict[str, Any]) -> Dict[str, Any]:
+    query = payload.get("query")
+    if not query or not isinstance(query, str):
+        raise ValueError("Field 'query' (string) is required")
+
+    # Build search configuration
+    search_config = {
+        "query": query,
+        "limit": payload.get("limit", 50)
+    }
+
+    # Add optional filters
+    if "category" in payload and payload["category"]:
+        search_config["category"] = payload["category"]
+    if "hourly_min" in payload and payload["hourly_min"] is not None:
+        search_config["hourly_min"] = int(payload["hourly_min"])
+    if "hourly_max" in payload and payload["hourly_max"] is not None:
+        search_config["hourly_max"] = int(payload["hourly_max"])
+    if "hires_min" in payload and payload["hires_min"] is not None:
+        search_config["hires_min"] = int(payload["hires_min"])
+    if "hires_max" in payload and payload["hires_max"] is not None:
+        search_config["hires_max"] = int(payload["hires_max"])
+    if "payment_verified" in payload:
+        search_config["payment_verified"] = bool(payload["payment_verified"])
+    if "hourly" in payload:
+        search_config["hourly"] = bool(payload["hourly"])
+    if "fixed" in payload:
+        search_config["fixed"] = bool(payload["fixed"])
+    if "sort" in payload and payload["sort"]:
+        search_config["sort"] = payload["sort"]
+
+    # Extract optional credentials
+    username = payload.get("username")
+    password = payload.get("password")
+    validate_credentials(username, password)
+    return {
+        "credentials": {"username": username, "password": password},
+        "search": search_config,
+        "general": {"save_csv": True},
+    }
+
+
+def build_json_input(body: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(body, dict):
+        raise ValueError("JSON body must be an object")
+    if "input" not in body or not isinstance(body["input"], dict):
+        raise ValueError("Field 'input' (object) is required")
+    return body["input"]
+
+
+def run_blocking(build_input):
+    try:
+        input_data = build_input(request.get_json(force=True, silent=False) or {})
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    try:
+        ensure_logger()
+        progress = {}
+        results = run_scraper(input_data, progress)
+        return jsonify({"count": len(results), "results": results, "timing": progress.get("timing")}), 200
+    except Exception as exc:
+        return jsonify({"error": str(exc)}), 500
+
+
+def iter_on_loop(agen):
+    """Drive an async generator on the scraper loop from a (sync) Flask response generator."""
+    try:
+        while True:
+            try:
+                yield run_on_loop(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        # client disconnected or the stream ended: release the browser, HTTP client and workers
+        run_on_loop(agen.aclose())
+
+
+def stream_run(build_input):
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in STREAM_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(STREAM_FORMATS)}"}), 400
+    try:
+        input_data = build_input(request.get_json(force=True, silent=False) or {})
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    ensure_logger()
+    events = iter_stream_events(scraper_main.stream_jobs(input_data, browser_pool=browser_pool), fmt)
+    return Response(iter_on_loop(events), mimetype=STREAM_FORMATS[fmt])
+
+
+def submit_run(build_input):
+    try:
+        input_data = build_input(request.get_json(force=True, silent=False) or {})
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    ensure_logger()
+    return jsonify(run_on_loop(run_queue.submit(input_data))), 202
+
+
 @app.route("/health", methods=["GET"]) 
 def health() -> tuple[Dict[str, str], int]:
     return jsonify({"status": "ok"}), 200
 
 
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Prometheus metrics of the server's runs.
+    ---
+    tags:
+      - monitoring
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Metrics in the Prometheus text format
+    """
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
 @app.route("/run/keyword", methods=["POST"]) 
 def run_with_keyword():
     """
@@ -88,36 +267,7 @@ def run_with_keyword():
       500:
         description: Internal error
     """
-    try:
-        payload = request.get_json(force=True, silent=False) or {}
-        query = payload.get("query")
-        if not query or not isinstance(query, str):
-            return jsonify({"error": "Field 'query' (string) is required"}), 400
-        limit = payload.get("limit", 50)
-        try:
-            limit = int(limit)
-        except Exception:
-            return jsonify({"error": "Field 'limit' must be an integer"}), 400
-        # Extract optional credentials
-        username = payload.get("username")
-        password = payload.get("password")
-        
-        # Validate credentials if provided
-        if username and not password:
-            return jsonify({"error": "Username provided but password is missing"}), 400
-        elif password and not username:
-            return jsonify({"error": "Password provided but username is missing"}), 400
-        
-        ensure_logger()
-        input_data: Dict[str, Any] = {
-            "credentials": {"username": username, "password": password},
-            "search": {"query": query, "limit": limit},
-            "general": {"save_csv": True},
-        }
-        results = asyncio.run(scraper_main.main(input_data))
-        return jsonify({"count": len(results), "results": results}), 200
-    except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
+    return run_blocking(build_keyword_input)
 
 
 @app.route("/run/advanced", methods=["POST"]) 
@@ -201,58 +351,7 @@ def run_with_advanced_filters():
       500:
         description: Internal error
     """
-    try:
-        payload = request.get_json(force=True, silent=False) or {}
-        query = payload.get("query")
-        if not query or not isinstance(query, str):
-            return jsonify({"error": "Field 'query' (string) is required"}), 400
-        
-        # Build search configuration
-        search_config = {
-            "query": query,
-            "limit": payload.get("limit", 50)
-        }
-        
-        # Add optional filters
-        if "category" in payload and payload["category"]:
-            search_config["category"] = payload["category"]
-        if "hourly_min" in payload and payload["hourly_min"] is not None:
-            search_config["hourly_min"] = int(payload["hourly_min"])
-        if "hourly_max" in payload and payload["hourly_max"] is not None:
-            search_config["hourly_max"] = int(payload["hourly_max"])
-        if "hires_min" in payload and payload["hires_min"] is not None:
-            search_config["hires_min"] = int(payload["hires_min"])
-        if "hires_max" in payload and payload["hires_max"] is not None:
-            search_config["hires_max"] = int(payload["hires_max"])
-        if "payment_verified" in payload:
-            search_config["payment_verified"] = bool(payload["payment_verified"])
-        if "hourly" in payload:
-            search_config["hourly"] = bool(payload["hourly"])
-        if "fixed" in payload:
-            search_config["fixed"] = bool(payload["fixed"])
-        if "sort" in payload and payload["sort"]:
-            search_config["sort"] = payload["sort"]
-        
-        # Extract optional credentials
-        username = payload.get("username")
-        password = payload.get("password")
-        
-        # Validate credentials if provided
-        if username and not password:
-            return jsonify({"error": "Username provided but password is missing"}), 400
-        elif password and not username:
-            return jsonify({"error": "Password provided but username is missing"}), 400
-        
-        ensure_logger()
-        input_data: Dict[str, Any] = {
-            "credentials": {"username": username, "password": password},
-            "search": search_config,
-            "general": {"save_csv": True},
-        }
-        results = asyncio.run(scraper_main.main(input_data))
-        return jsonify({"count": len(results), "results": results}), 200
-    except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
+    return run_blocking(build_advanced_input)
 
 
 @app.route("/run/json", methods=["POST"]) 
@@ -299,17 +398,239 @@ def run_with_json():
       500:
         description: Internal error
     """
-    try:
-        body = request.get_json(force=True, silent=False) or {}
-        if not isinstance(body, dict):
-            return jsonify({"error": "JSON body must be an object"}), 400
-        if "input" not in body or not isinstance(body["input"], dict):
-            return jsonify({"error": "Field 'input' (object) is required"}), 400
-        ensure_logger()
-        results = asyncio.run(scraper_main.main(body["input"]))
-        return jsonify({"count": len(results), "results": results}), 200
-    except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
+    return run_blocking(build_json_input)
+
+
+# Non-blocking runs: submit returns a run ID at once, then poll the status and fetch the results
+
+@app.route("/runs/keyword", methods=["POST"])
+def submit_keyword_run():
+    """
+    Queue a keyword run and return its run ID without waiting for the scrape.
+    Takes the same body as /run/keyword.
+    ---
+    tags:
+      - runs
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+    responses:
+      202:
+        description: Run queued
+      400:
+        description: Bad request
+    """
+    return submit_run(build_keyword_input)
+
+
+@app.route("/runs/advanced", methods=["POST"])
+def submit_advanced_run():
+    """
+    Queue an advanced-filter run and return its run ID without waiting for the scrape.
+    Takes the same body as /run/advanced.
+    ---
+    tags:
+      - runs
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+    responses:
+      202:
+        description: Run queued
+      400:
+        description: Bad request
+    """
+    return submit_run(build_advanced_input)
+
+
+@app.route("/runs/json", methods=["POST"])
+def submit_json_run():
+    """
+    Queue a run with a full jsonInput structure and return its run ID without waiting for the scrape.
+    Takes the same body as /run/json.
+    ---
+    tags:
+      - runs
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+    responses:
+      202:
+        description: Run queued
+      400:
+        description: Bad request
+    """
+    return submit_run(build_json_input)
+
+
+@app.route("/runs", methods=["GET"])
+def list_runs():
+    """
+    Status of every known run.
+    ---
+    tags:
+      - runs
+    responses:
+      200:
+        description: Run statuses, oldest first
+    """
+    return jsonify({"runs": call_on_loop(run_queue.list_runs)}), 200
+
+
+@app.route("/runs/<run_id>", methods=["GET"])
+def get_run(run_id: str):
+    """
+    Status and progress counters of a run.
+    ---
+    tags:
+      - runs
+    parameters:
+      - in: path
+        name: run_id
+        type: string
+        required: true
+    responses:
+      200:
+        description: Run status
+      404:
+        description: Unknown run ID
+    """
+    status = call_on_loop(run_queue.status, run_id)
+    if status is None:
+        return jsonify({"error": "Unknown run ID"}), 404
+    return jsonify(status), 200
+
+
+@app.route("/runs/<run_id>/results", methods=["GET"])
+def get_run_results(run_id: str):
+    """
+    Results of a finished run.
+    ---
+    tags:
+      - runs
+    parameters:
+      - in: path
+        name: run_id
+        type: string
+        required: true
+    responses:
+      200:
+        description: Results returned
+      404:
+        description: Unknown run ID
+      409:
+        description: Run has not succeeded (yet)
+    """
+    status, results = call_on_loop(lambda: (run_queue.status(run_id), run_queue.results(run_id)))
+    if status is None:
+        return jsonify({"error": "Unknown run ID"}), 404
+    if status["status"] != SUCCEEDED:
+        return jsonify({"error": f"Run is {status['status']}, results are not available"}), 409
+    return jsonify({"count": len(results), "results": results, "timing": status["progress"].get("timing")}), 200
+
+
+# Streaming runs: every job is sent as soon as it is scraped, followed by a summary event
+
+@app.route("/stream/keyword", methods=["POST"])
+def stream_keyword_run():
+    """
+    Stream a keyword run. Takes the same body as /run/keyword.
+    ---
+    tags:
+      - stream
+    consumes:
+      - application/json
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [ndjson, sse]
+        default: ndjson
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+    responses:
+      200:
+        description: Stream of job events followed by a summary (or error) event
+      400:
+        description: Bad request
+    """
+    return stream_run(build_keyword_input)
+
+
+@app.route("/stream/advanced", methods=["POST"])
+def stream_advanced_run():
+    """
+    Stream an advanced-filter run. Takes the same body as /run/advanced.
+    ---
+    tags:
+      - stream
+    consumes:
+      - application/json
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [ndjson, sse]
+        default: ndjson
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+    responses:
+      200:
+        description: Stream of job events followed by a summary (or error) event
+      400:
+        description: Bad request
+    """
+    return stream_run(build_advanced_input)
+
+
+@app.route("/stream/json", methods=["POST"])
+def stream_json_run():
+    """
+    Stream a run with a full jsonInput structure. Takes the same body as /run/json.
+    ---
+    tags:
+      - stream
+    consumes:
+      - application/json
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [ndjson, sse]
+        default: ndjson
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+    responses:
+      200:
+        description: Stream of job events followed by a summary (or error) event
+      400:
+        description: Bad request
+    """
+    return stream_run(build_json_input)
 
 
 if __name__ == "__main__":
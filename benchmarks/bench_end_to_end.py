@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of a scraper run against the local mock Upwork (benchmarks/mock_upwork.py).
+
+Runs main() for one search with the browser login disabled and reports the jobs written, jobs/sec,
+the pages given up on by failure kind and what the mock server answered. The fault options are
+passed to the mock server, so the retry, renewal and concurrency handling can be measured too.
+
+Usage:
+    python benchmarks/bench_end_to_end.py [--jobs 200] [--latency 0.05] [--rate-429 0.05] [--rate-5xx 0.02] [--rate-challenge 0.01] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import main as scraper_main
+from mock_upwork import MockUpwork
+
+if getattr(scraper_main, "logger", None) is None:
+    scraper_main.logger = logging.getLogger("Upwork")
+scraper_main.logger.setLevel(logging.INFO)
+
+
+def run(jobs: int = 200, general: dict | None = None, query: str = 'python', **mock_options) -> dict:
+    """
+    Serve the mock, run main() against it and collect the numbers.
+
+    :param jobs: Search limit of the run
+    :param general: General options added to (or overriding) the ones the benchmark sets
+    :param query: Search query
+    :param mock_options: Options of MockUpwork (latency, rate_429, ...)
+    :return: Report with the jobs written, elapsed seconds, jobs/sec, failures, the server's responses and the run's stage timings
+    """
+    progress = {}
+    with tempfile.TemporaryDirectory() as output_dir, MockUpwork(**mock_options) as mock:
+        json_input = {
+            'search': {'query': query, 'limit': jobs},
+            'general': {
+                'upwork_base_url': mock.base_url,
+                'use_browser': False,
+                'store_jobs': False,
+                'journal': False,
+                'output': 'jsonl',
+                'output_dir': output_dir,
+                **(general or {}),
+            },
+        }
+        start = time.perf_counter()
+        results = asyncio.run(scraper_main.main(json_input, progress=progress))
+        elapsed = time.perf_counter() - start
+        served = mock.stats()
+    return {
+        'jobs': len(results),
+        'elapsed_seconds': round(elapsed, 3),
+        'jobs_per_sec': round(len(results) / elapsed, 1) if elapsed else 0.0,
+        'failures': dict(progress.get('failures') or {}),
+        'concurrency': progress.get('concurrency'),
+        'served': served,
+        'timing': progress.get('timing'),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['jobs']} jobs in {report['elapsed_seconds']:.2f}s ({report['jobs_per_sec']:.1f} jobs/sec)")
+    failures = ', '.join(f"{kind}: {n}" for kind, n in report['failures'].items()) or 'none'
+    print(f"Pages given up on: {failures}")
+    for kind, statuses in report['served'].items():
+        print(f"Served {kind}: " + ', '.join(f"{status}: {n}" for status, n in sorted(statuses.items())))
+    if report['concurrency']:
+        concurrency = report['concurrency']
+        print(f"Concurrency: limit {concurrency['limit']}, peak {concurrency['peak']}, backoffs {concurrency['backoffs']}")
+    if report['timing']:
+        print(f"\n{'stage':<20} {'count':>6} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'KB':>9}")
+        for stage, r in report['timing']['stages'].items():
+            print(f"{stage:<20} {r['count']:>6} {r['total_seconds']:>9.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['bytes'] / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark a full run against the local mock Upwork")
+    parser.add_argument('--jobs', type=int, default=200, help='Search limit of the run (default: 200)')
+    parser.add_argument('--query', default='python')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds every response is delayed by')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many seconds added to the delay at random')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Share of job page requests answered with 429')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Share of job page requests answered with 500/502/503')
+    parser.add_argument('--rate-challenge', type=float, default=0.0, help='Share of job page requests answered with a Cloudflare interstitial')
+    parser.add_argument('--retry-after', type=float, help='Retry-After seconds sent with the 429s')
+    parser.add_argument('--seed', type=int, help='Seed of the mock server\'s random draws')
+    parser.add_argument('--general', type=json.loads, default=None, help='General options as JSON, e.g. \'{"max_in_flight": 50}\'')
+    parser.add_argument('--json', type=Path, help='Also write the report to this file')
+    args = parser.parse_args()
+
+    report = run(args.jobs, args.general, args.query, latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                 rate_5xx=args.rate_5xx, rate_challenge=args.rate_challenge, retry_after=args.retry_after, seed=args.seed,
+                 pages=max(1, (args.jobs + 20 + 49) // 50))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
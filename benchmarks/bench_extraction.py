@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the extraction stages over the versioned page corpus listed in
+benchmarks/corpus/manifest.json (the saved pages in testing/ and a generated search page).
+
+Every stage runs over every page of its kind ``--repeat`` times. The report gives per-page
+p50/p95 times, pages/sec and the peak memory traced while the stage runs once over the
+corpus. With ``--check`` the throughput and peak memory are compared with a baseline and
+the script exits with 1 when a stage regressed by more than ``--threshold``.
+
+Stages:
+    nuxt_js2py      extract_nuxt_json_using_js2py, on job pages with Nuxt data
+    nuxt_native     extract_nuxt_json, on job pages with Nuxt data
+    job_attributes  extract_job_attributes_from_html (fresh page, includes the tree build), on job pages with Nuxt data
+    reviews         extract_reviews_as_job_columns (fresh page, includes the tree build), on all job pages
+    search_links    extract_job_links on search result pages
+
+Usage:
+    python benchmarks/bench_extraction.py [--repeat 30] [--check] [--update-baseline] [--baseline path] [--json report.json]
+
+Timings depend on the machine, so no baseline is committed: record one with --update-baseline on
+the machine that runs --check (e.g. kept in the CI cache) and pass it with --baseline.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import main as scraper_main
+from utils.html_backend import DEFAULT_HTML_PARSER, extract_job_links, resolve_html_parser
+from utils.nuxt import find_nuxt_script
+
+if getattr(scraper_main, "logger", None) is None:
+    scraper_main.logger = logging.getLogger("Upwork")
+# DEBUG level makes the extractor dump debugging pages into testing/
+scraper_main.logger.setLevel(logging.INFO)
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+MANIFEST = CORPUS_DIR / "manifest.json"
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_REPEAT = 30
+DEFAULT_THRESHOLD = 0.25
+
+
+def load_corpus(manifest_path: Path = MANIFEST) -> tuple[int, dict[str, list[tuple[str, str]]]]:
+    """
+    Read the corpus listed in the manifest, verifying every page against its checksum.
+    Page paths in the manifest are relative to the repository root.
+
+    :return: Corpus version and the pages by kind ('job', 'search', and 'nuxt' for the job pages
+        carrying Nuxt data) as (name, html) pairs
+    :raises ValueError: If a page is missing or was changed without updating the manifest
+    """
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    pages = {}
+    for entry in manifest["pages"]:
+        path = ROOT / entry["file"]
+        if not path.exists():
+            raise ValueError(f"Corpus page {entry['file']} is missing")
+        data = path.read_bytes()
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise ValueError(f"Corpus page {entry['file']} changed, bump the corpus version and update its sha256 in {manifest_path.name}")
+        pages.setdefault(entry["kind"], []).append((path.name, data.decode("utf-8")))
+    # pages without Nuxt data return early from the Nuxt stages and would only time the lookup
+    pages["nuxt"] = [(name, html) for name, html in pages.get("job", []) if find_nuxt_script(html)]
+    return manifest["version"], pages
+
+
+def stages(html_parser: str) -> dict:
+    """Stage name -> (page kind, function(name, html))."""
+    return {
+        "nuxt_js2py": ("nuxt", lambda name, html: scraper_main.extract_nuxt_json_using_js2py(html)),
+        "nuxt_native": ("nuxt", lambda name, html: scraper_main.extract_nuxt_json(html)),
+        "job_attributes": ("nuxt", lambda name, html: scraper_main.extract_job_attributes_from_html(scraper_main.JobPage(html, html_parser), name)),
+        "reviews": ("job", lambda name, html: scraper_main.extract_reviews_as_job_columns(scraper_main.JobPage(html, html_parser), name)),
+        "search_links": ("search", lambda name, html: extract_job_links(html, html_parser)),
+    }
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(func, pages: list[tuple[str, str]], repeat: int) -> dict:
+    """
+    Time func over every page ``repeat`` times, after one warm-up pass that also traces memory.
+
+    :return: p50/p95 ms per page, pages/sec and peak traced memory in KB
+    """
+    tracemalloc.start()
+    for name, html in pages:
+        func(name, html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    samples = []
+    # collector pauses land on random samples and make runs hard to compare
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for name, html in pages:
+                start = time.perf_counter()
+                func(name, html)
+                samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return {
+        "pages": len(pages),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "pages_per_sec": round(len(samples) / sum(samples), 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """
+    Throughput is compared rather than p50, as the reviews stage mixes pages with and without
+    client history and the median can land on either.
+
+    :return: One message per stage whose pages/sec dropped, or whose peak memory grew, by more than threshold
+    """
+    regressions = []
+    for stage, base in baseline.get("stages", {}).items():
+        current = report["stages"].get(stage)
+        if current is None:
+            continue
+        if current["pages_per_sec"] < base["pages_per_sec"] / (1 + threshold):
+            regressions.append(f"{stage}: {current['pages_per_sec']:.1f} pages/sec vs baseline {base['pages_per_sec']:.1f}")
+        if current["peak_kb"] > base["peak_kb"] * (1 + threshold):
+            regressions.append(f"{stage}: peak memory {current['peak_kb']:.0f} KB vs baseline {base['peak_kb']:.0f} KB")
+    return regressions
+
+
+def run(repeat: int, html_parser: str = DEFAULT_HTML_PARSER, only: list[str] | None = None) -> dict:
+    version, pages = load_corpus()
+    report = {"corpus_version": version, "html_parser": html_parser, "repeat": repeat, "stages": {}}
+    for stage, (kind, func) in stages(html_parser).items():
+        if only and stage not in only:
+            continue
+        report["stages"][stage] = measure(func, pages.get(kind, []), repeat)
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"Corpus v{report['corpus_version']}, html_parser={report['html_parser']}, repeat={report['repeat']}\n")
+    print(f"{'stage':<16} {'pages':>6} {'p50 ms':>9} {'p95 ms':>9} {'pages/sec':>10} {'peak KB':>9}")
+    for stage, r in report["stages"].items():
+        print(f"{stage:<16} {r['pages']:>6} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['pages_per_sec']:>10.1f} {r['peak_kb']:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the extraction stages over the saved page corpus")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f'Number of timed passes over the corpus per stage (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--html-parser', default=DEFAULT_HTML_PARSER, help='Parser backend (see utils.html_backend)')
+    parser.add_argument('--stage', action='append', help='Only run this stage (can be repeated)')
+    parser.add_argument('--json', type=Path, help='Also write the report to this file')
+    parser.add_argument('--check', action='store_true', help='Exit with 1 if a stage regressed against the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed slowdown/memory growth before --check fails (default: 0.25)')
+    parser.add_argument('--update-baseline', action='store_true', help='Write this report to the baseline')
+    parser.add_argument('--baseline', type=Path, default=BASELINE, help='Baseline file (default: benchmarks/baseline.json, not committed)')
+    args = parser.parse_args()
+
+    report = run(max(1, args.repeat), resolve_html_parser(args.html_parser), args.stage)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+    if args.check:
+        if not args.baseline.exists():
+            print(f"\nNo baseline at {args.baseline}, record one on this machine with --update-baseline")
+            sys.exit(2)
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("corpus_version") != report["corpus_version"] or baseline.get("html_parser") != report["html_parser"]:
+            print("\nBaseline was recorded on another corpus version or parser, run with --update-baseline")
+            sys.exit(1)
+        regressions = compare(report, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}" if regressions else f"\nNo regression beyond {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Compare the HTML parser backends (utils.html_backend) on the saved pages in testing/.
+
+For every backend this measures the tree build, the full job page extraction
+(extract_job_attributes_from_html + extract_reviews_as_job_columns) and the
+search-page link extraction, and checks the results against html.parser.
+
+Usage:
+    python benchmarks/bench_html_parsers.py [--repeat 20]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import main as scraper_main
+from utils.html_backend import HTML_PARSER_BACKENDS, extract_job_links, resolve_html_parser
+
+if getattr(scraper_main, "logger", None) is None:
+    scraper_main.logger = logging.getLogger("Upwork")
+# DEBUG level makes the extractor dump debugging pages into testing/
+scraper_main.logger.setLevel(logging.INFO)
+
+CORPUS_DIR = ROOT / "testing"
+
+
+def build_search_page(tiles: int = 50) -> str:
+    """Synthesize a search results page with the job tile markup Upwork serves."""
+    articles = []
+    for i in range(tiles):
+        articles.append(
+            f'<article class="job-tile cursor-pointer px-md-4 air3-card air3-card-list px-4x" data-ev-job-uid="19577701123818{i:05d}" data-test="JobTile">'
+            f'<div class="job-tile-header"><small class="text-light mb-1" data-test="job-pubilshed-date"><span>Posted</span> <span>{i} minutes ago</span></small>'
+            f'<h2 class="h5 mb-0 mr-2 job-tile-title"><a data-test="job-tile-title-link UpLink" href="/jobs/Job-title-{i}_~0219577701123818{i:05d}/?referrer_url_path=/nx/search/jobs/" class="air3-link">Job title {i}</a></h2></div>'
+            f'<ul class="job-tile-info-list text-base-sm mb-4"><li data-test="job-type-label"><strong>Hourly: $25.00 - $60.00</strong></li><li data-test="experience-level"><strong>Expert</strong></li></ul>'
+            f'<div class="air3-line-clamp-wrapper clamp mb-3"><p class="mb-0 text-body-sm">' + 'Lorem ipsum dolor sit amet. ' * 20 + '</p></div>'
+            '<div class="air3-token-container"><button class="air3-token" data-test="token"><span>Python</span></button><button class="air3-token" data-test="token"><span>Django</span></button></div>'
+            '</article>'
+        )
+    return '<html><head><title>Upwork search</title></head><body><section data-test="JobsList">' + ''.join(articles) + '</section></body></html>'
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(repeat: int) -> int:
+    pages = [(p.name, p.read_text(encoding="utf-8")) for p in sorted(CORPUS_DIR.glob("*.html"))]
+    search_html = build_search_page()
+    total_bytes = sum(len(html) for _, html in pages)
+    print(f"Corpus: {len(pages)} job pages ({total_bytes / 1024:.0f} KB) from {CORPUS_DIR}, 1 synthetic search page, repeat={repeat}\n")
+
+    def extract_all(backend):
+        out = []
+        for name, html in pages:
+            page = scraper_main.JobPage(html, backend)
+            out.append((
+                scraper_main.extract_job_attributes_from_html(page, name),
+                scraper_main.extract_reviews_as_job_columns(page, name),
+            ))
+        return out
+
+    baseline = None
+    mismatches = 0
+    print(f"{'backend':<12} {'tree ms/page':>13} {'extract ms/page':>16} {'pages/sec':>10} {'search ms':>10}  parity")
+    for backend in HTML_PARSER_BACKENDS:
+        resolved = resolve_html_parser(backend)
+        if resolved != backend:
+            print(f"{backend:<12} skipped (dependency not installed)")
+            continue
+        tree_time, _ = timed(lambda: [scraper_main.JobPage(html, backend).soup for _, html in pages], repeat)
+        extract_time, results = timed(lambda: extract_all(backend), repeat)
+        search_time, links = timed(lambda: extract_job_links(search_html, backend), repeat)
+        if baseline is None:
+            baseline = (results, links)
+            parity = "baseline"
+        else:
+            same = results == baseline[0] and links == baseline[1]
+            mismatches += not same
+            parity = "identical" if same else "DIFFERS"
+        per_page = extract_time / len(pages)
+        print(f"{backend:<12} {tree_time / len(pages) * 1000:>13.2f} {per_page * 1000:>16.2f} {1 / per_page:>10.1f} {search_time * 1000:>10.2f}  {parity}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument('--repeat', type=int, default=20, help='Number of passes over the corpus per backend')
+    args = parser.parse_args()
+    sys.exit(run(args.repeat))
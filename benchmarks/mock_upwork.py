@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Upwork, to measure end-to-end throughput and failure handling without the network.
+
+Serves the recorded search page of the corpus for ``/nx/search/jobs/`` (``page=`` selects the page,
+each page lists 50 jobs whose IDs depend on the query and the page number, pages after ``pages``
+are empty) and the recorded job page for ``/jobs/<slug>~<id>``, with three client reviews added so
+every column of a job is filled. Job page requests can be delayed and answered at random with 429,
+5xx or a Cloudflare interstitial. Point a run at it with the general options::
+
+    {"upwork_base_url": "http://127.0.0.1:8765", "use_browser": false}
+
+Usage:
+    python benchmarks/mock_upwork.py [--port 8765] [--latency 0.05] [--rate-429 0.05] [--rate-5xx 0.02] [--rate-challenge 0.01]
+"""
+
+import argparse
+import collections
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+SEARCH_TEMPLATE = ROOT / "benchmarks" / "corpus" / "pages" / "search_results_50_tiles.html"
+JOB_TEMPLATE = ROOT / "testing" / "nuxt_job_page_sample.html"
+
+_TILE_ID_RE = re.compile(r'~0219577701123818(\d{5})')
+_ARTICLE_RE = re.compile(r'<article.*?</article>', re.S)
+
+CHALLENGE_PAGE = (
+    '<!DOCTYPE html><html><head><title>Just a moment...</title></head><body>'
+    '<script src="/cdn-cgi/challenge-platform/h/g/orchestrate/chl_page/v1"></script></body></html>'
+)
+
+REVIEW = (
+    '<div class="review-item"><h4>{title}</h4><span>5.0</span><span>★★★★★</span>'
+    '<p>Great work, delivered the project on time and understood the requirements.</p>'
+    '<span>To freelancer: {name}.</span><span>4.0 All delivered, good work</span>'
+    '<span>Oct 2024 - Aug 2025</span><span>Fixed-price</span><span>$500.00</span></div>'
+)
+REVIEWS_SECTION = '<section data-test="ClientHistory">' + ''.join(
+    REVIEW.format(title=title, name=name)
+    for title, name in (("Data pipeline", "Jane D"), ("Web scraper", "Ali K"), ("Dashboard", "Marta S"))
+) + '</section>'
+
+
+def job_id(query: str, page: int, index: int) -> str:
+    """ID of the index-th job on a search page, stable for the same query and page."""
+    return f"0{zlib.crc32(query.encode()) % 10**9:09d}{page:06d}{index:05d}"
+
+
+class MockUpwork:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, pages: int = 20, latency: float = 0.0, jitter: float = 0.0,
+                 rate_429: float = 0.0, rate_5xx: float = 0.0, rate_challenge: float = 0.0, retry_after: float | None = None,
+                 fault_search_pages: bool = False, seed: int | None = None):
+        """
+        :param host: Interface to listen on
+        :param port: Port to listen on; 0 picks a free one (see base_url)
+        :param pages: Number of search result pages with jobs, per query
+        :param latency: Seconds every response is delayed by
+        :param jitter: Up to this many seconds are added to the delay at random
+        :param rate_429: Share of job page requests answered with 429
+        :param rate_5xx: Share of job page requests answered with 500, 502 or 503
+        :param rate_challenge: Share of job page requests answered with a Cloudflare interstitial
+        :param retry_after: Retry-After seconds sent with the 429s (None sends no header)
+        :param fault_search_pages: Inject the faults into search page requests too
+        :param seed: Seed of the fault and jitter draws, for repeatable runs
+        """
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.rate_challenge = rate_challenge
+        self.retry_after = retry_after
+        self.fault_search_pages = fault_search_pages
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # responses served, by page kind and status
+        self.served: dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+        # client (host, port) pairs seen, one per TCP connection
+        self.connections: set[tuple] = set()
+        self._search_html = SEARCH_TEMPLATE.read_text(encoding='utf-8')
+        self._job_html = JOB_TEMPLATE.read_text(encoding='utf-8').replace('</body>', REVIEWS_SECTION + '</body>', 1)
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> 'MockUpwork':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-upwork', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockUpwork':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """Responses served so far, as {kind: {status: count}}."""
+        with self._lock:
+            return {kind: dict(counter) for kind, counter in self.served.items()}
+
+    def search_page(self, query: str, page: int) -> str:
+        if page > self.pages:
+            return _ARTICLE_RE.sub('', self._search_html)
+        return _TILE_ID_RE.sub(lambda m: f"~{job_id(query, page, int(m.group(1)))}", self._search_html)
+
+    def job_page(self) -> str:
+        return self._job_html
+
+    def _draw(self) -> tuple[float, float]:
+        with self._lock:
+            return self._random.random(), self._random.uniform(0, self.jitter)
+
+    def respond(self, kind: str, query: dict, client_address: tuple | None = None) -> tuple[int, dict, str]:
+        """Pick the response to a request; also delays it and counts it (and the connection it came on)."""
+        if client_address is not None:
+            with self._lock:
+                self.connections.add(client_address)
+        roll, jitter = self._draw()
+        if self.latency or jitter:
+            time.sleep(self.latency + jitter)
+        status, headers, body = self._fault(kind, roll) or self._page(kind, query)
+        with self._lock:
+            self.served[kind][status] += 1
+        return status, headers, body
+
+    def _fault(self, kind: str, roll: float) -> tuple[int, dict, str] | None:
+        if kind != 'job' and not (kind == 'search' and self.fault_search_pages):
+            return None
+        if roll < self.rate_challenge:
+            return 403, {'cf-mitigated': 'challenge'}, CHALLENGE_PAGE
+        roll -= self.rate_challenge
+        if roll < self.rate_429:
+            headers = {'Retry-After': f"{self.retry_after:g}"} if self.retry_after is not None else {}
+            return 429, headers, 'Too Many Requests'
+        roll -= self.rate_429
+        if roll < self.rate_5xx:
+            return (500, 502, 503)[int(roll / self.rate_5xx * 3)], {}, 'Server Error'
+        return None
+
+    def _page(self, kind: str, query: dict) -> tuple[int, dict, str]:
+        if kind == 'search':
+            try:
+                page = int(query.get('page', ['1'])[0])
+            except ValueError:
+                page = 1
+            return 200, {}, self.search_page(query.get('q', [''])[0], page)
+        if kind == 'job':
+            return 200, {}, self.job_page()
+        if kind == 'login':
+            return 200, {}, '<html><body>Log in to Upwork</body></html>'
+        return 404, {}, 'Not Found'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive, so the pooled client reuses its connections as it would with Upwork
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.startswith('/nx/search/jobs'):
+            kind = 'search'
+        elif url.path.startswith('/jobs/') and '~' in url.path:
+            kind = 'job'
+        elif url.path.startswith('/ab/account-security/login'):
+            kind = 'login'
+        else:
+            kind = 'other'
+        status, headers, body = self.server.mock.respond(kind, parse_qs(url.query), self.client_address)
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded Upwork pages locally, with injected latency and failures")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=20, help='Search result pages with jobs per query (default: 20)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds every response is delayed by')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many seconds added to the delay at random')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Share of job page requests answered with 429')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Share of job page requests answered with 500/502/503')
+    parser.add_argument('--rate-challenge', type=float, default=0.0, help='Share of job page requests answered with a Cloudflare interstitial')
+    parser.add_argument('--retry-after', type=float, help='Retry-After seconds sent with the 429s')
+    parser.add_argument('--fault-search-pages', action='store_true', help='Inject the failures into search pages too')
+    parser.add_argument('--seed', type=int, help='Seed of the random draws, for repeatable runs')
+    args = parser.parse_args()
+
+    mock = MockUpwork(args.host, args.port, args.pages, args.latency, args.jitter, args.rate_429, args.rate_5xx,
+                      args.rate_challenge, args.retry_after, args.fault_search_pages, args.seed)
+    print(f"Serving on {mock.base_url}, use general options "
+          f'{{"upwork_base_url": "{mock.base_url}", "use_browser": false}}')
+    try:
+        mock.serve_forever()
+    except KeyboardInterrupt:
+        pass
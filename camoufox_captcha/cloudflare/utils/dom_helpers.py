@@ -1,66 +1,162 @@
 import asyncio
-from typing import Optional, List, Tuple
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar, Union
 
-from playwright.async_api import Frame, ElementHandle
+from playwright.async_api import Frame, ElementHandle, Page
 
 from camoufox_captcha.common.shadow_root import search_shadow_root_elements
 
 from utils.logger import Logger
 logger = Logger().get_logger()
 
+T = TypeVar('T')
 
-async def get_ready_checkbox(
-        iframes: List[Frame],
-        delay: int,
-        attempts: int
-) -> Optional[Tuple[Frame, ElementHandle]]:
+# seconds between DOM checks while waiting; frame events wake the wait earlier
+POLL_INTERVAL = 0.25
+
+# page events after which the Cloudflare widget or the page behind the challenge may have changed
+FRAME_EVENTS = ('frameattached', 'framenavigated', 'framedetached', 'domcontentloaded')
+
+
+class FrameEvents:
+    """
+    Wakes waiting code as soon as a frame is attached, navigated or detached, or a document finished loading,
+    so DOM checks run right after Cloudflare renders its iframe or clears the challenge instead of after a fixed sleep
     """
-    Accepts a list of Cloudflare iframes, sorts out detached ones, collects checkboxes from the remaining iframes,
-    and waits until at least one checkbox is found and ready to be clicked (visible)
 
-    :param iframes: Cloudflare iframes
-    :param delay: Delay in seconds between attempts to find the checkbox
-    :param attempts: Maximum number of attempts to find the checkbox
-    :return: [checkboxes Frame, checkboxes ElementHandle] if checkbox is found and ready, None otherwise
+    def __init__(self, queryable: Union[Page, Frame, ElementHandle, None]):
+        """
+        :param queryable: Page, Frame, ElementHandle; events are taken from its page (an ElementHandle has none, waits then only time out)
+        """
+        if isinstance(queryable, Frame):
+            queryable = queryable.page
+        self.page = queryable if isinstance(queryable, Page) else None
+        self._event = asyncio.Event()
+
+    def _notify(self, *args) -> None:
+        self._event.set()
+
+    def __enter__(self) -> 'FrameEvents':
+        if self.page is not None:
+            for event in FRAME_EVENTS:
+                self.page.on(event, self._notify)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.page is not None:
+            for event in FRAME_EVENTS:
+                self.page.remove_listener(event, self._notify)
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait until the next frame event, or at most timeout seconds
+
+        :param timeout: Maximum wait in seconds
+        :return: True if woken by an event, False on timeout
+        """
+        self._event.clear()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=max(0.0, timeout))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+async def poll_until(
+        check: Callable[[], Awaitable[T]],
+        timeout: float,
+        events: Optional[FrameEvents] = None,
+        interval: float = POLL_INTERVAL,
+        deadline: Optional[float] = None
+) -> Optional[T]:
     """
+    Run check until it returns a truthy value, checking again every interval seconds or as soon as a frame event arrives
+
+    :param check: Coroutine function returning the awaited value, or a falsy value to keep waiting
+    :param timeout: Maximum wait in seconds
+    :param events: Frame events that wake the wait before the interval is over
+    :param interval: Seconds between checks
+    :param deadline: Event loop time after which to give up, even if timeout is not over
+    :return: The truthy value, or None if it did not come in time
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    if deadline is not None:
+        end = min(end, deadline)
+    while True:
+        result = await check()
+        if result:
+            return result
+        remaining = end - loop.time()
+        if remaining <= 0:
+            return None
+        if events is not None:
+            await events.wait(min(interval, remaining))
+        else:
+            await asyncio.sleep(min(interval, remaining))
+
+
+async def find_visible_checkbox(iframes: List[Frame]) -> Optional[Tuple[Frame, ElementHandle]]:
+    """
+    Collect the checkboxes of the attached iframes and return the first visible one
 
-    # ensure at least one attempt
-    if attempts <= 0:
-        attempts = 1
+    :param iframes: Cloudflare iframes
+    :return: [checkboxes Frame, checkboxes ElementHandle] if a checkbox is ready to be clicked, None otherwise
+    """
+    checkboxes = []
 
-    for attempt in range(attempts):
+    # search for checkboxes in each iframe
+    for iframe in iframes:
         try:
-            checkboxes = []
+            if iframe.is_detached():  # skip detached iframes
+                continue
 
-            # search for checkboxes in each iframe
-            for iframe in iframes:
-                try:
-                    if iframe.is_detached():  # skip detached iframes
-                        continue
+            iframe_checkboxes = await search_shadow_root_elements(iframe, 'input[type="checkbox"]')
 
-                    iframe_checkboxes = await search_shadow_root_elements(iframe, 'input[type="checkbox"]')
+            # add found checkboxes to the list with their parent iframe
+            checkboxes += [(iframe, iframe_checkbox) for iframe_checkbox in iframe_checkboxes]
+        except Exception as e:
+            logger.debug(f'Error searching for checkboxes in iframe: {e}')
 
-                    # add found checkboxes to the list with their parent iframe
-                    checkboxes += [(iframe, iframe_checkbox) for iframe_checkbox in iframe_checkboxes]
-                except Exception as e:
-                    logger.debug(f'Error searching for checkboxes in iframe: {e}')
+    logger.debug(f'Found {len(checkboxes)} checkboxes in {len(iframes)} Cloudflare iframes')
 
-            logger.debug(f'Found {len(checkboxes)} checkboxes in {len(iframes)} Cloudflare iframes')
+    # return the first checkbox that is visible and ready to be clicked
+    for iframe, checkbox in checkboxes:
+        try:
+            if await checkbox.is_visible():
+                return iframe, checkbox
+        except Exception as e:
+            logger.debug(f'Error while checking checkbox visibility: {e}')
+    return None
 
-            # filter checkboxes that are visible and ready to be clicked
-            visible_checkboxes = []
-            for iframe, checkbox in checkboxes:
-                if await checkbox.is_visible():
-                    visible_checkboxes.append((iframe, checkbox))
 
-            if visible_checkboxes:
-                logger.debug('Checkbox input is ready to be clicked')
-                return visible_checkboxes[0]  # return the first visible checkbox
+async def get_ready_checkbox(
+        iframes: List[Frame],
+        delay: int,
+        attempts: int,
+        events: Optional[FrameEvents] = None,
+        deadline: Optional[float] = None,
+        poll_interval: float = POLL_INTERVAL
+) -> Optional[Tuple[Frame, ElementHandle]]:
+    """
+    Accepts a list of Cloudflare iframes, sorts out detached ones, collects checkboxes from the remaining iframes,
+    and waits until at least one checkbox is found and ready to be clicked (visible).
+    The iframes are checked every poll_interval seconds, or on the next frame event, for at most delay * attempts seconds
 
-            logger.debug('Waiting for Cloudflare checkbox input...')
-            await asyncio.sleep(delay)
-        except Exception as e:
-            logger.debug(f'Error while waiting for checkbox: {e}')
+    :param iframes: Cloudflare iframes
+    :param delay: Together with attempts, the maximum wait in seconds (delay * attempts)
+    :param attempts: Together with delay, the maximum wait in seconds (delay * attempts)
+    :param events: Frame events that trigger a check before poll_interval is over
+    :param deadline: Event loop time after which to give up, even if the maximum wait is not over
+    :param poll_interval: Seconds between checks
+    :return: [checkboxes Frame, checkboxes ElementHandle] if checkbox is found and ready, None otherwise
+    """
+
+    # ensure at least one check
+    timeout = max(0, delay) * max(1, attempts)
+    checkbox = await poll_until(lambda: find_visible_checkbox(iframes), timeout, events, poll_interval, deadline)
+    if checkbox:
+        logger.debug('Checkbox input is ready to be clicked')
+        return checkbox
 
-    logger.debug('Max attempts reached while waiting for Cloudflare checkbox input')
+    logger.debug('Timed out while waiting for Cloudflare checkbox input')
     return None
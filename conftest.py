@@ -0,0 +1,32 @@
+"""
+Shared setup of the test suite.
+
+Makes the repository root and benchmarks/ importable, gives main.py the module logger its entry
+points would create, and keeps that logger at INFO while the tests run: at DEBUG the extractor
+dumps debugging pages into testing/.
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, ROOT)
+
+import main as scraper_main  # noqa: E402
+
+if getattr(scraper_main, "logger", None) is None:
+    scraper_main.logger = logging.getLogger("Upwork")
+
+
+@pytest.fixture(autouse=True)
+def upwork_logger_at_info():
+    # set per test: importing the captcha solver (utils.logger.Logger) resets the level to DEBUG
+    logger = scraper_main.logger
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.setLevel(level)
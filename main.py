@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import argparse
 import asyncio
 import csv
@@ -9,20 +11,33 @@ import re
 import time
 import ast
 import sys
-import pandas as pd
-import requests
-import concurrent.futures
+import httpx
+import functools
+import collections
 import io
 import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
 
-import js2py
-from bs4 import BeautifulSoup
-from camoufox import AsyncCamoufox
-from playwright.async_api import Page, BrowserContext, TimeoutError as PlaywrightTimeoutError
-from playwright._impl._errors import TargetClosedError
 from utils.logger import Logger
-
-from camoufox_captcha import solve_captcha
+from utils.pipeline import fetch_parse_pipeline
+from utils.html_backend import DEFAULT_HTML_PARSER, extract_job_links, make_soup, resolve_html_parser
+from utils.browser_pool import CAMOUFOX_LAUNCH_OPTIONS
+from utils.concurrency import CHALLENGE, HTTP_403, HTTP_429, TIMEOUT, AdaptiveLimiter
+from utils.rate_limit import DEFAULT_BURST, DEFAULT_RATE, rate_limit_hook, rate_limit_wait
+from utils import metrics, retry, timing
+from utils.retry import SessionRenewer
+from utils.run_journal import DEFAULT_JOURNAL_DIR, RunJournal
+from utils.job_store import DEFAULT_JOB_STORE_PATH, JobStore
+from utils.session_vault import DEFAULT_VAULT_PATH, SessionVault, account_key
+from utils.output_sinks import open_sinks, resolve_output_formats
+from utils.nuxt import NuxtDecodeError, decode_nuxt_payload, find_nuxt_script
+
+# Browser automation, js2py and bs4 take most of the import time; they are imported by the stage that
+# needs them so `import main` (API servers, --help, parse workers) stays cheap
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from playwright.async_api import BrowserContext, Page
 
 UPWORK_MAIN_CATEGORIES = {
     # Main Categories
@@ -265,6 +280,13 @@ def normalize_search_params(params: dict, credentials_provided: bool, buffer: in
     
     return result, limit
 
+UPWORK_BASE_URL = "https://www.upwork.com"
+UPWORK_LOGIN_PATH = "/ab/account-security/login"
+# sent when the run has no browser session to take the user-agent from (see 'use_browser')
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+# overall deadline (s) of one Cloudflare solve; its waits end as soon as the checkbox shows or the challenge clears
+CAPTCHA_SOLVE_TIMEOUT = 90
+
 def build_upwork_search_url(params: dict) -> str:
     """
     Build an Upwork job search URL from the given parameters dict.
@@ -274,7 +296,7 @@ def build_upwork_search_url(params: dict) -> str:
     :return: Upwork job search URL as a string
     :rtype: str
     """
-    base_url = params.get('base_url', 'https://www.upwork.com/nx/search/jobs/')
+    base_url = params.get('base_url', f'{UPWORK_BASE_URL}/nx/search/jobs/')
     # Advanced search logic for 'q'
     q_parts = []
     if params.get('all_words'):
@@ -339,6 +361,8 @@ async def safe_goto(
     """
     last_exc = None
 
+    from playwright._impl._errors import TargetClosedError
+
     for attempt in range(1, max_retries + 1):
         for wait_until in wait_untils:
             try:
@@ -404,15 +428,18 @@ async def login_process(
             body_text = await page.locator('body').inner_text()
             if 'Verification failed. Please try again.' in body_text[:100] or 'Please fix the errors below' in body_text[:100]:
                 logger.debug(f"Verification on login failed. Attempt {attempt}/{max_attempts}")
+                metrics.LOGIN_ATTEMPTS.inc(outcome='rejected')
                 # Try reloading or creating a new page, but do NOT clear cookies yet
                 if attempt == max_attempts // 2:
                     logger.debug("Creating a new page due to repeated login failures.")
                     page = await context.new_page()
                 continue
             logger.debug(f"Login process complete.")
+            metrics.LOGIN_ATTEMPTS.inc(outcome='succeeded')
             return True
         except Exception as e:
             logger.debug(f"Login attempt {attempt} failed: {e}")
+            metrics.LOGIN_ATTEMPTS.inc(outcome='error')
             await asyncio.sleep(3)
     logger.error("⚠️ All login attempts failed.")
     return False
@@ -447,11 +474,16 @@ async def login_and_solve(
     :return: Tuple of (page, context) after login/captcha (or attempted login)
     :rtype: tuple[Page, BrowserContext]
     """
+    from camoufox_captcha import solve_captcha
+
     # go to search url
-    await safe_goto(page, search_url, context)
+    with timing.stage('browser_navigate'):
+        await safe_goto(page, search_url, context)
     # bypass captcha
     logger.debug(f"Checking for captcha challenge...")
-    captcha_solved = await solve_captcha(queryable=page, browser_context=context, captcha_type='cloudflare', challenge_type='interstitial', solve_attempts = 5, solve_click_delay = 6, wait_checkbox_attempts = 5, wait_checkbox_delay = 5, checkbox_click_attempts = 3, attempt_delay = 5)
+    with timing.stage('captcha_solve'):
+        captcha_solved = await solve_captcha(queryable=page, browser_context=context, captcha_type='cloudflare', challenge_type='interstitial', solve_attempts = 5, solve_click_delay = 6, wait_checkbox_attempts = 5, wait_checkbox_delay = 5, checkbox_click_attempts = 3, attempt_delay = 5, timeout = CAPTCHA_SOLVE_TIMEOUT)
+    metrics.CAPTCHA_SOLVES.inc(outcome='solved' if captcha_solved else 'not_solved')
     if captcha_solved:
         logger.debug(f"Successfully solved captcha challenge!")
     else:
@@ -459,7 +491,8 @@ async def login_and_solve(
     # if credentials are provided, login
     if credentials_provided:
         logger.debug(f"Logging in...")
-        login_success = await login_process(login_url, page, context, username, password)
+        with timing.stage('login'):
+            login_success = await login_process(login_url, page, context, username, password)
         # if login fails, try clearing cookies and re-solving captcha
         if not login_success:
             logger.error("⚠️ Login failed after all attempts.")
@@ -469,13 +502,16 @@ async def login_and_solve(
                 page = await context.new_page()
                 await safe_goto(page, search_url, context)
                 # Re-solve captcha
-                captcha_solved = await solve_captcha(queryable=page, browser_context=context, captcha_type='cloudflare', challenge_type='interstitial', solve_attempts = 5, solve_click_delay = 6, wait_checkbox_attempts = 5, wait_checkbox_delay = 5, checkbox_click_attempts = 3, attempt_delay = 5)
+                with timing.stage('captcha_solve'):
+                    captcha_solved = await solve_captcha(queryable=page, browser_context=context, captcha_type='cloudflare', challenge_type='interstitial', solve_attempts = 5, solve_click_delay = 6, wait_checkbox_attempts = 5, wait_checkbox_delay = 5, checkbox_click_attempts = 3, attempt_delay = 5, timeout = CAPTCHA_SOLVE_TIMEOUT)
+                metrics.CAPTCHA_SOLVES.inc(outcome='solved' if captcha_solved else 'not_solved')
                 if captcha_solved:
                     logger.info("✅ Captcha solved after clearing cookies. Retrying login...")
                 else:
                     logger.warning("⚠️ Captcha could not be solved after clearing cookies.")
                 # Retry login
-                login_success = await login_process(login_url, page, context, username, password)
+                with timing.stage('login'):
+                    login_success = await login_process(login_url, page, context, username, password)
                 if not login_success:
                     logger.error("⚠️Login still failed after last resort attempt (clear cookies, re-solve captcha, retry login). Aborting.")
                     # print body text
@@ -489,6 +525,58 @@ async def login_and_solve(
                 logger.error(f"⚠️ Exception during last resort login attempt: {e}")
     return page, context
 
+def extract_nuxt_json(html: str) -> dict | None:
+    """
+    Extract the window.__NUXT__ payload from HTML using the native decoder.
+    Falls back to js2py evaluation if the payload uses syntax the decoder does not support.
+
+    :param html: HTML content as a string
+    :type html: str
+    :return: Parsed __NUXT__ JSON as a dict, or None if not found/parsable
+    :rtype: dict or None
+    """
+    js_code = find_nuxt_script(html)
+    if not js_code:
+        return None
+    try:
+        return decode_nuxt_payload(js_code)
+    except NuxtDecodeError as e:
+        logger.debug(f"Native Nuxt decode failed, falling back to js2py: {e}")
+    return evaluate_nuxt_with_js2py(js_code)
+
+class JobPage:
+    """
+    A job detail page parsed once: a single BeautifulSoup tree and a single Nuxt decode,
+    shared by extract_job_attributes_from_html and extract_reviews_as_job_columns.
+    Both are built lazily, so pages without Nuxt data never pay for the HTML parse.
+    """
+
+    def __init__(self, html: str, html_parser: str = DEFAULT_HTML_PARSER):
+        self.html = html
+        self.html_parser = html_parser
+
+    @functools.cached_property
+    def soup(self) -> BeautifulSoup:
+        return make_soup(self.html, self.html_parser)
+
+    @functools.cached_property
+    def nuxt(self) -> dict | None:
+        return extract_nuxt_json(self.html)
+
+    @classmethod
+    def of(cls, html: "str | JobPage", html_parser: str = DEFAULT_HTML_PARSER) -> "JobPage":
+        """
+        Return html unchanged if it is already a JobPage, otherwise wrap it.
+
+        :param html: HTML content or an existing JobPage
+        :type html: str or JobPage
+        :param html_parser: Parser backend used when wrapping raw HTML
+        :type html_parser: str
+        :return: JobPage for the given content
+        :rtype: JobPage
+        """
+        return html if isinstance(html, cls) else cls(html, html_parser)
+
 def extract_nuxt_json_using_js2py(html: str) -> dict | None:
     """
     Extract and evaluate the window.__NUXT__ script content from HTML using js2py.
@@ -501,7 +589,19 @@ def extract_nuxt_json_using_js2py(html: str) -> dict | None:
     match = re.search(r'<script>window\.__NUXT__=([\s\S]*?)</script>', html)
     if not match:
         return None
-    js_code = match.group(1).strip().rstrip(';')
+    return evaluate_nuxt_with_js2py(match.group(1).strip().rstrip(';'))
+
+def evaluate_nuxt_with_js2py(js_code: str) -> dict | None:
+    """
+    Evaluate a window.__NUXT__ payload with js2py.
+
+    :param js_code: JavaScript assigned to window.__NUXT__
+    :type js_code: str
+    :return: Parsed __NUXT__ JSON as a dict, or None if not parsable
+    :rtype: dict or None
+    """
+    import js2py
+
     js_code = "var nuxt = " + js_code
     try:
         # Capture only js2py stdout, suppressing PyJs_LONG_1_ output
@@ -513,23 +613,26 @@ def extract_nuxt_json_using_js2py(html: str) -> dict | None:
         logger.debug(f"Error evaluating window.__NUXT__ with js2py: {e}")
         return None
 
-def extract_job_attributes_from_html(html: str, job_id: str, credentials_provided: bool = True) -> dict:
+def extract_job_attributes_from_html(html: str | JobPage, job_id: str, credentials_provided: bool = True, html_parser: str = DEFAULT_HTML_PARSER) -> dict:
     """
     Extract job attributes from Upwork job HTML (using JSON and HTML fallback).
 
-    :param html: HTML content of the job page
-    :type html: str
+    :param html: HTML content of the job page, or a JobPage already parsed from it
+    :type html: str or JobPage
     :param job_id: Job ID string
     :type job_id: str
     :param credentials_provided: Whether credentials are provided (affects restricted fields)
     :type credentials_provided: bool
+    :param html_parser: Parser backend used when html is a string (see utils.html_backend)
+    :type html_parser: str
     :return: Dictionary of extracted job attributes, keyed by job_id
     :rtype: dict
     """
     data = {}
+    page = JobPage.of(html, html_parser)
 
     # 1. Extract JSON from full HTML
-    nuxt_data = extract_nuxt_json_using_js2py(html)
+    nuxt_data = page.nuxt
     if not nuxt_data:
         return {job_id: None}
     nuxt_job = None
@@ -675,7 +778,7 @@ def extract_job_attributes_from_html(html: str, job_id: str, credentials_provide
             data['ts_publish'] = nuxt_job['publishTime']
 
     # 2. Extract job-details-content div for HTML fallback
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = page.soup
     # Extract category from <title> tag (after the last dash)
     if not data.get('category'):
         title_tag = soup.find('title')
@@ -1027,14 +1130,16 @@ def extract_job_attributes_from_html(html: str, job_id: str, credentials_provide
 
     return {job_id: data}
 
-def extract_reviews_as_job_columns(html: str, job_id: str) -> dict:
+def extract_reviews_as_job_columns(html: str | JobPage, job_id: str, html_parser: str = DEFAULT_HTML_PARSER) -> dict:
     """
     Extract reviews from Upwork job HTML page and format as columns for job data.
     
-    :param html: HTML content of the job page
-    :type html: str
+    :param html: HTML content of the job page, or a JobPage already parsed from it
+    :type html: str or JobPage
     :param job_id: Job ID string
     :type job_id: str
+    :param html_parser: Parser backend used when html is a string (see utils.html_backend)
+    :type html_parser: str
     :return: Dictionary of review data as columns to add to job data
     :rtype: dict
     """
@@ -1069,7 +1174,7 @@ def extract_reviews_as_job_columns(html: str, job_id: str) -> dict:
         'client_review_3_budget': None,
     }
     
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = JobPage.of(html, html_parser).soup
     
     # Look for client history section - based on your screenshot
     # Look for various possible review containers
@@ -1221,6 +1326,8 @@ def extract_reviews_from_html(html: str, job_id: str) -> list[dict]:
     :return: List of review dictionaries
     :rtype: list[dict]
     """
+    from bs4 import BeautifulSoup
+
     reviews = []
     soup = BeautifulSoup(html, 'html.parser')
     
@@ -1385,6 +1492,7 @@ def normalize_csv_column_names(data: dict) -> dict:
         'buyer_company_contractDate': 'Member Since',
         
         # Other fields
+        'matched_queries': 'Matched Queries',
         'numberOfPositionsToHire': 'Positions',
         'contractorTier': 'Tier',
         'buyer_location_offsetFromUtcMillis': 'UTC Offset',
@@ -1428,23 +1536,70 @@ def normalize_csv_column_names(data: dict) -> dict:
     
     return normalized_data
 
-def playwright_cookies_to_requests(cookies):
+def playwright_cookies_to_httpx(cookies):
     """
-    Convert Playwright cookies to a RequestsCookieJar.
+    Convert Playwright cookies to an httpx.Cookies jar.
 
     :param cookies: List of cookies from Playwright context
     :type cookies: list[dict]
-    :return: RequestsCookieJar containing the cookies
-    :rtype: requests.cookies.RequestsCookieJar
+    :return: httpx.Cookies containing the cookies
+    :rtype: httpx.Cookies
     """
-    jar = requests.cookies.RequestsCookieJar()
+    jar = httpx.Cookies()
     for cookie in cookies:
         jar.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
     return jar
 
-async def get_requests_session_from_playwright(context, page, max_retries=3, retry_delay=1):
+def build_http_client(cookies, user_agent, max_in_flight=25, timeout=30, rate_limit=DEFAULT_RATE, burst=DEFAULT_BURST):
+    """
+    Build the pooled async HTTP client shared by every request of a run.
+
+    :param cookies: List of cookies from Playwright context
+    :type cookies: list[dict]
+    :param user_agent: User-agent string of the browser that produced the cookies
+    :type user_agent: str
+    :param max_in_flight: Maximum number of concurrent (and keep-alive) connections
+    :type max_in_flight: int
+    :param timeout: Request timeout in seconds
+    :type timeout: int
+    :param rate_limit: Requests per second per host, shared with every other client of the process (None or 0 disables pacing)
+    :type rate_limit: float or None
+    :param burst: Requests per host that may start at once after an idle period
+    :type burst: int
+    :return: httpx.AsyncClient with cookies, user-agent, connection limits and request pacing set
+    :rtype: httpx.AsyncClient
+    """
+    return httpx.AsyncClient(
+        cookies=playwright_cookies_to_httpx(cookies),
+        headers={'User-Agent': user_agent},
+        # requests queue for a pooled connection instead of timing out while the pool is busy
+        timeout=httpx.Timeout(timeout, pool=None),
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight),
+        event_hooks={'request': [rate_limit_hook(rate_limit, burst)] if rate_limit else [], 'response': [metrics.response_status_hook]},
+    )
+
+def get_rate_limit(general_params):
     """
-    Extract cookies and user-agent from Playwright context and page, and build a requests.Session.
+    Read the per-host request pacing from the general params.
+
+    :param general_params: Dictionary of general parameters ('rate_limit', 'rate_burst')
+    :type general_params: dict
+    :return: Requests per second (None disables pacing) and burst size
+    :rtype: tuple[float or None, int]
+    """
+    rate = general_params.get('rate_limit', DEFAULT_RATE)
+    try:
+        rate = float(rate) if rate is not None else None
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ Invalid rate_limit '{rate}', using {DEFAULT_RATE} requests/s")
+        rate = DEFAULT_RATE
+    burst = get_int_option(general_params, 'rate_burst', DEFAULT_BURST)
+    return (rate if rate and rate > 0 else None), burst
+
+async def get_session_state_from_playwright(context, page, max_retries=3, retry_delay=1):
+    """
+    Extract cookies and user-agent from Playwright context and page.
     Retries user-agent extraction if the execution context is destroyed.
 
     :param context: Playwright BrowserContext object
@@ -1455,8 +1610,8 @@ async def get_requests_session_from_playwright(context, page, max_retries=3, ret
     :type max_retries: int
     :param retry_delay: Delay in seconds between retries (default: 1)
     :type retry_delay: int
-    :return: requests.Session object with cookies and user-agent set
-    :rtype: requests.Session
+    :return: Dictionary with 'cookies' (Playwright cookie dicts) and 'user_agent'
+    :rtype: dict
     """
     cookies = await context.cookies()
     user_agent = None
@@ -1477,146 +1632,706 @@ async def get_requests_session_from_playwright(context, page, max_retries=3, ret
                 break
     if not user_agent:
         user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
-    session = requests.Session()
-    session.cookies = playwright_cookies_to_requests(cookies)
-    session.headers.update({'User-Agent': user_agent})
-    return session
+    return {'cookies': cookies, 'user_agent': user_agent}
+
+def is_challenge_response(resp):
+    """
+    Detect a Cloudflare challenge/interstitial served instead of the requested page.
+
+    :param resp: Response to inspect
+    :type resp: httpx.Response
+    :return: True if the response is a Cloudflare challenge
+    :rtype: bool
+    """
+    if resp.headers.get('cf-mitigated') == 'challenge':
+        return True
+    if resp.status_code in (403, 429, 503):
+        head = resp.text[:5000]
+        return '/cdn-cgi/challenge-platform/' in head or 'Just a moment...' in head
+    return False
+
+async def probe_session(client, search_url, login_url, credentials_provided):
+    """
+    Check with one cheap request whether a stored session is still accepted by Upwork.
+    Logged-in sessions are redirected away from the login page; anonymous sessions must
+    get the search page without a Cloudflare challenge.
+
+    :param client: httpx.AsyncClient built from the stored session
+    :type client: httpx.AsyncClient
+    :param search_url: Upwork job search URL
+    :type search_url: str
+    :param login_url: Upwork login URL
+    :type login_url: str
+    :param credentials_provided: Whether the session belongs to a logged-in account
+    :type credentials_provided: bool
+    :return: True if the session can be reused
+    :rtype: bool
+    """
+    try:
+        with timing.stage('session_probe') as sample:
+            resp = await client.get(login_url if credentials_provided else search_url)
+            sample.bytes = len(resp.content)
+            sample.excluded = rate_limit_wait(resp)
+    except Exception as e:
+        logger.debug(f"Session probe failed: {e}")
+        return False
+    if is_challenge_response(resp) or resp.status_code >= 400:
+        logger.debug(f"Session probe rejected with status {resp.status_code}")
+        return False
+    if credentials_provided and 'account-security/login' in resp.url.path:
+        logger.debug("Session probe landed on the login page, stored login has expired")
+        return False
+    return True
+
+async def _login_in_context(context, username, password, search_url, login_url, credentials_provided):
+    try:
+        page = await context.new_page()
+    except Exception as e:
+        logger.error(f"⚠️ Error creating browser: {e}")
+        raise
+    try:
+        logger.info("🔒 Solving Captcha (no login)...")
+        page, context = await login_and_solve(page, context, username, password, search_url, login_url, credentials_provided)
+    except Exception as e:
+        logger.error(f"⚠️ Error logging in: {e}")
+        raise
+    # Extract cookies and user-agent
+    with timing.stage('session_extraction'):
+        return await get_session_state_from_playwright(context, page)
+
+async def browser_login_session(username, password, search_url, login_url, credentials_provided, browser_pool=None):
+    """
+    Solve the Cloudflare challenge in Camoufox, log in if credentials are provided,
+    and return the resulting session state. Borrows a warm browser from browser_pool
+    when one is given, otherwise launches (and closes) a browser for this run.
+
+    :param username: Upwork username/email
+    :type username: str or None
+    :param password: Upwork password
+    :type password: str or None
+    :param search_url: Upwork job search URL to visit initially
+    :type search_url: str
+    :param login_url: Upwork login URL
+    :type login_url: str
+    :param credentials_provided: Whether Upwork credentials are provided
+    :type credentials_provided: bool
+    :param browser_pool: Shared pool of warm browsers (optional)
+    :type browser_pool: BrowserPool or None
+    :return: Dictionary with 'cookies' and 'user_agent'
+    :rtype: dict
+    """
+    if browser_pool is not None:
+        logger.info("🌐 Borrowing browser from the pool for login...")
+        async with contextlib.AsyncExitStack() as stack:
+            # near zero when a warm browser is free
+            with timing.stage('browser_launch'):
+                context = await stack.enter_async_context(browser_pool.borrow())
+            return await _login_in_context(context, username, password, search_url, login_url, credentials_provided)
+    from camoufox.async_api import AsyncCamoufox
+
+    # Only one browser for login/captcha
+    async with contextlib.AsyncExitStack() as stack:
+        with timing.stage('browser_launch'):
+            browser = await stack.enter_async_context(AsyncCamoufox(**CAMOUFOX_LAUNCH_OPTIONS))
+            logger.info("🌐 Creating browser/context/page for login...")
+            try:
+                context = await browser.new_context()
+            except Exception as e:
+                logger.error(f"⚠️ Error creating browser: {e}")
+                raise
+        return await _login_in_context(context, username, password, search_url, login_url, credentials_provided)
+
 
+async def iter_job_urls(client, search_url, limit=50, html_parser=DEFAULT_HTML_PARSER, max_concurrent_pages=4, query=None, page_semaphore=None):
+    """
+    Fetch the search result pages of one query concurrently and yield job URLs as soon as each page arrives.
+    Each job is yielded once, and the pages after the first empty one are not fetched.
 
-def get_job_urls_requests(session, search_querys, search_urls, limit=50):
+    :param client: httpx.AsyncClient with cookies and headers set
+    :type client: httpx.AsyncClient
+    :param search_url: Upwork search URL for the query
+    :type search_url: str
+    :param limit: Maximum number of job URLs to yield
+    :type limit: int, optional
+    :param html_parser: Parser backend for the search pages (see utils.html_backend)
+    :type html_parser: str, optional
+    :param max_concurrent_pages: Maximum number of search pages fetched at once
+    :type max_concurrent_pages: int, optional
+    :param query: Query label used in log messages
+    :type query: str, optional
+    :param page_semaphore: Semaphore shared with other queries; overrides max_concurrent_pages
+    :type page_semaphore: asyncio.Semaphore, optional
+    :return: Async iterator over job URLs, in page arrival order (page order within a page)
+    :rtype: AsyncIterator[str]
     """
-    For each search query and URL, use requests to fetch the page and extract job URLs.
+    pages_needed = (limit + 49) // 50
+    jobs_from_last_page = limit % 50 or 50
+    semaphore = page_semaphore or asyncio.Semaphore(max(1, max_concurrent_pages))
 
-    :param session: requests.Session object with cookies and headers set
-    :type session: requests.Session
+    async def fetch_page(page_num):
+        url = f"{search_url}&page={page_num}" if page_num > 1 else search_url
+        try:
+            async with semaphore:
+                with metrics.IN_FLIGHT.track(), timing.stage('search_page') as sample:
+                    resp = await client.get(url)
+                    sample.bytes = len(resp.content)
+                    sample.excluded = rate_limit_wait(resp)
+            resp.raise_for_status()
+            with timing.stage('search_links'):
+                job_ids = await asyncio.to_thread(extract_job_links, resp.text, html_parser)
+        except Exception as e:
+            logger.exception(f"[requests] Skipping page {page_num} due to navigation failures: {e}")
+            return page_num, None
+        page_hrefs = [job_detail_url(search_url, job_id) for job_id in job_ids]
+        logger.debug(f"Found {len(page_hrefs)} jobs on page {page_num} for query '{query or search_url}'")
+        if page_num == pages_needed:
+            page_hrefs = page_hrefs[:jobs_from_last_page]
+        return page_num, page_hrefs
+
+    tasks = {page_num: asyncio.create_task(fetch_page(page_num)) for page_num in range(1, pages_needed + 1)}
+    pending = set(tasks.values())
+    seen = set()
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for page_num, page_hrefs in sorted(task.result() for task in done if not task.cancelled()):
+                if page_hrefs == []:
+                    # the results ran out: the later pages are empty too
+                    for later, task in tasks.items():
+                        if later > page_num:
+                            task.cancel()
+                for href in page_hrefs or ():
+                    # listings shift between page loads, the same job can show up on two pages
+                    if href in seen:
+                        continue
+                    if len(seen) >= limit:
+                        return
+                    seen.add(href)
+                    yield href
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+async def get_job_urls_requests(client, search_querys, search_urls, limit=50, html_parser=DEFAULT_HTML_PARSER, max_concurrent_pages=4):
+    """
+    For each search query and URL, fetch the search pages (concurrently) and extract job URLs.
+
+    :param client: httpx.AsyncClient with cookies and headers set
+    :type client: httpx.AsyncClient
     :param search_querys: List of search query strings
     :type search_querys: list[str]
     :param search_urls: List of Upwork search URLs corresponding to the queries
     :type search_urls: list[str]
     :param limit: Maximum number of job URLs to extract per query
     :type limit: int, optional
+    :param html_parser: Parser backend for the search pages (see utils.html_backend)
+    :type html_parser: str, optional
+    :param max_concurrent_pages: Maximum number of search pages fetched at once per query
+    :type max_concurrent_pages: int, optional
     :return: Dictionary mapping each query to a list of job URLs
     :rtype: dict[str, list[str]]
     """
     search_results = {}
     for query, base_url in zip(search_querys, search_urls):
-        all_hrefs = []
-        pages_needed = (limit + 49) // 50
-        jobs_from_last_page = limit % 50 or 50
-        for page_num in range(1, pages_needed + 1):
-            url = f"{base_url}&page={page_num}" if page_num > 1 else base_url
-            try:
-                resp = session.get(url, timeout=30)
-                resp.raise_for_status()
-                html = resp.text
-                soup = BeautifulSoup(html, 'html.parser')
-                articles = soup.find_all('article')
-                page_hrefs = []
-                for i, article in enumerate(articles):
-                    a_tag = article.find('a', attrs={'data-test': 'job-tile-title-link UpLink'})
-                    if not a_tag:
-                        for a in article.find_all('a', href=True):
-                            if '/jobs/' in a['href'] and '~' in a['href']:
-                                a_tag = a
-                                break
-                    if a_tag and a_tag.has_attr('href'):
-                        href = a_tag['href']
-                        match = re.search(r'~([0-9a-zA-Z]+)', href)
-                        if match:
-                            job_id = match.group(0)
-                            job_url = f"https://www.upwork.com/jobs/{job_id}"
-                            page_hrefs.append(job_url)
-                logger.debug(f"Found {len(page_hrefs)} jobs on page {page_num} for query '{query}'")
-                if page_num == pages_needed:
-                    page_hrefs = page_hrefs[:jobs_from_last_page]
-                all_hrefs.extend(page_hrefs)
-                if len(all_hrefs) >= limit:
-                    all_hrefs = all_hrefs[:limit]
-                    break
-            except Exception as e:
-                logger.exception(f"[requests] Skipping page {page_num} due to navigation failures: {e}")
-                continue
-        search_results[query] = all_hrefs
+        search_results[query] = [
+            href async for href in iter_job_urls(client, base_url, limit, html_parser, max_concurrent_pages, query)
+        ]
     logger.debug(f"[requests] Search results: {search_results}\n")
     return search_results
 
 
-def fetch_job_detail(session, url, credentials_provided):
+def job_detail_url(search_url, job_id):
+    """
+    Build the URL of a job detail page on the host the search was sent to.
+
+    :param search_url: Search URL the job was found with
+    :type search_url: str
+    :param job_id: Job ID including the leading '~'
+    :type job_id: str
+    :return: URL of the job detail page
+    :rtype: str
+    """
+    from urllib.parse import urljoin
+    return urljoin(search_url, f"/jobs/{job_id}")
+
+def job_id_from_url(url):
+    """
+    Extract the job ID from a job URL (the part after '~').
+
+    :param url: URL of the job detail page
+    :type url: str
+    :return: Job ID, or "0" if the URL has none
+    :rtype: str
+    """
+    job_id_match = re.search(r'~([0-9a-zA-Z]+)', url)
+    return job_id_match.group(1) if job_id_match else "0"
+
+def parse_job_detail(url, html, credentials_provided, html_parser=DEFAULT_HTML_PARSER):
     """
-    Fetch job detail page and extract job attributes.
+    Extract job attributes and review columns from a downloaded job detail page.
+    Top-level and picklable so it can run in a parser worker process.
 
-    :param session: requests.Session object with cookies and headers set
-    :type session: requests.Session
     :param url: URL of the job detail page
     :type url: str
+    :param html: HTML content of the job detail page
+    :type html: str
     :param credentials_provided: Whether Upwork credentials are provided (affects restricted fields)
     :type credentials_provided: bool
-    :return: Dictionary of job attributes, or None if failed
+    :param html_parser: Parser backend for the page (see utils.html_backend)
+    :type html_parser: str
+    :return: Dictionary of job attributes, or None if the Nuxt data was missing
     :rtype: dict or None
     """
-    try:
+    job_id = job_id_from_url(url)
+    # Parse the page once and share the tree/Nuxt data between both extractors
+    page = JobPage(html, html_parser)
+    # decode and build the tree up front (both are cached) so the extractor stages time only themselves
+    with timing.stage('detail_nuxt_decode'):
+        nuxt_data = page.nuxt
+    if nuxt_data:
+        with timing.stage('detail_soup'):
+            page.soup
+    with timing.stage('detail_attributes'):
+        job_data = extract_job_attributes_from_html(page, job_id, credentials_provided)
+    flat = {"job_id": job_id, "url": url}
+    if job_data[job_id] is None:
+        return None
+    flat.update(job_data[job_id])
+
+    # Extract and integrate review data as columns
+    with timing.stage('detail_reviews'):
+        review_data = extract_reviews_as_job_columns(page, job_id)
+    flat.update(review_data)
+
+    return flat
+
+def parse_job_detail_timed(url, html, credentials_provided, html_parser=DEFAULT_HTML_PARSER):
+    """
+    Run parse_job_detail with a stage timer of its own, as parser workers cannot reach the run's timer.
+
+    :return: Tuple of (job attributes or None, timing samples to merge into the run's timer)
+    :rtype: tuple[dict or None, dict]
+    """
+    with timing.use_timer(timing.StageTimer(observe=False)) as timer:
+        job = parse_job_detail(url, html, credentials_provided, html_parser)
+    return job, timer.samples()
+
+def init_parse_worker(log_level=logging.INFO):
+    """
+    Initializer for parser worker processes: make sure the module logger exists
+    (it is only created by the CLI/API entry points, which spawned workers do not run).
+
+    :param log_level: Log level for the worker's logger
+    :type log_level: int
+    """
+    global logger
+    if globals().get('logger') is None:
+        logger = logging.getLogger("Upwork")
+        logger.setLevel(log_level)
+
+def create_parse_executor(parse_workers=None):
+    """
+    Create the process pool used to parse job pages, or None to parse in the event loop's thread pool.
+
+    :param parse_workers: Number of parser processes (None uses the CPU count, 0 disables the process pool)
+    :type parse_workers: int or None
+    :return: ProcessPoolExecutor, or None if parsing should stay in-process
+    :rtype: concurrent.futures.ProcessPoolExecutor or None
+    """
+    if parse_workers == 0:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=parse_workers or os.cpu_count() or 1,
+        initializer=init_parse_worker,
+        initargs=(logger.getEffectiveLevel(),),
+    )
+
+def throttle_reason(resp):
+    """
+    Tell whether a response asks us to send fewer requests at once.
+
+    :param resp: Response to inspect
+    :type resp: httpx.Response
+    :return: Back-off reason (see utils.concurrency), or None for a normal response
+    :rtype: str or None
+    """
+    if is_challenge_response(resp):
+        return CHALLENGE
+    if resp.status_code == 429:
+        return HTTP_429
+    if resp.status_code == 403:
+        return HTTP_403
+    return None
+
+async def _get_job_page(client, url, limiter=None):
+    """
+    Send one request for a job detail page and classify the outcome.
+
+    :return: (html, None, False, None) on success, otherwise (None, failure kind, whether it is worth retrying, Retry-After seconds)
+    :rtype: tuple[str or None, str or None, bool, float or None]
+    """
+    async with limiter.slot() if limiter else contextlib.nullcontext() as slot:
         logger.debug(f"[requests] Processing URL: {url}")
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        html = resp.text
-        job_id_match = re.search(r'~([0-9a-zA-Z]+)', url)
-        job_id = job_id_match.group(1) if job_id_match else "0"
-        job_data = extract_job_attributes_from_html(html, job_id, credentials_provided)
-        flat = {"job_id": job_id, "url": url}
-        if job_data[job_id] is None:
-            return None
-        flat.update(job_data[job_id])
-        
-        # Extract and integrate review data as columns
-        review_data = extract_reviews_as_job_columns(html, job_id)
-        flat.update(review_data)
-        
-        return flat
-    except Exception:
-        logger.debug(f"[requests] Failed to process {url}")
+        try:
+            # network time; the wait for a rate limit token is timed as 'rate_limit_wait'
+            with metrics.IN_FLIGHT.track(), timing.stage('detail_fetch') as sample:
+                resp = await client.get(url)
+                sample.bytes = len(resp.content)
+                sample.excluded = rate_limit_wait(resp)
+        except httpx.TimeoutException:
+            if slot is not None:
+                slot.throttled = TIMEOUT
+            return None, retry.NETWORK, True, None
+        except httpx.TransportError:
+            return None, retry.NETWORK, True, None
+        if slot is not None:
+            slot.throttled = throttle_reason(resp)
+            # time on the wire, without the wait for a rate limit token
+            with contextlib.suppress(RuntimeError):
+                # elapsed is not set on responses that were never streamed (e.g. mock transports)
+                slot.latency = resp.elapsed.total_seconds()
+    if is_challenge_response(resp) or 'account-security/login' in resp.url.path:
+        # only a new session helps, see SessionRenewer
+        return None, retry.CHALLENGE, False, None
+    if resp.status_code >= 400:
+        # 404/410 mean the job was removed, retrying will not bring it back
+        return None, retry.HTTP_STATUS, resp.status_code in retry.RETRYABLE_STATUSES, retry.parse_retry_after(resp.headers.get('Retry-After'))
+    if 'window.__NUXT__' not in resp.text:
+        return None, retry.NUXT_MISSING, True, None
+    return resp.text, None, False, None
+
+async def fetch_job_page(client, url, limiter=None, session=None, failures=None, max_retries=0):
+    """
+    Download a job detail page, retrying transient failures with jittered backoff.
+    Challenge pages and login redirects renew the session (once for all concurrent fetches)
+    when a session renewer is given, and the page is requested again.
+
+    :param client: httpx.AsyncClient with cookies and headers set
+    :type client: httpx.AsyncClient
+    :param url: URL of the job detail page
+    :type url: str
+    :param limiter: Adaptive concurrency limit the request waits for and reports back to (optional)
+    :type limiter: AdaptiveLimiter or None
+    :param session: Shared renewal of the client's session (optional)
+    :type session: SessionRenewer or None
+    :param failures: Counter of pages given up on, by failure kind (optional)
+    :type failures: collections.Counter or None
+    :param max_retries: Retries after network errors, retryable HTTP statuses and pages without Nuxt data
+    :type max_retries: int
+    :return: HTML of the page, or None if the page could not be fetched
+    :rtype: str or None
+    """
+    attempt = 0
+    while True:
+        generation = session.generation if session else 0
+        html, kind, retryable, retry_after = await _get_job_page(client, url, limiter)
+        if kind is None:
+            return html
+        metrics.FETCH_FAILURES.inc(kind=kind)
+        if kind == retry.CHALLENGE and session is not None and await session.renew(generation):
+            continue
+        if retryable and attempt < max_retries:
+            attempt += 1
+            delay = retry.backoff_delay(attempt, retry_after=retry_after)
+            logger.debug(f"[requests] {kind} on {url}, retry {attempt}/{max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+        if failures is not None:
+            failures[kind] += 1
+        logger.debug(f"[requests] Giving up on {url} ({kind})")
+        return None
+
+def create_concurrency_limiter(general_params, max_in_flight=25):
+    """
+    Create the adaptive limit on detail requests, with max_in_flight as its ceiling.
+
+    :param general_params: Dictionary of general parameters ('adaptive_concurrency', 'min_in_flight', 'target_latency')
+    :type general_params: dict
+    :param max_in_flight: Upper bound of concurrent detail requests
+    :type max_in_flight: int
+    :return: AdaptiveLimiter, or None to keep max_in_flight requests in flight
+    :rtype: AdaptiveLimiter or None
+    """
+    if not general_params.get('adaptive_concurrency', True):
         return None
+    target_latency = general_params.get('target_latency', 5.0)
+    try:
+        target_latency = float(target_latency)
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ Invalid target_latency '{target_latency}', using 5 seconds")
+        target_latency = 5.0
+    return AdaptiveLimiter(
+        maximum=max_in_flight,
+        minimum=get_int_option(general_params, 'min_in_flight', 2),
+        target_latency=target_latency,
+    )
+
+def log_concurrency_stats(limiter):
+    """
+    Log where the adaptive detail concurrency ended up and why it backed off.
+
+    :param limiter: Limiter used by the detail stage
+    :type limiter: AdaptiveLimiter or None
+    """
+    if limiter is None:
+        return
+    stats = limiter.stats()
+    backoffs = ', '.join(f"{reason}: {n}" for reason, n in stats['backoffs'].items()) or 'none'
+    logger.info(f"⚙️ Detail concurrency: ended at {stats['limit']} (peak {stats['peak']}, bounds {stats['minimum']}-{stats['maximum']}), back-offs: {backoffs}")
 
-def browser_worker_requests(session, job_urls, credentials_provided, max_workers=20):
+async def iter_job_details(client, job_urls, credentials_provided, max_in_flight=25, executor=None, queue_size=None, html_parser=DEFAULT_HTML_PARSER, progress=None, limiter=None, session=None, max_retries=2):
     """
-    Fetch job details in parallel using ThreadPoolExecutor for speed.
+    Fetch job details concurrently over the shared async client and parse them on the executor,
+    so downloads and parsing overlap. Jobs are yielded as soon as each one is parsed.
 
-    :param session: requests.Session object with cookies and headers set
-    :type session: requests.Session
-    :param job_urls: List of job detail page URLs to fetch
-    :type job_urls: list[str]
+    :param client: httpx.AsyncClient with cookies and headers set
+    :type client: httpx.AsyncClient
+    :param job_urls: Job detail page URLs to fetch, as a list or an async iterator that streams them in
+    :type job_urls: list[str] or AsyncIterator[str]
     :param credentials_provided: Whether Upwork credentials are provided (affects restricted fields)
     :type credentials_provided: bool
-    :param max_workers: Maximum number of worker threads to use
-    :type max_workers: int, optional
+    :param max_in_flight: Maximum number of detail requests in flight at once
+    :type max_in_flight: int, optional
+    :param executor: Executor for parsing (see create_parse_executor); None parses in the default thread pool
+    :type executor: concurrent.futures.Executor or None
+    :param queue_size: Capacity of the queues between the fetch and parse stages
+    :type queue_size: int or None
+    :param html_parser: Parser backend for the job pages (see utils.html_backend)
+    :type html_parser: str
+    :param progress: Progress counters of the run: 'jobs_scraped' (and 'concurrency' with a limiter) is updated as jobs are parsed,
+        'failures' counts the job pages given up on by failure kind
+    :type progress: dict or None
+    :param limiter: Adaptive limit on requests in flight; max_in_flight is ignored when given (optional)
+    :type limiter: AdaptiveLimiter or None
+    :param session: Shared renewal of the client's session when Upwork starts rejecting it (optional)
+    :type session: SessionRenewer or None
+    :param max_retries: Retries of a job page after a transient failure
+    :type max_retries: int
+    :return: Async iterator over job attribute dictionaries, in completion order
+    :rtype: AsyncIterator[dict]
+    """
+    scraped = 0
+    failures = progress.setdefault('failures', collections.Counter()) if progress is not None else collections.Counter()
+
+    def parse_failed(url, error):
+        logger.warning(f"⚠️ Could not parse {url}: {error!r}")
+        metrics.FETCH_FAILURES.inc(kind=retry.PARSE_ERROR)
+        failures[retry.PARSE_ERROR] += 1
+
+    pipeline = fetch_parse_pipeline(
+        job_urls,
+        fetch=lambda url: fetch_job_page(client, url, limiter, session, failures, max_retries),
+        parse=functools.partial(parse_job_detail_timed, credentials_provided=credentials_provided, html_parser=html_parser),
+        # with a limiter, every worker waits for a slot so the limit can grow up to its maximum
+        fetch_concurrency=limiter.maximum if limiter else max_in_flight,
+        executor=executor,
+        queue_size=queue_size,
+        on_parse_error=parse_failed,
+    )
+    async for result, samples in pipeline:
+        timing.merge_samples(samples)
+        if result is None:
+            continue
+        scraped += 1
+        metrics.JOBS_FETCHED.inc()
+        if progress is not None:
+            progress['jobs_scraped'] = scraped
+            if limiter:
+                progress['concurrency'] = limiter.stats()
+        yield result
+
+async def fetch_job_details(client, job_urls, credentials_provided, max_in_flight=25, executor=None, queue_size=None, html_parser=DEFAULT_HTML_PARSER, progress=None):
+    """
+    Fetch and parse every job detail page, see iter_job_details.
+
     :return: List of job attribute dictionaries
     :rtype: list[dict]
     """
-    job_attributes = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [
-            executor.submit(fetch_job_detail, session, url, credentials_provided)
-            for url in job_urls
-        ]
-        for future in concurrent.futures.as_completed(futures):
-            result = future.result()
-            if result:
-                job_attributes.append(result)
-    return job_attributes
+    return [job async for job in iter_job_details(client, job_urls, credentials_provided, max_in_flight, executor, queue_size, html_parser, progress)]
 
 
-async def main(jsonInput: dict) -> list[dict]:
+def get_int_option(params, key, default, minimum=1):
     """
-    Main entry point for the Upwork Job Scraper. Orchestrates browser setup, login, job search, and extraction.
+    Read an integer option from the general params, falling back to the default on invalid values.
 
-    :param jsonInput: Input dictionary containing credentials, search, and general parameters
-    :type jsonInput: dict
-    :return: List of job attribute dictionaries
+    :param params: Dictionary of general parameters
+    :type params: dict
+    :param key: Option name
+    :type key: str
+    :param default: Value used when the option is missing or invalid
+    :type default: int or None
+    :param minimum: Smallest accepted value (smaller values are clamped)
+    :type minimum: int
+    :return: Option value
+    :rtype: int or None
+    """
+    value = params.get(key)
+    if value is None:
+        return default
+    try:
+        return max(minimum, int(value))
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid {key} value {value!r}, using default of {default}")
+        return default
+
+def build_search_batch(search_params, credentials_provided, buffer=20, base_url=UPWORK_BASE_URL):
+    """
+    Normalize one search dict, or a list of them, into the searches of a batch run.
+
+    :param search_params: Search parameters dict, or a list of search parameter dicts
+    :type search_params: dict or list[dict]
+    :param credentials_provided: Whether Upwork credentials are provided (affects access to some filters)
+    :type credentials_provided: bool
+    :param buffer: Extra jobs fetched per query to make up for jobs dropped during extraction
+    :type buffer: int
+    :param base_url: Scheme and host the searches are sent to (see get_upwork_base_url)
+    :type base_url: str
+    :return: List of searches with 'label', 'url' and 'limit' (including the buffer) keys
     :rtype: list[dict]
     """
-    logger.info("🏁 Starting Upwork Job Scraper...")
-    # log the current time
-    start_time = time.time()
+    param_sets = search_params if isinstance(search_params, list) else [search_params]
+    searches = []
+    labels = set()
+    for index, params in enumerate(param_sets or [{}], 1):
+        params = params or {}
+        normalized_params, limit = normalize_search_params(params, credentials_provided, buffer)
+        normalized_params['base_url'] = f"{base_url}/nx/search/jobs/"
+        label = str(params.get('name') or params.get('query') or params.get('search_any') or f"search_{index}")
+        # keep labels unique so per-query membership stays unambiguous
+        if label in labels:
+            label = f"{label} ({index})"
+        labels.add(label)
+        searches.append({'label': label, 'url': build_upwork_search_url(normalized_params), 'limit': limit})
+    return searches
+
+async def iter_batch_job_urls(client, searches, membership, html_parser=DEFAULT_HTML_PARSER, max_concurrent_pages=4, progress=None):
+    """
+    Stream the job URLs of every search in a batch, yielding each job only once.
+
+    :param client: httpx.AsyncClient with cookies and headers set
+    :type client: httpx.AsyncClient
+    :param searches: Searches from build_search_batch
+    :type searches: list[dict]
+    :param membership: Dictionary filled with job URL -> list of matching search labels
+    :type membership: dict[str, list[str]]
+    :param html_parser: Parser backend for the search pages (see utils.html_backend)
+    :type html_parser: str, optional
+    :param max_concurrent_pages: Maximum number of search pages fetched at once across all searches
+    :type max_concurrent_pages: int, optional
+    :param progress: Progress counters of the run, 'jobs_found' is updated as unique jobs are found
+    :type progress: dict or None
+    :return: Async iterator over unique job URLs
+    :rtype: AsyncIterator[str]
+    """
+    queue = asyncio.Queue(maxsize=max_concurrent_pages * 50)
+    page_semaphore = asyncio.Semaphore(max(1, max_concurrent_pages))
+    done = object()
+
+    async def run_search(search):
+        async for href in iter_job_urls(client, search['url'], search['limit'], html_parser, query=search['label'], page_semaphore=page_semaphore):
+            await queue.put((search['label'], href))
+
+    async def run_all():
+        try:
+            await asyncio.gather(*(run_search(search) for search in searches))
+        finally:
+            await queue.put(done)
+
+    producer = asyncio.create_task(run_all())
+    try:
+        while (entry := await queue.get()) is not done:
+            label, href = entry
+            labels = membership.setdefault(href, [])
+            if label not in labels:
+                labels.append(label)
+            # only the first query to find a job triggers its detail fetch
+            if len(labels) == 1:
+                if progress is not None:
+                    progress['jobs_found'] = len(membership)
+                yield href
+        await producer
+    finally:
+        producer.cancel()
+    logger.debug(f"[requests] {len(membership)} unique jobs across {len(searches)} searches")
+
+def select_batch_results(job_attributes, searches, membership, buffer=20):
+    """
+    Attach the matching search labels to every job and trim each search to its requested limit.
+    A job is kept while at least one of the searches it matched is still below its limit.
+
+    :param job_attributes: List of job attribute dictionaries
+    :type job_attributes: list[dict]
+    :param searches: Searches from build_search_batch
+    :type searches: list[dict]
+    :param membership: Job URL -> list of matching search labels (from iter_batch_job_urls)
+    :type membership: dict[str, list[str]]
+    :param buffer: Buffer that was added to each search limit
+    :type buffer: int
+    :return: Selected job attribute dictionaries with a 'matched_queries' column
+    :rtype: list[dict]
+    """
+    remaining = batch_remaining_limits(searches, buffer)
+    return [job for job in job_attributes if select_batch_job(job, remaining, membership)]
+
+def batch_remaining_limits(searches, buffer=20):
+    """
+    Number of results still wanted per search label, for select_batch_job.
+
+    :param searches: Searches from build_search_batch
+    :type searches: list[dict]
+    :param buffer: Buffer that was added to each search limit
+    :type buffer: int
+    :return: Search label -> remaining number of results
+    :rtype: dict[str, int]
+    """
+    return {search['label']: search['limit'] - buffer for search in searches}
+
+def select_batch_job(job, remaining, membership):
+    """
+    Decide whether a single job is kept, attaching its 'matched_queries' and counting it
+    against the limits of the searches it matched.
+
+    :param job: Job attribute dictionary
+    :type job: dict
+    :param remaining: Search label -> remaining number of results (updated in place)
+    :type remaining: dict[str, int]
+    :param membership: Job URL -> list of matching search labels (from iter_batch_job_urls)
+    :type membership: dict[str, list[str]]
+    :return: True if the job is kept
+    :rtype: bool
+    """
+    labels = list(membership.get(job.get('url'), []))
+    if labels and not any(remaining.get(label, 0) > 0 for label in labels):
+        return False
+    for label in labels:
+        remaining[label] = remaining.get(label, 0) - 1
+    job['matched_queries'] = labels
+    return True
+
+NUM_DETAIL_WORKERS = 25
 
+def get_upwork_base_url(general_params):
+    """
+    Read the 'upwork_base_url' option, which points searches, job pages and the login at
+    another host (e.g. the mock server in benchmarks/mock_upwork.py).
+
+    :param general_params: Dictionary of general parameters
+    :type general_params: dict
+    :return: Scheme and host without a trailing slash
+    :rtype: str
+    """
+    return str(general_params.get('upwork_base_url') or UPWORK_BASE_URL).rstrip('/')
+
+
+def get_credentials(jsonInput):
+    """
+    Extract and validate the Upwork credentials of a run.
+
+    :param jsonInput: Input dictionary containing credentials, search, and general parameters
+    :type jsonInput: dict
+    :return: Tuple of (username, password, credentials_provided); username and password are None without login
+    :rtype: tuple[str or None, str or None, bool]
+    """
     # Extract credentials and determine if login is enabled
     if "credentials" in jsonInput:
         credentials_json = jsonInput["credentials"]
@@ -1650,7 +2365,143 @@ async def main(jsonInput: dict) -> list[dict]:
         logger.info("🚫 Running without login (no credentials provided)")
         username = None
         password = None
-    # Extract search params
+    return username, password, credentials_provided
+
+async def open_session(general_params, username, password, search_url, credentials_provided, max_in_flight=NUM_DETAIL_WORKERS, browser_pool=None):
+    """
+    Build the pooled HTTP client for a run: reuse a stored session if the server still accepts it,
+    otherwise log in through the browser (and store the new session). With 'use_browser' off the
+    client starts without cookies, for hosts that need no Cloudflare clearance (the mock server).
+
+    :param general_params: Dictionary of general parameters ('reuse_session', 'session_vault', 'rate_limit', 'rate_burst',
+        'use_browser', 'upwork_base_url')
+    :type general_params: dict
+    :param username: Upwork username/email
+    :type username: str or None
+    :param password: Upwork password
+    :type password: str or None
+    :param search_url: Upwork job search URL used for the Cloudflare challenge and the session probe
+    :type search_url: str
+    :param credentials_provided: Whether Upwork credentials are provided
+    :type credentials_provided: bool
+    :param max_in_flight: Maximum number of concurrent requests the client will keep open
+    :type max_in_flight: int
+    :param browser_pool: Shared pool of warm browsers used for the login (optional)
+    :type browser_pool: BrowserPool or None
+    :return: httpx.AsyncClient with the session's cookies and user-agent
+    :rtype: httpx.AsyncClient
+    """
+    login_url = get_upwork_base_url(general_params) + UPWORK_LOGIN_PATH
+    rate_limit, burst = get_rate_limit(general_params)
+    if not general_params.get('use_browser', True):
+        logger.info("🌐 Browser login disabled, starting without a session")
+        return build_http_client([], DEFAULT_USER_AGENT, max_in_flight, rate_limit=rate_limit, burst=burst)
+    # Reuse a stored session if the server still accepts it, otherwise log in through the browser
+    client = None
+    vault = SessionVault(general_params.get('session_vault', DEFAULT_VAULT_PATH)) if general_params.get('reuse_session', True) else None
+    account = account_key(username)
+    session_state = vault.load(account) if vault else None
+    if session_state:
+        logger.info(f"🔑 Found stored session from {session_state['saved_at']}, validating...")
+        client = build_http_client(session_state['cookies'], session_state['user_agent'], max_in_flight, rate_limit=rate_limit, burst=burst)
+        if await probe_session(client, search_url, login_url, credentials_provided):
+            logger.info("✅ Stored session accepted, skipping browser login")
+        else:
+            logger.info("🔴 Stored session was rejected, logging in with the browser...")
+            await client.aclose()
+            client = None
+            vault.discard(account)
+    if client is None:
+        try:
+            session_state = await browser_login_session(username, password, search_url, login_url, credentials_provided, browser_pool)
+        except Exception:
+            sys.exit(1)
+        if vault:
+            vault.save(account, session_state['cookies'], session_state['user_agent'])
+        # Build the pooled async client from the browser session
+        client = build_http_client(session_state['cookies'], session_state['user_agent'], max_in_flight, rate_limit=rate_limit, burst=burst)
+    return client
+
+async def renew_session(client, general_params, username, password, search_url, credentials_provided, browser_pool=None):
+    """
+    Log in again with the browser after Upwork stopped accepting the session, and swap the new
+    cookies and user-agent into the running client so queued requests continue with them.
+
+    :param client: httpx.AsyncClient shared by the run
+    :type client: httpx.AsyncClient
+    :param general_params: Dictionary of general parameters ('reuse_session', 'session_vault', 'use_browser', 'upwork_base_url')
+    :type general_params: dict
+    :param username: Upwork username/email
+    :type username: str or None
+    :param password: Upwork password
+    :type password: str or None
+    :param search_url: Upwork job search URL used for the Cloudflare challenge
+    :type search_url: str
+    :param credentials_provided: Whether Upwork credentials are provided
+    :type credentials_provided: bool
+    :param browser_pool: Shared pool of warm browsers used for the login (optional)
+    :type browser_pool: BrowserPool or None
+    """
+    if not general_params.get('use_browser', True):
+        # nothing to renew without a browser; the rejected fetches are simply sent again
+        logger.debug("Browser login disabled, retrying with the same client")
+        return
+    account = account_key(username)
+    vault = SessionVault(general_params.get('session_vault', DEFAULT_VAULT_PATH)) if general_params.get('reuse_session', True) else None
+    if vault:
+        vault.discard(account)
+    login_url = get_upwork_base_url(general_params) + UPWORK_LOGIN_PATH
+    session_state = await browser_login_session(username, password, search_url, login_url, credentials_provided, browser_pool)
+    client.cookies = playwright_cookies_to_httpx(session_state['cookies'])
+    client.headers['User-Agent'] = session_state['user_agent']
+    if vault:
+        vault.save(account, session_state['cookies'], session_state['user_agent'])
+
+async def iter_scraped_jobs(jsonInput: dict, browser_pool=None, progress=None, batch=None, resume=None, journal=None):
+    """
+    Orchestrate browser setup, login, job search, and extraction, yielding each complete job
+    as soon as it is parsed. Per-search limits are not applied here (see select_batch_job).
+
+    :param jsonInput: Input dictionary containing credentials, search, and general parameters
+    :type jsonInput: dict
+    :param browser_pool: Shared pool of warm browsers used for the login (optional)
+    :type browser_pool: BrowserPool or None
+    :param progress: Dictionary updated in place with the current 'stage' and job counters (optional)
+    :type progress: dict or None
+    :param batch: Dictionary filled with the run's 'searches', 'membership', 'buffer' and the 'skipped'
+        job IDs whose stored records were reused instead of fetched (optional)
+    :type batch: dict or None
+    :param resume: ID of a journaled run to continue instead of starting a new one (optional)
+    :type resume: str or None
+    :param journal: Journal already opened with open_run_journal, jsonInput then being the input it returned (optional)
+    :type journal: RunJournal or None
+    :return: Async iterator over job attribute dictionaries, in completion order
+    :rtype: AsyncIterator[dict]
+    """
+    logger.info("🏁 Starting Upwork Job Scraper...")
+    if progress is None:
+        progress = {}
+    progress.update(stage='login', jobs_found=0, jobs_scraped=0, jobs_skipped=0)
+    if journal is None:
+        journal, jsonInput = open_run_journal(jsonInput, resume)
+    if journal is None:
+        async for job in _iter_scraped_jobs(jsonInput, browser_pool, progress, batch, None):
+            yield job
+        return
+    progress['journal_id'] = journal.run_id
+    try:
+        async for job in _iter_scraped_jobs(jsonInput, browser_pool, progress, batch, journal):
+            yield job
+        journal.finish(keep=jsonInput.get('general', {}).get('keep_journal', False))
+    finally:
+        if not journal.finished:
+            journal.close()
+            logger.info(f"📓 Run did not finish, continue it with: python main.py --resume {journal.run_id}")
+
+async def _iter_scraped_jobs(jsonInput, browser_pool, progress, batch, journal):
+
+    username, password, credentials_provided = get_credentials(jsonInput)
+    # Extract search params (a single search dict, or a list of them for a batch run)
     search_params = jsonInput.get('search', {})
 
     # If still not present, fallback to defaults
@@ -1658,76 +2509,565 @@ async def main(jsonInput: dict) -> list[dict]:
         search_params = {}
     # Extract general params
     general_params = jsonInput.get('general', {})
-    # Always save CSV locally as requested
-    save_csv = True
 
-    # Normalize search params and get limit
+    # Normalize search params, get limits and build search URLs
     buffer = 20
-    normalized_search_params, limit = normalize_search_params(search_params, credentials_provided, buffer)
-
-    # Build search URL using the function
     logger.info("🏗️  Building search URL...")
-    search_url = build_upwork_search_url(normalized_search_params)
-    logger.debug(f"Search URL: {search_url}")
-
-    # Visit Upwork login page
-    login_url = "https://www.upwork.com/ab/account-security/login"
+    searches = build_search_batch(search_params, credentials_provided, buffer, get_upwork_base_url(general_params))
+    search_url = searches[0]['url']
+    for search in searches:
+        logger.debug(f"Search URL for '{search['label']}': {search['url']}")
+    membership = {}
+    skipped_ids = set()
+    if batch is not None:
+        batch.update(searches=searches, membership=membership, buffer=buffer, skipped=skipped_ids)
+    if journal and journal.urls:
+        # records finished before the interruption were already stored and written out
+        logger.info(f"📓 Resuming run {journal.run_id}: {len(journal.jobs)} jobs done, {len(journal.pending_urls())} found but not fetched")
+        for url, labels in journal.urls.items():
+            membership[url] = list(labels)
+        progress['jobs_found'] = len(membership)
+        for job in journal.jobs.values():
+            skipped_ids.add(job['job_id'])
+            yield job
+        if journal.finished or journal.search_done and not journal.pending_urls():
+            return
+
+    max_in_flight = get_int_option(general_params, 'max_in_flight', NUM_DETAIL_WORKERS)
+    parse_workers = get_int_option(general_params, 'parse_workers', None, minimum=0)
+    html_parser = resolve_html_parser(general_params.get('html_parser'))
+    search_concurrency = get_int_option(general_params, 'search_concurrency', 4)
+    refetch_after_hours = get_refetch_after_hours(general_params)
+    max_retries = get_int_option(general_params, 'max_retries', 2, minimum=0)
+    client = await open_session(general_params, username, password, search_url, credentials_provided, max_in_flight, browser_pool)
+    # A challenge or login page in the middle of the run logs in again once for every fetch, which then resumes
+    session = SessionRenewer(
+        functools.partial(renew_session, client, general_params, username, password, search_url, credentials_provided, browser_pool),
+        max_renewals=get_int_option(general_params, 'max_reauth', 1, minimum=0),
+    )
+    # Use the async client for all scraping
+    progress['stage'] = 'scraping'
+    async with client:
+        # Job URLs of every query are streamed (deduplicated) into the detail stage as each search page arrives
+        logger.info("💼 Getting Related Jobs...")
+        job_urls = iter_batch_job_urls(client, searches, membership, html_parser, search_concurrency, progress)
+        if journal:
+            job_urls = journal_job_urls(job_urls, journal, membership)
+        # Jobs fetched recently are served from the job store instead of being fetched again
+        store = open_job_store(general_params) if refetch_after_hours is not None else None
+        stored_jobs = collections.deque()
+        if store:
+            job_urls = skip_fresh_jobs(job_urls, store, refetch_after_hours, stored_jobs, progress)
+        # Process jobs with the async client, parsing on the process pool
+        try:
+            logger.info("🏢 Getting Job Attributes with requests...")
+            executor = create_parse_executor(parse_workers)
+            limiter = create_concurrency_limiter(general_params, max_in_flight)
+            try:
+                async for job in iter_job_details(client, job_urls, credentials_provided, max_in_flight=max_in_flight, executor=executor, html_parser=html_parser, progress=progress, limiter=limiter, session=session, max_retries=max_retries):
+                    while stored_jobs:
+                        yield reuse_stored_job(stored_jobs.popleft(), skipped_ids, journal)
+                    # Filter out jobs where Nuxt data was missing (i.e., job is None)
+                    if job is not None and all(v is not None for v in job.values()):
+                        if journal:
+                            journal.record_job(job)
+                        yield job
+                while stored_jobs:
+                    yield reuse_stored_job(stored_jobs.popleft(), skipped_ids, journal)
+                log_concurrency_stats(limiter)
+                if limiter:
+                    progress['concurrency'] = limiter.stats()
+                if progress.get('failures'):
+                    reasons = ', '.join(f"{kind}: {n}" for kind, n in progress['failures'].items())
+                    logger.warning(f"⚠️ {sum(progress['failures'].values())} job pages could not be fetched ({reasons})")
+            finally:
+                if executor:
+                    executor.shutdown(cancel_futures=True)
+                if store:
+                    store.close()
+        except Exception as e:
+            logger.error(f"⚠️ Error getting job attributes: {e}")
+            sys.exit(1)
 
-    NUM_DETAIL_WORKERS = 25
+def open_run_journal(jsonInput, resume=None):
+    """
+    Start the journal of a new run, or reopen the journal of the run to resume.
+    A resumed run uses its journaled input, with the credentials of the new input if it has any;
+    a run that was logged in cannot be resumed without them, as the password is not journaled.
+    Entry points resume a run with this before opening their outputs, so those follow the resolved input.
 
-    search_queries = [search_params.get('query', search_params.get('search_any', 'search'))]
-    search_urls = [search_url]
-    # Only one browser for login/captcha
-    async with AsyncCamoufox(headless=True, geoip=True, humanize=True, i_know_what_im_doing=True, config={'forceScopeAccess': True}, disable_coop=True) as browser:
-        logger.info("🌐 Creating browser/context/page for login...")
+    :param jsonInput: Input dictionary containing credentials, search, and general parameters
+    :type jsonInput: dict
+    :param resume: ID of the run to resume (optional)
+    :type resume: str or None
+    :return: Open journal (None if journaling is disabled) and the input to run with
+    :rtype: tuple[RunJournal or None, dict]
+    """
+    general_params = jsonInput.get('general', {})
+    journal_dir = general_params.get('journal_dir', DEFAULT_JOURNAL_DIR)
+    if resume:
         try:
-            context = await browser.new_context()
-            page = await context.new_page()
-        except Exception as e:
-            logger.error(f"⚠️ Error creating browser: {e}")
+            journal = RunJournal.resume(resume, journal_dir)
+        except FileNotFoundError as e:
+            logger.error(f"⚠️ Cannot resume: {e}")
             sys.exit(1)
+        resumed_input = journal.load_input()
+        credentials = jsonInput.get('credentials') or {}
+        journaled_username = (resumed_input.get('credentials') or {}).get('username')
+        if credentials.get('username') and credentials.get('password'):
+            resumed_input['credentials'] = credentials
+        elif journaled_username:
+            # going on without login would silently change what the searches return
+            logger.error(f"⚠️ Cannot resume: run {resume} was logged in as {journaled_username}, pass its credentials (e.g. with --jsonInput)")
+            journal.close()
+            sys.exit(1)
+        return journal, resumed_input
+    if not general_params.get('journal', True):
+        return None, jsonInput
+    journal = RunJournal.create(jsonInput, journal_dir)
+    logger.info(f"📓 Journaling run {journal.run_id} to {journal.directory}")
+    return journal, jsonInput
+
+async def journal_job_urls(job_urls, journal, membership):
+    """
+    Pass on the URLs a resumed run still has to fetch, then the URLs found by the searches that
+    are not in the journal yet, journaling each of them. The searches are not run again once the
+    journal has all their URLs.
+
+    :param job_urls: Job URLs from the search stage
+    :type job_urls: AsyncIterator[str]
+    :param journal: Journal of the run
+    :type journal: RunJournal
+    :param membership: Job URL -> matching search labels
+    :type membership: dict[str, list[str]]
+    :return: Async iterator over the job URLs to fetch
+    :rtype: AsyncIterator[str]
+    """
+    for url in journal.pending_urls():
+        yield url
+    if journal.search_done:
+        await job_urls.aclose()
+        return
+    async for url in job_urls:
+        # searches run again find the journaled URLs again: pending ones were passed on above, the rest are done
+        if url in journal.urls:
+            continue
+        journal.record_url(url, membership.get(url, []))
+        yield url
+    # queries that found a job after the first one are journaled too, for matched_queries on resume
+    for url, labels in membership.items():
+        if journal.urls.get(url) != labels:
+            journal.record_url(url, labels)
+    journal.record_search_done()
+
+def reuse_stored_job(record, skipped_ids, journal=None):
+    """
+    Mark a job whose stored record was reused instead of fetched.
+
+    :param record: Stored job record
+    :type record: dict
+    :param skipped_ids: IDs of the run's reused jobs
+    :type skipped_ids: set[str]
+    :param journal: Journal of the run (optional)
+    :type journal: RunJournal or None
+    :return: The record
+    :rtype: dict
+    """
+    skipped_ids.add(record['job_id'])
+    if journal:
+        journal.record_job(record, reused=True)
+    return record
+
+def get_refetch_after_hours(general_params):
+    """
+    Freshness policy for job detail pages: jobs fetched within 'refetch_after_hours' are reused
+    from the job store. Activity columns (proposals, interviews, invites, last activity) change
+    all the time, so 'track_activity' always refetches.
+
+    :param general_params: Dictionary of general parameters
+    :type general_params: dict
+    :return: Maximum age in hours of a reusable stored job, or None to fetch every job
+    :rtype: float or None
+    """
+    value = general_params.get('refetch_after_hours')
+    if value is None or general_params.get('track_activity') or not general_params.get('store_jobs', True):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ Invalid refetch_after_hours '{value}', fetching every job")
+        return None
+    return value if value > 0 else None
+
+async def skip_fresh_jobs(job_urls, store, max_age_hours, stored_jobs, progress=None):
+    """
+    Pass on the URLs of jobs that need fetching; the stored records of jobs fetched
+    within max_age_hours are appended to stored_jobs instead.
+
+    :param job_urls: Job URLs from the search stage
+    :type job_urls: AsyncIterator[str]
+    :param store: Job store to look the jobs up in
+    :type store: JobStore
+    :param max_age_hours: Maximum age of a reusable stored job
+    :type max_age_hours: float
+    :param stored_jobs: Receives the reused job records
+    :type stored_jobs: collections.deque
+    :param progress: Progress counters of the run, 'jobs_skipped' is updated as jobs are reused
+    :type progress: dict or None
+    :return: Async iterator over the job URLs to fetch
+    :rtype: AsyncIterator[str]
+    """
+    reused = 0
+    async for url in job_urls:
+        record = store.fresh_record(job_id_from_url(url), max_age_hours)
+        if record is None:
+            yield url
+            continue
+        stored_jobs.append(record)
+        reused += 1
+        if progress is not None:
+            progress['jobs_skipped'] = reused
+    logger.info(f"♻️ Reused {reused} stored jobs fetched within the last {max_age_hours:g}h")
+
+def open_job_store(general_params):
+    """
+    Open the job store configured in the general params.
+
+    :param general_params: Dictionary of general parameters ('store_jobs', 'job_store')
+    :type general_params: dict
+    :return: Open JobStore, or None if storing is disabled
+    :rtype: JobStore or None
+    """
+    if not general_params.get('store_jobs', True):
+        return None
+    return JobStore(general_params.get('job_store', DEFAULT_JOB_STORE_PATH))
+
+async def stream_jobs(jsonInput: dict, browser_pool=None, progress=None, resume=None, journal=None):
+    """
+    Yield every selected job as soon as it is parsed, for streaming API responses.
+    Per-search limits are applied on the fly, so 'matched_queries' lists the searches
+    that had found the job by the time it was yielded.
+
+    :param jsonInput: Input dictionary containing credentials, search, and general parameters
+    :type jsonInput: dict
+    :param browser_pool: Shared pool of warm browsers used for the login (optional)
+    :type browser_pool: BrowserPool or None
+    :param progress: Dictionary updated in place with the current 'stage' and job counters (optional)
+    :type progress: dict or None
+    :param resume: ID of a journaled run to continue instead of starting a new one (optional)
+    :type resume: str or None
+    :param journal: Journal already opened with open_run_journal, jsonInput then being the input it returned (optional)
+    :type journal: RunJournal or None
+    :return: Async iterator over job attribute dictionaries
+    :rtype: AsyncIterator[dict]
+    """
+    batch = {}
+    remaining = None
+    counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+    if resume and journal is None:
+        # a resumed run stores its jobs where the journaled input says
+        journal, jsonInput = open_run_journal(jsonInput, resume)
+    metrics.RUNS_STARTED.inc()
+    run_status = 'failed'
+    store = open_job_store(jsonInput.get('general', {}))
+    try:
+        async for job in iter_scraped_jobs(jsonInput, browser_pool, progress, batch, journal=journal):
+            if remaining is None:
+                remaining = batch_remaining_limits(batch['searches'], batch['buffer'])
+            if select_batch_job(job, remaining, batch['membership']):
+                # reused jobs keep the timestamp of their last actual fetch
+                if store and job['job_id'] not in batch['skipped']:
+                    for status, n in store.upsert_many([job]).items():
+                        counts[status] += n
+                yield job
+        run_status = 'succeeded'
+    except (GeneratorExit, asyncio.CancelledError):
+        # the consumer stopped, e.g. a streaming client disconnected
+        run_status = 'cancelled'
+        raise
+    finally:
+        metrics.RUNS_FINISHED.inc(status=run_status)
+        if store:
+            store.close()
+    if store:
+        logger.info(f"🗄️ Job store {store.path}: {counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged, {len(batch.get('skipped', ()))} reused")
+    if progress is not None:
+        progress['stage'] = 'done'
+
+def open_output_sinks(general_params, prefix='job_results'):
+    """
+    Open the output files configured in the general params, written to as jobs arrive.
+
+    :param general_params: Dictionary of general parameters ('output', 'output_dir')
+    :type general_params: dict
+    :param prefix: File name prefix
+    :type prefix: str
+    :return: Open sinks, one per output format
+    :rtype: list
+    """
+    formats = resolve_output_formats(general_params.get('output'))
+    output_dir = general_params.get('output_dir') or os.path.join('data', 'jobs')
+    return open_sinks(formats, output_dir, prefix, rename=normalize_csv_column_names)
+
+def close_output_sinks(sinks):
+    """
+    Close the sinks and log where their jobs were written.
+
+    :param sinks: Sinks returned by open_output_sinks
+    :type sinks: list
+    """
+    for sink in sinks:
         try:
-            logger.info("🔒 Solving Captcha (no login)...")
-            page, context = await login_and_solve(page, context, username, password, search_url, login_url, credentials_provided)
+            sink.close()
         except Exception as e:
-            logger.error(f"⚠️ Error logging in: {e}")
-            sys.exit(1)
-        # Extract cookies and user-agent, build requests session
-        session = await get_requests_session_from_playwright(context, page)
-    # Use requests for all scraping
+            logger.error(f"⚠️ Failed to finish {sink.path}: {e}")
+            continue
+        logger.info(f"💾 Saved {sink.count} jobs to {sink.path}")
+
+def write_run_report(general_params, report):
+    """
+    Log where the run spent its time and write the run report to ``<output_dir>/reports/``.
+
+    :param general_params: Dictionary of general parameters ('run_report', 'output_dir')
+    :type general_params: dict
+    :param report: Run report (see utils.timing.StageTimer.report)
+    :type report: dict
+    :return: Path of the report file, or None if it was not written
+    :rtype: str or None
+    """
+    slowest = sorted(report['stages'].items(), key=lambda item: item[1]['total_seconds'], reverse=True)[:5]
+    if slowest:
+        logger.info("⏱️ Time by stage: " + ', '.join(f"{name} {stats['total_seconds']:.1f}s ({stats['count']}x)" for name, stats in slowest))
+    if not general_params.get('run_report', True):
+        return None
+    output_dir = general_params.get('output_dir') or os.path.join('data', 'jobs')
+    path = os.path.join(output_dir, 'reports', f"run_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
     try:
-        logger.info("💼 Getting Related Jobs...")
-        job_urls_dict = get_job_urls_requests(session, search_queries, search_urls, limit=limit)
-        job_urls = list(job_urls_dict.values())[0]
-        logger.debug(f"Got {len(job_urls)} job URLs.")
-    except Exception as e:
-        logger.error(f"⚠️ Error getting jobs: {e}")
-        sys.exit(1)
-    # Process jobs with requests
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        logger.error(f"⚠️ Failed to write the run report: {e}")
+        return None
+    logger.info(f"⏱️ Run report saved to {path}")
+    return path
+
+class SessionExpiredError(RuntimeError):
+    """Raised when Upwork answers with a Cloudflare challenge or the login page instead of results."""
+
+async def iter_new_job_urls(client, search_url, seen, limit=50, html_parser=DEFAULT_HTML_PARSER):
+    """
+    Walk the pages of a search sorted by recency and yield the URLs of jobs not seen before.
+    Pagination stops at the first already seen job, so the number of requests follows the
+    number of new postings rather than the limit.
+
+    :param client: httpx.AsyncClient with cookies and headers set
+    :type client: httpx.AsyncClient
+    :param search_url: Upwork search URL sorted by recency
+    :type search_url: str
+    :param seen: Job IDs that are already known
+    :type seen: set[str]
+    :param limit: Maximum number of new job URLs per call
+    :type limit: int
+    :param html_parser: Parser backend for the search pages (see utils.html_backend)
+    :type html_parser: str
+    :return: Async iterator over new job URLs, newest first
+    :rtype: AsyncIterator[str]
+    :raises SessionExpiredError: If the session is no longer accepted
+    """
+    found = 0
+    page_num = 1
+    while found < limit:
+        url = f"{search_url}&page={page_num}" if page_num > 1 else search_url
+        with metrics.IN_FLIGHT.track(), timing.stage('search_page') as sample:
+            resp = await client.get(url)
+            sample.bytes = len(resp.content)
+            sample.excluded = rate_limit_wait(resp)
+        if is_challenge_response(resp) or 'account-security/login' in resp.url.path:
+            raise SessionExpiredError(f"Session rejected while fetching {url}")
+        resp.raise_for_status()
+        with timing.stage('search_links'):
+            job_ids = await asyncio.to_thread(extract_job_links, resp.text, html_parser)
+        for job_id in job_ids:
+            if job_id.lstrip('~') in seen:
+                return
+            yield job_detail_url(search_url, job_id)
+            found += 1
+            if found >= limit:
+                return
+        # a short page is the last one
+        if len(job_ids) < 50:
+            return
+        page_num += 1
+
+def watch_search_params(search_params):
+    """
+    Copy search params with the sort order forced to newest first, as watch mode requires.
+
+    :param search_params: Search parameters dict, or a list of search parameter dicts
+    :type search_params: dict or list[dict]
+    :return: Search parameters sorted by recency
+    :rtype: dict or list[dict]
+    """
+    if isinstance(search_params, list):
+        return [dict(params or {}, sort='newest') for params in search_params]
+    return dict(search_params or {}, sort='newest')
+
+async def watch_jobs(jsonInput: dict, interval=300, browser_pool=None, max_cycles=None):
+    """
+    Poll the searches on an interval over one session and yield the jobs posted since the previous poll.
+    Jobs already in the job store count as seen, so a restarted watch does not report them again.
+    When Upwork rejects the session, the watch waits one interval and logs in again, dropping the stored
+    session; the jobs found before the rejection are fetched after the next poll. After 'max_reauth'
+    logins in a row that are rejected on their first poll, it stops with SessionExpiredError.
+
+    :param jsonInput: Input dictionary containing credentials, search, and general parameters
+    :type jsonInput: dict
+    :param interval: Seconds between polls
+    :type interval: float
+    :param browser_pool: Shared pool of warm browsers used for the login (optional)
+    :type browser_pool: BrowserPool or None
+    :param max_cycles: Stop after this many polls (None polls until cancelled)
+    :type max_cycles: int or None
+    :return: Async iterator over the list of new jobs found by each poll
+    :rtype: AsyncIterator[list[dict]]
+    """
+    username, password, credentials_provided = get_credentials(jsonInput)
+    general_params = jsonInput.get('general', {})
+    # the search limit caps the number of new jobs per poll, no buffer is needed as pages are walked until a seen job
+    searches = build_search_batch(watch_search_params(jsonInput.get('search', {})), credentials_provided, buffer=0, base_url=get_upwork_base_url(general_params))
+    search_url = searches[0]['url']
+    max_in_flight = get_int_option(general_params, 'max_in_flight', NUM_DETAIL_WORKERS)
+    parse_workers = get_int_option(general_params, 'parse_workers', None, minimum=0)
+    html_parser = resolve_html_parser(general_params.get('html_parser'))
+
+    store = open_job_store(general_params)
+    seen = store.job_ids() if store else set()
+    logger.info(f"👀 Watching {len(searches)} search(es) every {interval:g}s ({len(seen)} known jobs)")
+    client = await open_session(general_params, username, password, search_url, credentials_provided, max_in_flight, browser_pool)
+    executor = create_parse_executor(parse_workers)
+    # one limiter for the whole watch, so what a poll learned about Upwork's limits carries over
+    limiter = create_concurrency_limiter(general_params, max_in_flight)
+    max_reauth = get_int_option(general_params, 'max_reauth', 1, minimum=0)
+    reauths = 0
+    cycle = 0
+    # jobs found by a poll whose session was rejected halfway, not yet marked as seen
+    carried = {}
     try:
-        logger.info("🏢 Getting Job Attributes with requests...")
-        job_attributes = browser_worker_requests(session, job_urls, credentials_provided, max_workers=NUM_DETAIL_WORKERS)
-    except Exception as e:
-        logger.error(f"⚠️ Error getting job attributes: {e}")
-        sys.exit(1)
-    # Filter out jobs where Nuxt data was missing (i.e., job is None)
-    job_attributes = [job for job in job_attributes if job is not None and all(v is not None for v in job.values())]
-    logger.debug(f"job_attributes after filter: {len(job_attributes)}")
-    # Trim to the original limit
-    logger.debug(f"limit: {limit-buffer}")
-    job_attributes = job_attributes[:limit-buffer]
-    # Push to Apify dataset if running on Apify
-    if os.environ.get("ACTOR_INPUT_KEY"):
-        for item in job_attributes:
-            await Actor.push_data(item)
-    if save_csv:
-        # Ensure output directory exists
-        os.makedirs('data/jobs/csv', exist_ok=True)
-        # Normalize column names to be simple and user-friendly
-        normalized_job_attributes = [normalize_csv_column_names(job) for job in job_attributes]
-        df = pd.DataFrame(normalized_job_attributes)
-        df = df.sort_index(axis=1)
-        df.to_csv(f'data/jobs/csv/job_results_{datetime.datetime.now().strftime("%Y%m%d_%H%M%S")}.csv', index=False)
+        while True:
+            cycle += 1
+            membership, carried = carried, {}
+            try:
+                for search in searches:
+                    async for href in iter_new_job_urls(client, search['url'], seen, search['limit'], html_parser):
+                        labels = membership.setdefault(href, [])
+                        if search['label'] not in labels:
+                            labels.append(search['label'])
+            except SessionExpiredError as e:
+                if reauths >= max_reauth:
+                    logger.error(f"⚠️ {e} after {reauths} new login(s) in a row, stopping the watch")
+                    raise
+                reauths += 1
+                logger.warning(f"⚠️ {e}, logging in again in {interval:g}s ({reauths}/{max_reauth})")
+                if membership:
+                    logger.info(f"👀 Keeping the {len(membership)} new jobs found so far for the next poll")
+                carried = membership
+                # an immediate login would likely be rejected too, and repeated logins get the account flagged
+                await asyncio.sleep(interval)
+                # drops the stored session first, a new client would otherwise be handed the rejected one again
+                await renew_session(client, general_params, username, password, search_url, credentials_provided, browser_pool)
+                continue
+            except Exception as e:
+                # jobs found before the failure are still processed
+                logger.error(f"⚠️ Poll {cycle} failed: {e}")
+            reauths = 0
+            # mark as seen before fetching so a failing job page is not retried on every poll
+            seen.update(job_id_from_url(url) for url in membership)
+            new_jobs = []
+            if membership:
+                async for job in iter_job_details(client, list(membership), credentials_provided, max_in_flight=max_in_flight, executor=executor, html_parser=html_parser, limiter=limiter):
+                    if job is not None and all(v is not None for v in job.values()):
+                        job['matched_queries'] = membership.get(job['url'], [])
+                        new_jobs.append(job)
+                if store:
+                    store.upsert_many(new_jobs)
+            logger.info(f"👀 Poll {cycle}: {len(new_jobs)} new jobs")
+            yield new_jobs
+            if max_cycles and cycle >= max_cycles:
+                break
+            await asyncio.sleep(interval)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        await client.aclose()
+        if store:
+            store.close()
+
+async def run_watch(jsonInput: dict, interval=300):
+    """
+    CLI watch mode: log every new job and append it to the watch's output files.
+
+    :param jsonInput: Input dictionary containing credentials, search, and general parameters
+    :type jsonInput: dict
+    :param interval: Seconds between polls
+    :type interval: float
+    """
+    sinks = open_output_sinks(jsonInput.get('general', {}), prefix='new_jobs')
+    try:
+        async for new_jobs in watch_jobs(jsonInput, interval):
+            for job in new_jobs:
+                logger.info(f"🆕 {job.get('title')} - {job['url']}")
+                for sink in sinks:
+                    sink.write(job)
+    finally:
+        close_output_sinks(sinks)
+
+async def main(jsonInput: dict, browser_pool=None, progress=None, resume=None) -> list[dict]:
+    """
+    Main entry point for the Upwork Job Scraper. Orchestrates browser setup, login, job search, and extraction.
+
+    :param jsonInput: Input dictionary containing credentials, search, and general parameters
+    :type jsonInput: dict
+    :param browser_pool: Shared pool of warm browsers used for the login (optional)
+    :type browser_pool: BrowserPool or None
+    :param progress: Dictionary updated in place with the current 'stage' and job counters (optional)
+    :type progress: dict or None
+    :param resume: ID of a journaled run to continue instead of starting a new one (optional)
+    :type resume: str or None
+    :return: List of job attribute dictionaries
+    :rtype: list[dict]
+    """
+    # log the current time
+    start_time = time.time()
+    if progress is None:
+        progress = {}
+    journal = None
+    if resume:
+        # a resumed run writes its outputs and report where the journaled input says
+        journal, jsonInput = open_run_journal(jsonInput, resume)
+    general_params = jsonInput.get('general', {})
+    # Jobs are written to the output files (and pushed to Apify) as soon as they are selected
+    sinks = open_output_sinks(general_params)
+    job_attributes = []
+    # every stage of the run records into this timer (see utils.timing)
+    timer = timing.StageTimer()
+    with timing.use_timer(timer):
+        try:
+            async for job in stream_jobs(jsonInput, browser_pool, progress, journal=journal):
+                job_attributes.append(job)
+                with timing.stage('output_write'):
+                    for sink in sinks:
+                        sink.write(job)
+                # Push to Apify dataset if running on Apify
+                if os.environ.get("ACTOR_INPUT_KEY"):
+                    await Actor.push_data(job)
+        finally:
+            with timing.stage('output_write'):
+                close_output_sinks(sinks)
+            # also written for a failed run, to see where it spent its time
+            report = dict(timer.report(), jobs=len(job_attributes), failures=dict(progress.get('failures') or {}))
+            progress['timing'] = report
+            write_run_report(general_params, report)
     end_time = time.time()
     elapsed = end_time - start_time
     logger.info("🏁 Job Fetch Complete!")
@@ -1735,6 +3075,7 @@ async def main(jsonInput: dict) -> list[dict]:
     minutes = int(elapsed // 60)
     seconds = int(elapsed % 60)
     logger.info(f"🕒 Total run time: {minutes}m {seconds}s ({elapsed:.2f} seconds)")
+    progress['stage'] = 'done'
     return job_attributes
 
 
@@ -1742,6 +3083,9 @@ if __name__ == "__main__":
     # set argparse
     parser = argparse.ArgumentParser(description="Upwork Job Scraper")
     parser.add_argument('--jsonInput', type=str, help='JSON string or path to JSON file with credentials and other info')
+    parser.add_argument('--watch', action='store_true', help='Keep polling the newest jobs and only output jobs not seen before')
+    parser.add_argument('--interval', type=float, default=300, help='Seconds between polls in watch mode (default: 300)')
+    parser.add_argument('--resume', type=str, metavar='RUN_ID', help='Continue an interrupted run from its journal in data/runs/ without re-fetching finished jobs')
     args = parser.parse_args()
 
     # set logger
@@ -1767,6 +3111,9 @@ if __name__ == "__main__":
         except json.JSONDecodeError as e:
             logger.error(f"⚠️ Failed to parse input JSON: {e}")
             sys.exit(1)
+    # resume with the journaled input
+    elif args.resume:
+        input_data = {}
     
     # load from apify
     elif os.environ.get("ACTOR_INPUT_KEY"):
@@ -2071,5 +3418,11 @@ if __name__ == "__main__":
         }
 
     logger.debug(f"input_data: {input_data}")
-    asyncio.run(main(input_data))
+    if args.watch:
+        try:
+            asyncio.run(run_watch(input_data, args.interval))
+        except KeyboardInterrupt:
+            logger.info("👋 Watch stopped")
+    else:
+        asyncio.run(main(input_data, resume=args.resume))
     sys.exit(0)
\ No newline at end of file
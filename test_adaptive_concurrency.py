@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the AIMD limit on concurrent job detail requests.
+"""
+
+import asyncio
+
+import httpx
+
+import main as scraper_main
+from utils.concurrency import CHALLENGE, HTTP_429, LATENCY, AdaptiveLimiter
+
+
+PAGE = '<html><script>window.__NUXT__={}</script></html>'
+
+
+async def _complete(limiter, n, throttled=None):
+    for _ in range(n):
+        async with limiter.slot() as slot:
+            slot.throttled = throttled
+
+
+def test_limit_grows_by_one_per_healthy_round():
+    async def run():
+        limiter = AdaptiveLimiter(maximum=10, minimum=2, initial=4)
+        await _complete(limiter, 4)
+        assert limiter.limit == 5
+        await _complete(limiter, 4)
+        assert limiter.limit == 5
+        await _complete(limiter, 1)
+        assert limiter.limit == 6
+        await _complete(limiter, 200)
+        assert limiter.limit == 10
+
+    asyncio.run(run())
+
+
+def test_throttling_halves_limit_once_per_burst():
+    async def run():
+        limiter = AdaptiveLimiter(maximum=40, minimum=2, initial=16)
+        # requests already in flight when the first 429 arrives only count once
+        gate = asyncio.Event()
+
+        async def request():
+            async with limiter.slot() as slot:
+                await gate.wait()
+                slot.throttled = HTTP_429
+
+        tasks = [asyncio.create_task(request()) for _ in range(8)]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert limiter.limit == 8
+        await _complete(limiter, 1, throttled=CHALLENGE)
+        assert limiter.limit == 4
+        await _complete(limiter, 5, throttled=CHALLENGE)
+        assert limiter.limit == 2
+        stats = limiter.stats()
+        assert stats['backoffs'] == {HTTP_429: 1, CHALLENGE: 6}
+        assert [change['reason'] for change in stats['recent_changes']] == [HTTP_429, CHALLENGE, CHALLENGE]
+
+    asyncio.run(run())
+
+
+def test_slow_round_cuts_limit():
+    async def run():
+        limiter = AdaptiveLimiter(maximum=10, minimum=1, initial=4, target_latency=0.0)
+        await _complete(limiter, 4)
+        assert limiter.limit == 2 and limiter.stats()['backoffs'] == {LATENCY: 1}
+
+    asyncio.run(run())
+
+
+def test_requests_wait_for_a_free_slot():
+    async def run():
+        limiter = AdaptiveLimiter(maximum=10, minimum=1, initial=3)
+        active = peak = 0
+
+        async def request():
+            nonlocal active, peak
+            async with limiter.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(request() for _ in range(12)))
+        return peak, limiter.peak
+
+    active_peak, limit_peak = asyncio.run(run())
+    # the limit grows from 3 as requests complete, but never lets all 12 start at once
+    assert active_peak <= limit_peak < 12
+
+
+def test_detail_fetch_reports_throttling_to_limiter():
+    def handler(request):
+        if request.url.path.endswith('/slow-down'):
+            return httpx.Response(429, text='Too many requests')
+        if request.url.path.endswith('/challenge'):
+            return httpx.Response(403, headers={'cf-mitigated': 'challenge'}, text='Just a moment...')
+        return httpx.Response(200, text=PAGE)
+
+    async def run():
+        limiter = AdaptiveLimiter(maximum=16, minimum=1, initial=16)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            assert await scraper_main.fetch_job_page(client, 'https://www.upwork.com/jobs/~1', limiter) == PAGE
+            assert await scraper_main.fetch_job_page(client, 'https://www.upwork.com/jobs/slow-down', limiter) is None
+            assert await scraper_main.fetch_job_page(client, 'https://www.upwork.com/jobs/challenge', limiter) is None
+        return limiter.stats()
+
+    stats = asyncio.run(run())
+    assert stats['limit'] == 4 and stats['backoffs'] == {HTTP_429: 1, CHALLENGE: 1}
+
+
+def test_limiter_options():
+    assert scraper_main.create_concurrency_limiter({'adaptive_concurrency': False}, 25) is None
+    limiter = scraper_main.create_concurrency_limiter({'min_in_flight': 3, 'target_latency': 'fast'}, 12)
+    assert (limiter.minimum, limiter.maximum, limiter.limit, limiter.target_latency) == (3, 12, 3, 5.0)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-query batch runs: URL building, cross-query deduplication and per-query trimming.
+"""
+
+import asyncio
+
+import httpx
+
+import main as scraper_main
+
+
+def search_page(job_numbers):
+    return ''.join(
+        f'<article><a data-test="job-tile-title-link UpLink" href="/jobs/Job_~0{n}/">Job {n}</a></article>'
+        for n in job_numbers
+    )
+
+
+def test_build_search_batch_accepts_single_and_list():
+    single = scraper_main.build_search_batch({"query": "python", "limit": 5}, False, buffer=0)
+    assert [s["label"] for s in single] == ["python"]
+    batch = scraper_main.build_search_batch(
+        [{"query": "python", "limit": 5}, {"query": "python"}, {"name": "ml", "query": "machine learning"}], False, buffer=0
+    )
+    assert [s["label"] for s in batch] == ["python", "python (2)", "ml"]
+    assert "q=machine+learning" in batch[2]["url"]
+
+
+def test_batch_urls_are_deduplicated_across_queries():
+    def handler(request):
+        if "q=first" in str(request.url):
+            return httpx.Response(200, text=search_page(range(1, 6)))
+        return httpx.Response(200, text=search_page(range(4, 9)))
+
+    async def run():
+        searches = scraper_main.build_search_batch([{"query": "first", "limit": 5}, {"query": "second", "limit": 5}], False, buffer=0)
+        membership = {}
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            urls = [url async for url in scraper_main.iter_batch_job_urls(client, searches, membership)]
+        return searches, membership, urls
+
+    searches, membership, urls = asyncio.run(run())
+    assert len(urls) == len(set(urls)) == 8
+    assert membership["https://www.upwork.com/jobs/~04"] == ["first", "second"]
+    assert membership["https://www.upwork.com/jobs/~08"] == ["second"]
+
+
+def test_select_batch_results_trims_each_query():
+    searches = [{"label": "a", "limit": 2}, {"label": "b", "limit": 1}]
+    membership = {"u1": ["a"], "u2": ["a", "b"], "u3": ["a"], "u4": ["b"]}
+    jobs = [{"url": url} for url in ["u1", "u2", "u3", "u4"]]
+    selected = scraper_main.select_batch_results(jobs, searches, membership, buffer=0)
+    assert [job["url"] for job in selected] == ["u1", "u2"]
+    assert selected[1]["matched_queries"] == ["a", "b"]
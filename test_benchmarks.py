@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline extraction benchmark: corpus integrity and the regression check.
+"""
+
+import bench_extraction
+
+
+def test_corpus_matches_manifest():
+    version, pages = bench_extraction.load_corpus()
+    assert version >= 1
+    assert len(pages['job']) >= 5 and len(pages['search']) >= 1
+
+
+def test_search_stage_report():
+    report = bench_extraction.run(repeat=1, only=['search_links'])
+    stage = report['stages']['search_links']
+    assert list(report['stages']) == ['search_links']
+    assert stage['pages'] == 1 and stage['pages_per_sec'] > 0 and stage['peak_kb'] > 0
+    assert stage['p50_ms'] <= stage['p95_ms']
+
+
+def test_regression_check():
+    baseline = {'stages': {'reviews': {'pages_per_sec': 100.0, 'peak_kb': 1000.0}}}
+    assert bench_extraction.compare({'stages': {'reviews': {'pages_per_sec': 85.0, 'peak_kb': 1200.0}}}, baseline) == []
+    regressions = bench_extraction.compare({'stages': {'reviews': {'pages_per_sec': 70.0, 'peak_kb': 1300.0}}}, baseline)
+    assert len(regressions) == 2 and all(message.startswith('reviews:') for message in regressions)
+    # stages missing from the report are not compared
+    assert bench_extraction.compare({'stages': {}}, baseline) == []
+
+
+def test_nuxt_stages_only_time_pages_with_nuxt_data():
+    version, pages = bench_extraction.load_corpus()
+    assert [name for name, _ in pages['nuxt']] == ['nuxt_job_page_sample.html']
+    report = bench_extraction.run(repeat=1, only=['nuxt_native', 'reviews'])
+    assert report['stages']['nuxt_native']['pages'] == 1
+    assert report['stages']['reviews']['pages'] == len(pages['job'])
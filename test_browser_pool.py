@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared browser pool, using stand-in browsers instead of Camoufox.
+"""
+
+import asyncio
+
+import pytest
+
+from utils.browser_pool import BrowserPool, _PooledBrowser
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def on(self, event, callback):
+        pass
+
+    async def new_context(self):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+class FakeManager:
+    def __init__(self):
+        self.exited = False
+
+    async def __aexit__(self, *args):
+        self.exited = True
+
+
+class FakePool(BrowserPool):
+    launches = 0
+
+    async def _launch(self):
+        self.launches += 1
+        pooled = _PooledBrowser(FakeManager(), FakeBrowser())
+        self._browsers.add(pooled)
+        return pooled
+
+
+def test_borrow_reuses_warm_browser_with_fresh_contexts():
+    async def run():
+        pool = FakePool(size=1)
+        await pool.start()
+        async with pool.borrow() as first:
+            pass
+        async with pool.borrow() as second:
+            pass
+        await pool.close()
+        return pool, first, second
+
+    pool, first, second = asyncio.run(run())
+    assert pool.launches == 1
+    assert first.browser is second.browser
+    assert first is not second and first.closed and second.closed
+
+
+def test_browser_recycled_after_max_uses_and_crash():
+    async def run():
+        pool = FakePool(size=1, max_uses=2)
+        browsers = []
+        for _ in range(3):
+            async with pool.borrow() as context:
+                browsers.append(context.browser)
+        browsers[-1].connected = False
+        with pytest.raises(RuntimeError):
+            async with pool.borrow() as context:
+                browsers.append(context.browser)
+                context.browser.connected = False
+                raise RuntimeError("browser crashed")
+        async with pool.borrow() as context:
+            browsers.append(context.browser)
+        return pool, browsers
+
+    pool, browsers = asyncio.run(run())
+    assert browsers[0] is browsers[1]
+    assert browsers[2] is not browsers[1]
+    assert browsers[3] is not browsers[2]
+    assert browsers[4] is not browsers[3]
+    assert pool.launches == 4
+    assert all(p.browser is browsers[4] for p in pool._browsers)
+
+
+def test_concurrent_borrows_wait_for_a_free_browser():
+    async def run():
+        pool = FakePool(size=2)
+        active = peak = 0
+
+        async def job():
+            nonlocal active, peak
+            async with pool.borrow():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(job() for _ in range(6)))
+        return pool, peak
+
+    pool, peak = asyncio.run(run())
+    assert peak == 2
+    assert pool.launches == 2
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven waits of the Cloudflare solver, on fake pages that emit frame events.
+"""
+
+import asyncio
+import time
+
+from playwright.async_api import Page
+
+from camoufox_captcha.cloudflare import solve_by_click
+from camoufox_captcha.cloudflare.utils import dom_helpers
+
+
+class FakePage(Page):
+    def __init__(self):
+        self.listeners = {}
+
+    def on(self, event, f):
+        self.listeners.setdefault(event, []).append(f)
+
+    def remove_listener(self, event, f):
+        self.listeners[event].remove(f)
+
+    def emit_later(self, event, delay, before=None):
+        def emit():
+            if before:
+                before()
+            for f in list(self.listeners.get(event, [])):
+                f(None)
+        asyncio.get_running_loop().call_later(delay, emit)
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+
+class FakeFrame:
+    def is_detached(self):
+        return False
+
+
+class FakeCheckbox:
+    def __init__(self, on_click=None):
+        self.on_click = on_click
+
+    async def is_visible(self):
+        return True
+
+    async def click(self):
+        if self.on_click:
+            self.on_click()
+
+
+def test_checkbox_wait_wakes_on_frame_event(monkeypatch):
+    page = FakePage()
+    iframe = FakeFrame()
+    rendered = []
+
+    async def elements(frame, selector):
+        return [FakeCheckbox()] if rendered else []
+    monkeypatch.setattr(dom_helpers, 'search_shadow_root_elements', elements)
+
+    async def wait():
+        with dom_helpers.FrameEvents(page) as events:
+            page.emit_later('frameattached', 0.05, before=lambda: rendered.append(True))
+            start = time.perf_counter()
+            # the poll interval alone would only notice the checkbox after 10s
+            found = await dom_helpers.get_ready_checkbox([iframe], delay=5, attempts=5, events=events, poll_interval=10)
+            return found, time.perf_counter() - start
+
+    found, elapsed = asyncio.run(wait())
+    assert found[0] is iframe
+    assert elapsed < 1
+    assert page.listeners == {event: [] for event in dom_helpers.FRAME_EVENTS}
+
+
+def test_checkbox_wait_honours_deadline(monkeypatch):
+    async def elements(frame, selector):
+        return []
+    monkeypatch.setattr(dom_helpers, 'search_shadow_root_elements', elements)
+
+    async def wait():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        found = await dom_helpers.get_ready_checkbox([FakeFrame()], delay=5, attempts=5, deadline=start + 0.1, poll_interval=0.02)
+        return found, loop.time() - start
+
+    found, elapsed = asyncio.run(wait())
+    assert found is None
+    assert elapsed < 1
+
+
+def test_solver_returns_once_challenge_clears(monkeypatch):
+    page = FakePage()
+    state = {'challenge': True, 'iframes': []}
+
+    async def detect_challenge(queryable, challenge_type):
+        return state['challenge']
+
+    async def detect_content(queryable, selector):
+        return False
+
+    async def iframes(queryable, src_filter):
+        return list(state['iframes'])
+
+    def clicked():
+        # Cloudflare lets the page through a moment after the click
+        page.emit_later('framenavigated', 0.05, before=lambda: state.update(challenge=False))
+
+    async def elements(frame, selector):
+        return [FakeCheckbox(on_click=clicked)]
+
+    monkeypatch.setattr(solve_by_click, 'detect_cloudflare_challenge', detect_challenge)
+    monkeypatch.setattr(solve_by_click, 'detect_expected_content', detect_content)
+    monkeypatch.setattr(solve_by_click, 'search_shadow_root_iframes', iframes)
+    monkeypatch.setattr(dom_helpers, 'search_shadow_root_elements', elements)
+
+    async def solve():
+        # the widget's iframe attaches after the solver started looking for it
+        page.emit_later('frameattached', 0.05, before=lambda: state['iframes'].append(FakeFrame()))
+        start = time.perf_counter()
+        solved = await solve_by_click.solve_cloudflare_by_click(
+            page, None, solve_attempts=5, solve_click_delay=6, wait_checkbox_attempts=5, wait_checkbox_delay=5,
+            attempt_delay=5, poll_interval=10
+        )
+        return solved, time.perf_counter() - start
+
+    solved, elapsed = asyncio.run(solve())
+    assert solved is True
+    assert elapsed < 1
+
+
+def test_solver_gives_up_at_deadline(monkeypatch):
+    async def detect_challenge(queryable, challenge_type):
+        return True
+
+    async def detect_content(queryable, selector):
+        return False
+
+    async def iframes(queryable, src_filter):
+        return []
+
+    monkeypatch.setattr(solve_by_click, 'detect_cloudflare_challenge', detect_challenge)
+    monkeypatch.setattr(solve_by_click, 'detect_expected_content', detect_content)
+    monkeypatch.setattr(solve_by_click, 'search_shadow_root_iframes', iframes)
+
+    async def solve():
+        start = time.perf_counter()
+        solved = await solve_by_click.solve_cloudflare_by_click(
+            FakePage(), None, solve_attempts=5, wait_checkbox_delay=5, attempt_delay=5, timeout=0.2, poll_interval=0.05
+        )
+        return solved, time.perf_counter() - start
+
+    solved, elapsed = asyncio.run(solve())
+    assert solved is False
+    assert elapsed < 1
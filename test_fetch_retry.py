@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for classified job page failures, jittered retries and the shared session renewal.
+"""
+
+import asyncio
+import collections
+
+import httpx
+import pytest
+
+import main as scraper_main
+from utils import retry
+from utils.retry import SessionRenewer, backoff_delay, parse_retry_after
+
+
+PAGE = '<html><script>window.__NUXT__={}</script></html>'
+JOB_URL = 'https://www.upwork.com/jobs/~1'
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(retry, 'backoff_delay', lambda attempt, **kwargs: 0)
+
+
+def fetch(responses, max_retries=2, session=None, url=JOB_URL):
+    """Fetch one page from a mock server answering with the given responses in order."""
+    calls = []
+    failures = collections.Counter()
+
+    def handler(request):
+        calls.append(request.url.path)
+        response = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True) as client:
+            return await scraper_main.fetch_job_page(client, url, session=session, failures=failures, max_retries=max_retries)
+
+    return asyncio.run(run()), len(calls), failures
+
+
+def test_transient_status_is_retried():
+    html, calls, failures = fetch([httpx.Response(503), httpx.Response(200, text=PAGE)])
+    assert html == PAGE and calls == 2 and not failures
+
+
+def test_removed_job_is_not_retried():
+    html, calls, failures = fetch([httpx.Response(404)])
+    assert html is None and calls == 1 and failures == {retry.HTTP_STATUS: 1}
+
+
+def test_network_errors_give_up_after_retries():
+    html, calls, failures = fetch([httpx.ConnectError('reset')], max_retries=2)
+    assert html is None and calls == 3 and failures == {retry.NETWORK: 1}
+
+
+def test_page_without_nuxt_data_is_retried():
+    html, calls, failures = fetch([httpx.Response(200, text='<html>partial</html>'), httpx.Response(200, text=PAGE)])
+    assert html == PAGE and calls == 2
+
+
+def test_challenge_without_renewal_fails_without_retry():
+    challenge = httpx.Response(403, headers={'cf-mitigated': 'challenge'}, text='Just a moment...')
+    html, calls, failures = fetch([challenge])
+    assert html is None and calls == 1 and failures == {retry.CHALLENGE: 1}
+
+
+def test_concurrent_challenges_renew_session_once():
+    state = {'renewed': False, 'renewals': 0}
+
+    def handler(request):
+        if not state['renewed']:
+            return httpx.Response(403, headers={'cf-mitigated': 'challenge'}, text='Just a moment...')
+        return httpx.Response(200, text=PAGE)
+
+    async def renew():
+        state['renewals'] += 1
+        await asyncio.sleep(0.01)
+        state['renewed'] = True
+
+    async def run():
+        session = SessionRenewer(renew, max_renewals=1)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await asyncio.gather(*(
+                scraper_main.fetch_job_page(client, f'https://www.upwork.com/jobs/~{i}', session=session) for i in range(6)
+            ))
+
+    assert asyncio.run(run()) == [PAGE] * 6
+    assert state['renewals'] == 1
+
+
+def test_failed_renewal_is_not_repeated():
+    attempts = []
+
+    async def renew():
+        attempts.append(1)
+        raise RuntimeError('browser crashed')
+
+    session = SessionRenewer(renew, max_renewals=3)
+
+    async def run():
+        return [await session.renew(session.generation) for _ in range(3)]
+
+    assert asyncio.run(run()) == [False, False, False]
+    assert len(attempts) == 1
+
+
+def test_backoff_and_retry_after():
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert all(0 <= backoff_delay(3, base=1.0) <= 4.0 for _ in range(50))
+    assert backoff_delay(1, base=0.1, retry_after=5) == 5
+    assert backoff_delay(1, cap=2, retry_after=60) == 2
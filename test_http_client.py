@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled HTTP client: one client per run, its connections reused and closed at the end.
+"""
+
+import asyncio
+
+import main as scraper_main
+from mock_upwork import MockUpwork
+
+
+def run_against_mock(monkeypatch, tmp_path, general=None):
+    clients = []
+    build_http_client = scraper_main.build_http_client
+
+    def tracking_build_http_client(*args, **kwargs):
+        client = build_http_client(*args, **kwargs)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(scraper_main, 'build_http_client', tracking_build_http_client)
+    with MockUpwork(pages=2) as mock:
+        json_input = {
+            'search': {'query': 'python', 'limit': 60},
+            'general': {'upwork_base_url': mock.base_url, 'use_browser': False, 'store_jobs': False, 'journal': False,
+                        'run_report': False, 'output': 'jsonl', 'output_dir': str(tmp_path), 'parse_workers': 0,
+                        'rate_limit': 0, 'max_in_flight': 4, **(general or {})},
+        }
+        try:
+            results = asyncio.run(scraper_main.main(json_input))
+        except SystemExit:
+            results = None
+        return results, clients, mock.stats(), len(mock.connections)
+
+
+def test_run_reuses_one_client_and_its_connections(monkeypatch, tmp_path):
+    results, clients, served, connections = run_against_mock(monkeypatch, tmp_path)
+    assert len(results) == 60
+    assert len(clients) == 1 and clients[0].is_closed
+    requests = sum(sum(statuses.values()) for statuses in served.values())
+    # every search and job page request went over the pool's keep-alive connections
+    assert requests > 80
+    assert connections <= 4
+
+
+def test_client_is_closed_when_the_run_fails(monkeypatch, tmp_path):
+    async def failing_job_details(*args, **kwargs):
+        raise RuntimeError('parser crashed')
+        yield
+
+    monkeypatch.setattr(scraper_main, 'iter_job_details', failing_job_details)
+    results, clients, served, connections = run_against_mock(monkeypatch, tmp_path)
+    assert results is None
+    assert len(clients) == 1 and clients[0].is_closed
+
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for main.py: the browser, js2py, bs4 and pandas stacks must only load in the
+stage that uses them, so the API servers, --help and parse workers start quickly.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time of `main` measured by -X importtime; about 0.2s with lazy imports, over 1s without
+IMPORT_BUDGET_SECONDS = 0.6
+HEAVY_MODULES = ('js2py', 'camoufox', 'camoufox_captcha', 'playwright', 'bs4', 'pandas', 'pyarrow')
+
+
+def _import_main(code):
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_import_main_does_not_load_heavy_modules():
+    result = _import_main(f"import sys, main; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    assert result.stdout.strip() == '[]'
+
+
+def test_import_main_within_budget():
+    result = _import_main("import main")
+    # last line of the importtime report is the top-level module: "import time: self | cumulative | main"
+    line = next(l for l in reversed(result.stderr.splitlines()) if l.rstrip().endswith('| main'))
+    cumulative_us = int(line.split('|')[1])
+    assert cumulative_us / 1e6 < IMPORT_BUDGET_SECONDS, f"import main took {cumulative_us / 1e6:.2f}s"
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-parse JobPage shared by the job attribute and review extractors.
+"""
+
+from pathlib import Path
+
+import main as scraper_main
+
+
+SAMPLE_PAGE = Path(__file__).parent / "testing" / "nuxt_job_page_sample.html"
+
+
+def test_job_page_matches_string_extraction():
+    html = SAMPLE_PAGE.read_text(encoding="utf-8")
+    page = scraper_main.JobPage(html)
+    assert scraper_main.extract_job_attributes_from_html(page, "1") == scraper_main.extract_job_attributes_from_html(html, "1")
+    assert scraper_main.extract_reviews_as_job_columns(page, "1") == scraper_main.extract_reviews_as_job_columns(html, "1")
+
+
+def test_job_page_parses_once(monkeypatch):
+    html = SAMPLE_PAGE.read_text(encoding="utf-8")
+    calls = {"soup": 0, "nuxt": 0}
+    real_soup = scraper_main.make_soup
+    real_nuxt = scraper_main.extract_nuxt_json
+
+    def counting_soup(*args, **kwargs):
+        calls["soup"] += 1
+        return real_soup(*args, **kwargs)
+
+    def counting_nuxt(*args, **kwargs):
+        calls["nuxt"] += 1
+        return real_nuxt(*args, **kwargs)
+
+    monkeypatch.setattr(scraper_main, "make_soup", counting_soup)
+    monkeypatch.setattr(scraper_main, "extract_nuxt_json", counting_nuxt)
+    job = scraper_main.parse_job_detail("https://www.upwork.com/jobs/~021957770112381853962", html, True)
+    assert job["title"].startswith("Conversational Avatar")
+    assert calls == {"soup": 1, "nuxt": 1}
+
+
+def test_page_without_nuxt_skips_html_parse():
+    page = scraper_main.JobPage("<html><body><div class='job-details-content'></div></body></html>")
+    assert scraper_main.extract_job_attributes_from_html(page, "1") == {"1": None}
+    assert "soup" not in page.__dict__
+
+
+def test_lxml_backend_matches_html_parser():
+    html = SAMPLE_PAGE.read_text(encoding="utf-8")
+    url = "https://www.upwork.com/jobs/~021957770112381853962"
+    assert scraper_main.parse_job_detail(url, html, True, "lxml") == scraper_main.parse_job_detail(url, html, True, "html.parser")
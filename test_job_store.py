@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite job store.
+"""
+
+import asyncio
+import collections
+import datetime
+
+import main as scraper_main
+from utils.job_store import CHANGED, NEW, UNCHANGED, JobStore, record_hash
+
+
+def test_record_hash_ignores_key_order_and_run_fields():
+    job = {'job_id': '1', 'title': 'Bot', 'skills': ['python']}
+    reordered = {'skills': ['python'], 'title': 'Bot', 'job_id': '1', 'matched_queries': ['a']}
+    assert record_hash(job) == record_hash(reordered)
+    assert record_hash(job) != record_hash(dict(job, title='Bot v2'))
+
+
+def test_upsert_tracks_first_last_seen_and_changes(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite')
+    job = {'job_id': '1', 'url': 'https://www.upwork.com/jobs/~1', 'title': 'Bot'}
+    with JobStore(path) as store:
+        assert store.upsert(job, seen_at='2026-01-01T00:00:00') == NEW
+        assert store.upsert(dict(job), seen_at='2026-01-02T00:00:00') == UNCHANGED
+    with JobStore(path) as store:
+        assert store.upsert(dict(job, title='Bot v2'), seen_at='2026-01-03T00:00:00') == CHANGED
+        stored = store.get('1')
+    assert stored['record']['title'] == 'Bot v2'
+    assert (stored['first_seen'], stored['last_seen'], stored['last_changed']) == ('2026-01-01T00:00:00', '2026-01-03T00:00:00', '2026-01-03T00:00:00')
+    assert (stored['times_seen'], stored['versions']) == (3, 2)
+
+
+def test_upsert_many_counts():
+    with JobStore(':memory:') as store:
+        store.upsert_many([{'job_id': '1', 'title': 'a'}])
+        counts = store.upsert_many([{'job_id': '1', 'title': 'a'}, {'job_id': '2'}, {'title': 'no id'}])
+    assert counts == {NEW: 1, CHANGED: 0, UNCHANGED: 1}
+
+
+def test_fresh_record_respects_max_age():
+    recent = (datetime.datetime.now() - datetime.timedelta(hours=1)).isoformat(timespec='seconds')
+    with JobStore(':memory:') as store:
+        store.upsert({'job_id': '1', 'title': 'a'}, seen_at=recent)
+        assert store.fresh_record('1', max_age_hours=2) == {'job_id': '1', 'title': 'a'}
+        assert store.fresh_record('1', max_age_hours=0.5) is None
+        assert store.fresh_record('2', max_age_hours=2) is None
+
+
+def test_freshness_policy_options():
+    assert scraper_main.get_refetch_after_hours({}) is None
+    assert scraper_main.get_refetch_after_hours({'refetch_after_hours': '12'}) == 12
+    assert scraper_main.get_refetch_after_hours({'refetch_after_hours': 12, 'track_activity': True}) is None
+    assert scraper_main.get_refetch_after_hours({'refetch_after_hours': 12, 'store_jobs': False}) is None
+
+
+def test_skip_fresh_jobs_reuses_stored_records():
+
+    async def urls():
+        for job_id in ('1', '2'):
+            yield f'https://www.upwork.com/jobs/~{job_id}'
+
+    async def run(store):
+        stored, progress = collections.deque(), {}
+        to_fetch = [url async for url in scraper_main.skip_fresh_jobs(urls(), store, 24, stored, progress)]
+        return to_fetch, list(stored), progress
+
+    with JobStore(':memory:') as store:
+        store.upsert({'job_id': '1', 'title': 'a'})
+        to_fetch, stored, progress = asyncio.run(run(store))
+    assert to_fetch == ['https://www.upwork.com/jobs/~2']
+    assert stored == [{'job_id': '1', 'title': 'a'}]
+    assert progress == {'jobs_skipped': 1}
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus metrics and the /metrics endpoint.
+"""
+
+import pytest
+
+from bench_end_to_end import run
+from utils import metrics, retry
+
+
+def test_text_format():
+    counter = metrics.Counter('test_requests_total', 'Requests', ('status',))
+    counter.inc(status=200)
+    counter.inc(2, status='5"x')
+    histogram = metrics.Histogram('test_latency_seconds', 'Latency', buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+    text = metrics.render()
+    assert '# TYPE test_requests_total counter' in text
+    assert 'test_requests_total{status="200"} 1' in text
+    assert 'test_requests_total{status="5\\"x"} 2' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'test_latency_seconds_sum 5.55' in text and 'test_latency_seconds_count 3' in text
+    with pytest.raises(ValueError):
+        counter.inc(code=200)
+
+
+def test_series_without_labels_start_at_zero():
+    metrics.Counter('test_started_total', 'Started')
+    metrics.Gauge('test_in_flight', 'In flight')
+    metrics.Histogram('test_wait_seconds', 'Wait', buckets=(1,))
+    text = metrics.render()
+    assert '\ntest_started_total 0\n' in text and '\ntest_in_flight 0\n' in text
+    assert 'test_wait_seconds_bucket{le="+Inf"} 0' in text and 'test_wait_seconds_count 0' in text
+    # labelled series only appear once they are updated
+    metrics.Counter('test_labelled_total', 'Labelled', ('status',))
+    assert 'test_labelled_total{' not in metrics.render()
+
+
+def test_run_updates_metrics(monkeypatch):
+    monkeypatch.setattr(retry, 'backoff_delay', lambda *args, **kwargs: 0)
+    started = metrics.RUNS_STARTED.value()
+    succeeded = metrics.RUNS_FINISHED.value(status='succeeded')
+    jobs = metrics.JOBS_FETCHED.value()
+    fetches = metrics.STAGE_SECONDS.count(stage='detail_fetch')
+    throttled = metrics.HTTP_RESPONSES.value(status=429)
+
+    report = run(30, {'rate_limit': 0, 'parse_workers': 0, 'max_retries': 5}, pages=1, rate_429=0.2, seed=3)
+
+    assert metrics.RUNS_STARTED.value() == started + 1
+    assert metrics.RUNS_FINISHED.value(status='succeeded') == succeeded + 1
+    # the buffer is fetched too
+    assert metrics.JOBS_FETCHED.value() == jobs + 50
+    served = report['served']['job']
+    assert metrics.STAGE_SECONDS.count(stage='detail_fetch') == fetches + sum(served.values())
+    assert metrics.HTTP_RESPONSES.value(status=429) == throttled + served[429]
+    assert metrics.FETCH_FAILURES.value(kind='http_status') >= served[429]
+    assert metrics.IN_FLIGHT.value() == 0
+
+
+def test_flask_metrics_endpoint():
+    api_flask = pytest.importorskip("api_flask")
+    response = api_flask.app.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert "# TYPE upwork_runs_started_total counter" in response.get_data(as_text=True)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+End-to-end tests of a run against the local mock Upwork in benchmarks/mock_upwork.py.
+"""
+
+import pytest
+
+import main as scraper_main
+from bench_end_to_end import run
+from utils import retry
+
+
+# no pacing and parsing in-process, the mock answers as fast as it can
+GENERAL = {'rate_limit': 0, 'parse_workers': 0, 'max_retries': 5}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(retry, 'backoff_delay', lambda *args, **kwargs: 0)
+
+
+def test_base_url_switch_points_search_and_job_urls_at_host():
+    searches = scraper_main.build_search_batch({'query': 'python'}, False, buffer=0, base_url='http://127.0.0.1:9')
+    assert searches[0]['url'].startswith('http://127.0.0.1:9/nx/search/jobs/?')
+    assert scraper_main.job_detail_url(searches[0]['url'], '~01') == 'http://127.0.0.1:9/jobs/~01'
+    assert scraper_main.get_upwork_base_url({}) == 'https://www.upwork.com'
+    assert scraper_main.get_upwork_base_url({'upwork_base_url': 'http://localhost:8765/'}) == 'http://localhost:8765'
+
+
+def test_clean_run_writes_every_job():
+    report = run(60, GENERAL, pages=2)
+    assert report['jobs'] == 60 and report['failures'] == {}
+    # limit plus the buffer of 20
+    assert report['served']['job'] == {200: 80}
+    assert report['jobs_per_sec'] > 0
+
+
+def test_throttling_and_server_errors_are_retried():
+    report = run(60, GENERAL, pages=2, rate_429=0.2, rate_5xx=0.1, seed=7)
+    served = report['served']['job']
+    assert served[429] and sum(n for status, n in served.items() if status >= 500)
+    assert report['jobs'] == 60 and report['failures'] == {}
+    assert report['concurrency']['backoffs'].get('http_429')
+
+
+def test_challenges_give_up_once_renewals_are_spent():
+    report = run(30, dict(GENERAL, max_reauth=1), pages=1, rate_challenge=1.0)
+    assert report['jobs'] == 0
+    assert report['failures'] == {'challenge': 50}
+    # every page was requested, and the ones rejected before the renewal once more after it
+    assert list(report['served']['job']) == [403] and report['served']['job'][403] > 50
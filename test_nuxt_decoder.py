@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the native window.__NUXT__ decoder.
+
+Every saved page in testing/ is decoded both natively and with js2py,
+and the results must be identical.
+"""
+
+from pathlib import Path
+
+import pytest
+
+import main as scraper_main
+from utils.nuxt import NuxtDecodeError, decode_nuxt_payload, find_nuxt_script
+
+
+TESTING_DIR = Path(__file__).parent / "testing"
+SAVED_PAGES = sorted(TESTING_DIR.glob("*.html"))
+
+
+@pytest.mark.parametrize("page", SAVED_PAGES, ids=lambda p: p.name)
+def test_saved_page_parity(page):
+    html = page.read_text(encoding="utf-8")
+    assert scraper_main.extract_nuxt_json(html) == scraper_main.extract_nuxt_json_using_js2py(html)
+
+
+def test_corpus_contains_payload():
+    pages_with_payload = [p for p in SAVED_PAGES if find_nuxt_script(p.read_text(encoding="utf-8"))]
+    assert pages_with_payload, "testing/ should contain at least one page with a window.__NUXT__ payload"
+
+
+@pytest.mark.parametrize("js_code", [
+    '{state:{a:1,b:"x"}}',
+    '({layout:"default",data:[{}]})',
+    '(function(a,b){return {x:a,y:[a,b]}}(1,"two"))',
+    '(function(a,b){return {x:a,y:b}})(null,true)',
+    '(function(a,b,c){b.c=c;b["d"]=[c];return {a:a,b:b}}(void 0,{},false));',
+    "{s:'it\\'s \\u00e9\\x41',n:-2.5e1,h:0xff,f:1.0,t:!0,u:!1,'k-1':{3:4},trailing:[1,2,],}",
+])
+def test_payload_forms_match_js2py(js_code):
+    assert decode_nuxt_payload(js_code) == scraper_main.evaluate_nuxt_with_js2py(js_code)
+
+
+def test_unsupported_syntax_raises():
+    with pytest.raises(NuxtDecodeError):
+        decode_nuxt_payload('{when:new Date(0)}')
+
+
+def test_extract_falls_back_to_js2py():
+    html = '<script>window.__NUXT__={state:{when:new Date(0).getTime()}};</script>'
+    assert scraper_main.extract_nuxt_json(html) == {"state": {"when": 0}}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental output sinks (CSV, JSONL, Parquet).
+"""
+
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+import main as scraper_main
+from utils.output_sinks import JOB_COLUMNS, CsvSink, JsonlSink, open_sinks, resolve_output_formats
+
+
+JOBS = [
+    {'job_id': '1', 'title': 'Scraper', 'skills': ['Python', 'SQL'], 'qualifications': {'english': 'fluent'},
+     'hourly_min': '15.0', 'applicants': '5', 'payment_verified': True, 'matched_queries': ['python']},
+    {'job_id': '2', 'title': 'Bot', 'skills': [], 'hourly_min': None, 'applicants': 'Less than 5'},
+]
+
+
+def test_jsonl_sink_appends_one_record_per_line(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    with JsonlSink(str(path)) as sink:
+        sink.write(JOBS[0])
+        # flushed per record, readable before the sink is closed
+        assert json.loads(path.read_text(encoding='utf-8'))['skills'] == ['Python', 'SQL']
+        sink.write(JOBS[1])
+    assert [json.loads(line)['job_id'] for line in path.read_text(encoding='utf-8').splitlines()] == ['1', '2']
+
+
+def test_csv_sink_has_fixed_header_and_friendly_names(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    with CsvSink(str(path), rename=scraper_main.normalize_csv_column_names) as sink:
+        for job in JOBS:
+            sink.write(job)
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]['ID'] == '1' and rows[0]['Title'] == 'Scraper'
+    assert json.loads(rows[0]['Skills']) == ['Python', 'SQL']
+    # the header comes from the schema, not from the first job
+    assert rows[1]['ID'] == '2' and rows[1]['Title'] == 'Bot'
+    assert list(rows[0]) == sorted(scraper_main.normalize_csv_column_names(dict.fromkeys(JOB_COLUMNS)))
+
+
+def test_parquet_sink_uses_typed_schema(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    from utils.output_sinks import ParquetSink
+
+    path = tmp_path / 'jobs.parquet'
+    with ParquetSink(str(path), row_group_size=1) as sink:
+        for job in JOBS:
+            sink.write(job)
+    table = pq.read_table(str(path))
+    assert table.column_names == list(JOB_COLUMNS)
+    assert pq.ParquetFile(str(path)).num_row_groups == 2
+    rows = table.to_pylist()
+    assert rows[0]['hourly_min'] == 15.0 and rows[0]['applicants'] == 5 and rows[0]['payment_verified'] is True
+    assert rows[0]['skills'] == ['Python', 'SQL'] and json.loads(rows[0]['qualifications']) == {'english': 'fluent'}
+    # text that does not fit the column type becomes null instead of failing the run
+    assert rows[1]['applicants'] is None and rows[1]['hourly_min'] is None
+
+
+def test_resolve_output_formats(monkeypatch):
+    assert resolve_output_formats(None) == ['csv']
+    assert resolve_output_formats(['JSONL', 'csv', 'jsonl']) == ['jsonl', 'csv']
+    assert resolve_output_formats('xlsx') == ['csv']
+    monkeypatch.setitem(sys.modules, 'pyarrow.parquet', None)
+    assert resolve_output_formats('parquet') == ['jsonl']
+
+
+def test_open_sinks_paths(tmp_path):
+    sinks = open_sinks(['csv', 'jsonl'], str(tmp_path), prefix='new_jobs')
+    for sink in sinks:
+        sink.close()
+    assert [os.path.relpath(sink.path, tmp_path).split(os.sep)[0] for sink in sinks] == ['csv', 'jsonl']
+    assert all(os.path.basename(sink.path).startswith('new_jobs_') for sink in sinks)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the fetch/parse pipeline: completeness, backpressure, parse failures, shutdown,
+and runs that parse on the process pool.
+"""
+
+import asyncio
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+
+import main as scraper_main
+from bench_end_to_end import run
+from utils.pipeline import fetch_parse_pipeline
+
+
+def parse_upper(item, payload):
+    # top-level so the process pool can pickle it
+    if payload == 'bad':
+        raise ValueError('broken page')
+    return item, payload.upper()
+
+
+def other_tasks():
+    return [task for task in asyncio.all_tasks() if task is not asyncio.current_task() and not task.done()]
+
+
+def test_every_item_is_parsed_once():
+    async def fetch(item):
+        await asyncio.sleep(random.random() / 100)
+        return f"page {item}"
+
+    async def collect(**options):
+        return [result async for result in fetch_parse_pipeline(range(50), fetch, parse_upper, **options)]
+
+    results = asyncio.run(collect(fetch_concurrency=8, parse_concurrency=3))
+    assert sorted(results) == [(n, f"PAGE {n}") for n in range(50)]
+    # one fetcher and one parser keep the input order
+    assert asyncio.run(collect(fetch_concurrency=1, parse_concurrency=1)) == [(n, f"PAGE {n}") for n in range(50)]
+
+
+def test_bounded_queues_hold_back_the_fetchers():
+    fetched = 0
+
+    async def fetch(item):
+        nonlocal fetched
+        fetched += 1
+        return 'page'
+
+    async def run_pipeline():
+        pipeline = fetch_parse_pipeline(itertools.count(), fetch, parse_upper, fetch_concurrency=2, parse_concurrency=1, queue_size=4)
+        await pipeline.__anext__()
+        # the consumer stalls: fetching must stop once the queues are full
+        await asyncio.sleep(0.2)
+        outstanding = fetched - 1
+        await pipeline.aclose()
+        await asyncio.sleep(0)
+        return outstanding, other_tasks()
+
+    outstanding, pending = asyncio.run(run_pipeline())
+    # payload and result queues, plus one page held by each fetcher and parser
+    assert 0 < outstanding <= 2 * 4 + 2 + 1
+    assert pending == []
+
+
+def test_parse_error_in_a_worker_process_fails_only_that_item():
+    errors = []
+
+    async def fetch(item):
+        return item
+
+    async def collect(executor):
+        pipeline = fetch_parse_pipeline(['a', 'bad', 'c'], fetch, parse_upper, executor=executor,
+                                        on_parse_error=lambda item, e: errors.append((item, type(e))))
+        return [result async for result in pipeline]
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(asyncio.wait_for(collect(executor), timeout=30))
+    assert sorted(results) == [('a', 'A'), ('c', 'C')]
+    assert errors == [('bad', ValueError)]
+
+
+def test_aclose_stops_the_workers_of_a_process_pool_run():
+    async def fetch(item):
+        await asyncio.sleep(0.01)
+        return 'page'
+
+    async def run_pipeline(executor):
+        async with asyncio.timeout(30):
+            pipeline = fetch_parse_pipeline(range(1000), fetch, parse_upper, fetch_concurrency=4, executor=executor)
+            for _ in range(3):
+                await pipeline.__anext__()
+            await pipeline.aclose()
+            await asyncio.sleep(0)
+            return other_tasks()
+
+    executor = ProcessPoolExecutor(max_workers=2)
+    try:
+        assert asyncio.run(run_pipeline(executor)) == []
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def test_parse_error_is_counted_as_a_failed_job(monkeypatch):
+    def flaky_parse(url, html, *args, **kwargs):
+        if url.endswith('~02'):
+            raise ValueError('broken page')
+        return {'job_id': scraper_main.job_id_from_url(url), 'url': url}, {}
+
+    monkeypatch.setattr(scraper_main, 'parse_job_detail_timed', flaky_parse)
+    urls = [f"https://www.upwork.com/jobs/~0{n}" for n in range(1, 5)]
+    page = (Path(__file__).parent / 'testing' / 'nuxt_job_page_sample.html').read_text(encoding='utf-8')
+    progress = {}
+
+    async def collect():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=page))) as client:
+            return [job async for job in scraper_main.iter_job_details(client, urls, False, max_in_flight=2, progress=progress)]
+
+    jobs = asyncio.run(collect())
+    assert sorted(job['url'] for job in jobs) == [urls[0]] + urls[2:]
+    assert progress['failures'] == {'parse_error': 1} and progress['jobs_scraped'] == 3
+
+
+def test_run_parses_on_the_process_pool():
+    report = run(30, {'parse_workers': 2, 'rate_limit': 0}, pages=1)
+    assert report['jobs'] == 30 and not report['failures']
+    # the workers' stage timings are merged into the run's report
+    assert report['timing']['stages']['detail_soup']['count'] >= 30
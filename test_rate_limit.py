@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-host token buckets that pace outbound requests.
+"""
+
+import asyncio
+import time
+
+import httpx
+
+import main as scraper_main
+from utils.rate_limit import TokenBucket, host_bucket, rate_limit_hook, rate_limit_stats
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    delays = [bucket.reserve() for _ in range(3)]
+    # each further request is due one refill interval after the previous one
+    assert [round(d, 1) for d in delays] == [0.1, 0.2, 0.3]
+    assert bucket.stats()['requests'] == 6
+
+
+def test_registry_shares_bucket_per_host():
+    first = host_bucket('shared.example', rate=5, burst=2)
+    assert host_bucket('shared.example', rate=5, burst=2) is first
+    assert host_bucket('other.example', rate=5, burst=2) is not first
+    assert host_bucket('shared.example', rate=5.0, burst=2) is first
+
+
+def test_other_settings_do_not_repace_a_shared_bucket():
+    first = host_bucket('settings.example', rate=5, burst=2)
+    second = host_bucket('settings.example', rate=50, burst=4)
+    assert second is not first
+    assert (first.rate, first.burst) == (5, 2) and (second.rate, second.burst) == (50, 4)
+    assert host_bucket('settings.example', rate=5, burst=2) is first
+    assert rate_limit_stats()['settings.example'] == [first.stats(), second.stats()]
+
+
+def test_concurrent_clients_share_host_budget():
+    # two clients (e.g. two API runs) hitting the same host draw from one bucket
+    hook = rate_limit_hook(rate=50, burst=5)
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+        clients = [httpx.AsyncClient(transport=transport, event_hooks={'request': [hook]}) for _ in range(2)]
+        start = time.monotonic()
+        await asyncio.gather(*(client.get(f'https://paced.example/{i}') for client in clients for i in range(10)))
+        elapsed = time.monotonic() - start
+        for client in clients:
+            await client.aclose()
+        return elapsed
+
+    # 20 requests with a burst of 5 at 50/s need at least 15 refills, i.e. ~0.3s
+    assert asyncio.run(run()) >= 0.25
+    assert host_bucket('paced.example', rate=50, burst=5).stats()['requests'] == 20
+
+
+def test_rate_limit_options():
+    assert scraper_main.get_rate_limit({}) == (10.0, 20)
+    assert scraper_main.get_rate_limit({'rate_limit': 0}) == (None, 20)
+    assert scraper_main.get_rate_limit({'rate_limit': '2.5', 'rate_burst': 4}) == (2.5, 4)
+    client = scraper_main.build_http_client([], 'UA', rate_limit=None)
+    assert client.event_hooks['request'] == []
+    asyncio.run(client.aclose())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the run journal and resuming an interrupted run without re-fetching finished jobs.
+"""
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+import main as scraper_main
+from utils.run_journal import RunJournal
+
+
+URLS = [f"https://www.upwork.com/jobs/~{n:02d}" for n in range(1, 7)]
+
+
+def test_journal_replays_state_and_tolerates_cut_off_line(tmp_path):
+    journal = RunJournal.create({'credentials': {'username': 'a@b.co', 'password': 'secret'}, 'search': {'query': 'x'}}, str(tmp_path))
+    journal.record_url(URLS[0], ['x'])
+    journal.record_url(URLS[1], ['x'])
+    journal.record_job({'job_id': '01', 'url': URLS[0]})
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "job", "rec')
+
+    resumed = RunJournal.resume(journal.run_id, str(tmp_path))
+    assert resumed.pending_urls() == [URLS[1]]
+    assert list(resumed.jobs) == [URLS[0]] and not resumed.search_done
+    assert resumed.load_input()['credentials'] == {'username': 'a@b.co'}
+    resumed.finish()
+    assert not os.path.exists(resumed.directory)
+
+
+def test_resume_unknown_run(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RunJournal.resume('nope', str(tmp_path))
+
+
+def _run(json_input, monkeypatch, fail_after=None, resume=None):
+    """Run iter_scraped_jobs against fake search/detail stages; returns (jobs, fetched URLs, searched, progress, exited)."""
+    fetched, searched = [], []
+
+    async def fake_open_session(*args, **kwargs):
+        return httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+    async def fake_batch_job_urls(client, searches, membership, *args, **kwargs):
+        searched.append(True)
+        for url in URLS:
+            # like the real stage: a label is added once, and only a job's first label yields it
+            labels = membership.setdefault(url, [])
+            if 'python' not in labels:
+                labels.append('python')
+            if len(labels) == 1:
+                yield url
+
+    async def fake_job_details(client, job_urls, *args, **kwargs):
+        async for url in job_urls:
+            if fail_after is not None and len(fetched) == fail_after:
+                raise RuntimeError('browser crashed')
+            fetched.append(url)
+            yield {'job_id': scraper_main.job_id_from_url(url), 'url': url}
+
+    monkeypatch.setattr(scraper_main, 'open_session', fake_open_session)
+    monkeypatch.setattr(scraper_main, 'iter_batch_job_urls', fake_batch_job_urls)
+    monkeypatch.setattr(scraper_main, 'iter_job_details', fake_job_details)
+    progress, jobs = {}, []
+
+    async def collect():
+        async for job in scraper_main.iter_scraped_jobs(json_input, progress=progress, batch={}, resume=resume):
+            jobs.append(job)
+
+    try:
+        asyncio.run(collect())
+    except SystemExit:
+        return jobs, fetched, searched, progress, True
+    return jobs, fetched, searched, progress, False
+
+
+def test_interrupted_run_resumes_without_refetching(monkeypatch, tmp_path):
+    general = {'journal_dir': str(tmp_path), 'store_jobs': False, 'parse_workers': 0}
+    json_input = {'search': {'query': 'python', 'limit': 10}, 'general': general}
+
+    jobs, fetched, searched, progress, exited = _run(json_input, monkeypatch, fail_after=4)
+    assert exited and len(jobs) == 4
+    run_id = progress['journal_id']
+    assert os.path.exists(tmp_path / run_id / 'journal.jsonl')
+
+    jobs, fetched, searched, progress, exited = _run({'general': {'journal_dir': str(tmp_path)}}, monkeypatch, resume=run_id)
+    assert not exited
+    # finished jobs are replayed and only the rest is fetched; the search had not finished, so it runs
+    # again, but jobs it already found are not yielded twice
+    assert sorted(job['url'] for job in jobs) == URLS
+    assert fetched == URLS[4:] and searched
+    # a finished run's journal is removed
+    assert not os.path.exists(tmp_path / run_id)
+
+
+def test_journal_can_be_disabled(monkeypatch, tmp_path):
+    general = {'journal': False, 'journal_dir': str(tmp_path), 'store_jobs': False, 'parse_workers': 0}
+    jobs, fetched, searched, progress, exited = _run({'search': {'query': 'python'}, 'general': general}, monkeypatch)
+    assert len(jobs) == len(URLS) and 'journal_id' not in progress
+    assert os.listdir(tmp_path) == []
+
+
+def test_resume_after_search_finished_skips_search(monkeypatch, tmp_path):
+    journal = RunJournal.create({'search': {'query': 'python'}, 'general': {'store_jobs': False, 'parse_workers': 0}}, str(tmp_path))
+    for url in URLS:
+        journal.record_url(url, ['python'])
+    journal.record_search_done()
+    for url in URLS[:2]:
+        journal.record_job({'job_id': scraper_main.job_id_from_url(url), 'url': url, 'matched_queries': ['python']})
+    journal.close()
+
+    jobs, fetched, searched, progress, exited = _run({'general': {'journal_dir': str(tmp_path)}}, monkeypatch, resume=journal.run_id)
+    assert [job['url'] for job in jobs] == URLS
+    assert fetched == URLS[2:] and not searched
+
+
+def test_journaled_urls_are_not_passed_on_again_by_the_real_search(tmp_path):
+    def handler(request):
+        tiles = ''.join(f'<article><a data-test="job-tile-title-link UpLink" href="/jobs/Job_~0{n}/">Job {n}</a></article>' for n in range(1, 5))
+        return httpx.Response(200, text=tiles)
+
+    journal = RunJournal.create({'search': {'query': 'python'}}, str(tmp_path))
+    journal.record_url(URLS[0], ['python'])
+    journal.record_url(URLS[1], ['python'])
+    journal.record_job({'job_id': '01', 'url': URLS[0]})
+    # a resumed run starts with the journaled matches
+    membership = {url: list(labels) for url, labels in journal.urls.items()}
+
+    async def run():
+        searches = scraper_main.build_search_batch({'query': 'python', 'limit': 4}, False, buffer=0)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            job_urls = scraper_main.iter_batch_job_urls(client, searches, membership)
+            return [url async for url in scraper_main.journal_job_urls(job_urls, journal, membership)]
+
+    assert asyncio.run(run()) == [URLS[1], URLS[2], URLS[3]]
+    assert journal.search_done
+    journal.close()
+
+
+def test_resumed_run_writes_where_the_journaled_input_says(monkeypatch, tmp_path):
+    output_dir = tmp_path / 'out'
+    general = {'output': 'jsonl', 'output_dir': str(output_dir), 'store_jobs': False, 'parse_workers': 0}
+    journal = RunJournal.create({'search': {'query': 'python', 'limit': 10}, 'general': general}, str(tmp_path / 'runs'))
+    for url in URLS:
+        journal.record_url(url, ['python'])
+        journal.record_job({'job_id': scraper_main.job_id_from_url(url), 'url': url, 'matched_queries': ['python']})
+    journal.record_search_done()
+    journal.close()
+    # the outputs of a run with the default settings would land here
+    os.makedirs(tmp_path / 'cwd')
+    monkeypatch.chdir(tmp_path / 'cwd')
+
+    # like `main.py --resume`, the new input only says where the journals are
+    jobs = asyncio.run(scraper_main.main({'general': {'journal_dir': str(tmp_path / 'runs')}}, resume=journal.run_id))
+    assert len(jobs) == len(URLS)
+    (results,) = output_dir.glob('jsonl/*.jsonl')
+    assert len(results.read_text(encoding='utf-8').splitlines()) == len(URLS)
+    assert list((output_dir / 'reports').iterdir())
+    assert os.listdir(tmp_path / 'cwd') == []
+
+
+def test_logged_in_run_is_not_resumed_without_credentials(tmp_path):
+    journaled = {'credentials': {'username': 'a@b.co', 'password': 'secret'}, 'search': {'query': 'x'}}
+    run_id = RunJournal.create(journaled, str(tmp_path)).run_id
+    general = {'general': {'journal_dir': str(tmp_path)}}
+    with pytest.raises(SystemExit):
+        scraper_main.open_run_journal(general, run_id)
+
+    credentials = {'username': 'a@b.co', 'password': 'secret'}
+    journal, resumed_input = scraper_main.open_run_journal(dict(general, credentials=credentials), run_id)
+    assert resumed_input['credentials'] == credentials and resumed_input['search'] == {'query': 'x'}
+    journal.close()
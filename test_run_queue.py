@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the background run queue behind the /runs API.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+from utils.run_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, RunQueue
+
+
+def test_runs_progress_and_results():
+    async def run():
+        release = asyncio.Event()
+        active = peak = 0
+
+        async def fake_main(json_input, progress):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            progress.update(stage='scraping', jobs_found=json_input['n'])
+            await release.wait()
+            active -= 1
+            return [{'job_id': i} for i in range(json_input['n'])]
+
+        queue = RunQueue(fake_main, concurrency=2)
+        runs = [await queue.submit({'n': n}) for n in (1, 2, 3)]
+        await asyncio.sleep(0.01)
+        during = [queue.status(r['run_id']) for r in runs]
+        release.set()
+        await asyncio.sleep(0.01)
+        after = [queue.status(r['run_id']) for r in runs]
+        results = queue.results(runs[2]['run_id'])
+        await queue.stop()
+        return runs, during, after, results, peak
+
+    runs, during, after, results, peak = asyncio.run(run())
+    assert all(r['status'] == QUEUED for r in runs)
+    assert [s['status'] for s in during] == [RUNNING, RUNNING, QUEUED]
+    assert during[0]['progress'] == {'stage': 'scraping', 'jobs_found': 1}
+    assert during[2]['position'] == 1
+    assert peak == 2
+    assert [s['status'] for s in after] == [SUCCEEDED] * 3
+    assert [s['count'] for s in after] == [1, 2, 3]
+    assert len(results) == 3
+
+
+def test_failed_run_does_not_stop_worker():
+    async def run():
+        async def fake_main(json_input, progress):
+            if json_input.get('exit'):
+                sys.exit(1)
+            if json_input.get('raise'):
+                raise RuntimeError('login failed')
+            return []
+
+        queue = RunQueue(fake_main, concurrency=1)
+        runs = [await queue.submit(i) for i in ({'exit': True}, {'raise': True}, {})]
+        await asyncio.sleep(0.01)
+        statuses = [queue.status(r['run_id']) for r in runs]
+        await queue.stop()
+        return queue, runs, statuses
+
+    queue, runs, statuses = asyncio.run(run())
+    assert [s['status'] for s in statuses] == [FAILED, FAILED, SUCCEEDED]
+    assert statuses[1]['error'] == 'login failed'
+    assert queue.results(runs[0]['run_id']) is None
+
+
+def test_old_finished_runs_are_evicted():
+    async def run():
+        async def fake_main(json_input, progress):
+            return []
+
+        queue = RunQueue(fake_main, keep_finished=2)
+        runs = [await queue.submit({}) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        await queue.stop()
+        return queue, runs
+
+    queue, runs = asyncio.run(run())
+    assert [r['run_id'] for r in queue.list_runs()] == [r['run_id'] for r in runs[2:]]
+    assert queue.status(runs[0]['run_id']) is None
+
+
+def test_flask_reads_runs_on_the_loop(monkeypatch):
+    api_flask = pytest.importorskip("api_flask")
+    threads = []
+
+    async def fake_main(json_input, progress):
+        return [{'job_id': '1'}]
+
+    queue = RunQueue(fake_main)
+    real_status = queue.status
+    monkeypatch.setattr(queue, 'status', lambda run_id: threads.append(threading.current_thread().name) or real_status(run_id))
+    monkeypatch.setattr(api_flask, 'run_queue', queue)
+    run = api_flask.run_on_loop(queue.submit({}))
+    client = api_flask.app.test_client()
+    for _ in range(100):
+        response = client.get(f"/runs/{run['run_id']}/results")
+        if response.status_code != 409:
+            break
+        time.sleep(0.01)
+    assert response.status_code == 200 and response.get_json()['count'] == 1
+    assert client.get("/runs").get_json()['runs'][0]['status'] == SUCCEEDED
+    assert client.get("/runs/unknown").status_code == 404
+    api_flask.run_on_loop(queue.stop())
+    # the queue's runs are only touched on the loop thread that also finishes them
+    assert set(threads) == {'scraper-loop'}
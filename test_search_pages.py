@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent search pagination of one query: pages arriving out of order, the stop at the
+first empty page, truncation to the limit and per-query deduplication.
+"""
+
+import asyncio
+
+import httpx
+
+import main as scraper_main
+
+SEARCH_URL = "https://www.upwork.com/nx/search/jobs/?q=python"
+
+
+def search_page(job_numbers):
+    return ''.join(
+        f'<article><a data-test="job-tile-title-link UpLink" href="/jobs/Job_~0{n}/">Job {n}</a></article>'
+        for n in job_numbers
+    )
+
+
+def job_url(n):
+    return f"https://www.upwork.com/jobs/~0{n}"
+
+
+def page_jobs(page):
+    return range(page * 100, page * 100 + 50)
+
+
+class SearchPages:
+    """Serves the search pages of one query, each after its own delay, and records the concurrency"""
+
+    def __init__(self, jobs, delays):
+        self.jobs = jobs
+        self.delays = delays
+        self.requested = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request):
+        page = int(request.url.params.get('page', 1))
+        self.requested.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(page, 0))
+        finally:
+            self.in_flight -= 1
+        return httpx.Response(200, text=search_page(self.jobs.get(page, ())))
+
+    def collect(self, limit, max_concurrent_pages=4):
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(self)) as client:
+                return [url async for url in scraper_main.iter_job_urls(client, SEARCH_URL, limit, max_concurrent_pages=max_concurrent_pages)]
+        return asyncio.run(run())
+
+
+def test_pages_are_fetched_concurrently_and_yielded_as_they_arrive():
+    # the later a page, the sooner it arrives
+    pages = SearchPages({page: page_jobs(page) for page in range(1, 5)}, {1: 0.4, 2: 0.3, 3: 0.2, 4: 0.1})
+    # a limit of 150 plus the default buffer of 20
+    urls = pages.collect(170)
+    assert pages.max_in_flight == 4
+    assert sorted(pages.requested) == [1, 2, 3, 4]
+    # the last page is cut to the 20 jobs still missing, each page keeps its order
+    assert urls == (
+        [job_url(n) for n in page_jobs(4)[:20]] + [job_url(n) for n in page_jobs(3)]
+        + [job_url(n) for n in page_jobs(2)] + [job_url(n) for n in page_jobs(1)]
+    )
+
+
+def test_pages_after_the_first_empty_one_are_not_fetched():
+    jobs = {1: page_jobs(1), 2: page_jobs(2), 4: page_jobs(4), 5: page_jobs(5)}
+    # page 3 comes back empty while page 2 is still loading; page 4 may take the slot page 3 frees
+    # before its result is read, page 5 waits for a slot until long after
+    pages = SearchPages(jobs, {1: 0.01, 2: 0.3, 4: 0.3})
+    urls = pages.collect(250, max_concurrent_pages=2)
+    assert 5 not in pages.requested
+    assert urls == [job_url(n) for n in page_jobs(1)] + [job_url(n) for n in page_jobs(2)]
+
+
+def test_jobs_repeated_across_pages_are_yielded_once():
+    # listings shifted by ten jobs between the two page loads
+    pages = SearchPages({1: range(1, 51), 2: range(41, 91), 3: range(91, 141)}, {1: 0.1, 3: 0.2})
+    urls = pages.collect(120)
+    # the repeats are dropped, not made up for: the last page still only gives its 20 jobs
+    assert len(urls) == len(set(urls)) == 110
+    assert urls == [job_url(n) for n in range(41, 91)] + [job_url(n) for n in range(1, 41)] + [job_url(n) for n in range(91, 111)]
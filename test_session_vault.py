@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the encrypted session vault and the stored-session probe.
+"""
+
+import asyncio
+import os
+import stat
+import time
+
+import httpx
+
+import main as scraper_main
+from utils.session_vault import SessionVault, account_key
+
+
+LOGIN_URL = "https://www.upwork.com/ab/account-security/login"
+SEARCH_URL = "https://www.upwork.com/nx/search/jobs/?q=python"
+COOKIES = [
+    {"name": "master_access_token", "value": "abc", "domain": ".upwork.com", "path": "/", "expires": -1},
+    {"name": "expired", "value": "x", "domain": ".upwork.com", "path": "/", "expires": time.time() - 60},
+]
+
+
+def test_round_trip_is_encrypted(tmp_path):
+    path = str(tmp_path / "vault.bin")
+    vault = SessionVault(path)
+    vault.save(account_key(" User@Example.com "), COOKIES, "UA/1.0")
+
+    with open(path, "rb") as f:
+        assert b"master_access_token" not in f.read()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    session = SessionVault(path).load("user@example.com")
+    assert session["user_agent"] == "UA/1.0"
+    assert [c["name"] for c in session["cookies"]] == ["master_access_token"]
+
+
+def test_expired_and_discarded_sessions_are_missing(tmp_path):
+    path = str(tmp_path / "vault.bin")
+    vault = SessionVault(path, max_age_hours=0)
+    vault.save("anonymous", COOKIES, "UA/1.0")
+    assert vault.load("anonymous") is None
+
+    vault = SessionVault(path)
+    assert vault.load("anonymous") is not None
+    vault.discard("anonymous")
+    assert vault.load("anonymous") is None
+
+
+def test_wrong_key_is_ignored(tmp_path):
+    path = str(tmp_path / "vault.bin")
+    SessionVault(path).save("anonymous", COOKIES, "UA/1.0")
+    os.remove(path + ".key")
+    assert SessionVault(path).load("anonymous") is None
+
+
+def _probe(handler, credentials_provided):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True) as client:
+            return await scraper_main.probe_session(client, SEARCH_URL, LOGIN_URL, credentials_provided)
+    return asyncio.run(run())
+
+
+def test_probe_accepts_logged_in_redirect():
+    def handler(request):
+        if "account-security/login" in request.url.path:
+            return httpx.Response(302, headers={"location": "https://www.upwork.com/nx/find-work/"})
+        return httpx.Response(200, text="<html>feed</html>")
+    assert _probe(handler, credentials_provided=True)
+
+
+def test_probe_rejects_expired_login():
+    assert not _probe(lambda request: httpx.Response(200, text="<form>login</form>"), credentials_provided=True)
+
+
+def test_probe_rejects_cloudflare_challenge():
+    def handler(request):
+        return httpx.Response(403, text='<title>Just a moment...</title><script src="/cdn-cgi/challenge-platform/h/b"></script>')
+    assert not _probe(handler, credentials_provided=False)
+    assert _probe(lambda request: httpx.Response(200, text="<html>results</html>"), credentials_provided=False)
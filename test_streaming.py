@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming results: per-job selection and the NDJSON/SSE event formats.
+"""
+
+import asyncio
+import json
+
+import main as scraper_main
+from utils.job_store import JobStore
+from utils.streaming import format_event, iter_stream_events
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+def test_stream_jobs_applies_limits_as_jobs_arrive(monkeypatch, tmp_path):
+    async def fake_scraped_jobs(json_input, browser_pool=None, progress=None, batch=None, resume=None, journal=None):
+        membership = {}
+        batch.update(searches=[{'label': 'a', 'limit': 22}, {'label': 'b', 'limit': 21}], membership=membership, buffer=20, skipped={'2'})
+        for job_id, labels in [('1', ['a', 'b']), ('2', ['a']), ('3', ['a']), ('4', ['b'])]:
+            membership[job_id] = labels
+            yield {'job_id': job_id, 'url': job_id}
+
+    monkeypatch.setattr(scraper_main, 'iter_scraped_jobs', fake_scraped_jobs)
+    progress = {}
+    json_input = {'general': {'job_store': str(tmp_path / 'jobs.sqlite')}}
+    jobs = asyncio.run(_collect(scraper_main.stream_jobs(json_input, progress=progress)))
+    assert [(job['job_id'], job['matched_queries']) for job in jobs] == [('1', ['a', 'b']), ('2', ['a'])]
+    assert progress['stage'] == 'done'
+    # jobs reused from the store are not upserted again
+    with JobStore(json_input['general']['job_store']) as store:
+        assert store.get('1') is not None and store.get('2') is None
+
+
+def test_ndjson_stream_ends_with_summary():
+    async def jobs():
+        yield {'job_id': '1', 'title': 'Café'}
+        yield {'job_id': '2', 'title': 'Bot'}
+
+    events = [json.loads(line) for line in asyncio.run(_collect(iter_stream_events(jobs(), 'ndjson')))]
+    assert [e['event'] for e in events] == ['job', 'job', 'summary']
+    assert events[0]['data']['title'] == 'Café'
+    assert events[-1]['data']['count'] == 2
+
+
+def test_sse_stream_reports_failure():
+    async def jobs():
+        yield {'job_id': '1'}
+        raise RuntimeError('connection reset')
+
+    events = asyncio.run(_collect(iter_stream_events(jobs(), 'sse')))
+    assert events[0] == format_event('job', {'job_id': '1'}, 'sse') == 'event: job\ndata: {"job_id": "1"}\n\n'
+    assert events[-1].startswith('event: error\n')
+    assert json.loads(events[-1].split('data: ', 1)[1]) == {'error': 'connection reset', 'count': 1}
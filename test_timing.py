@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-stage timings and the run report.
+"""
+
+import asyncio
+import json
+import os
+
+import httpx
+
+import main as scraper_main
+from bench_end_to_end import run
+from utils import timing
+from utils.rate_limit import rate_limit_hook
+
+
+def test_stage_records_into_current_timer_only():
+    with timing.stage('outside'):
+        pass
+    timer = timing.StageTimer()
+    with timing.use_timer(timer):
+        for size in (100, 300):
+            with timing.stage('fetch') as sample:
+                sample.bytes = size
+    assert timing.current_timer() is None
+    report = timer.report()
+    assert list(report['stages']) == ['fetch']
+    assert report['stages']['fetch']['count'] == 2 and report['stages']['fetch']['bytes'] == 400
+    assert report['bytes_total'] == 400
+
+
+def test_concurrent_runs_keep_their_own_timers():
+    async def one_run(name):
+        timer = timing.StageTimer()
+        with timing.use_timer(timer):
+            # tasks started by the run inherit its timer
+            async def page():
+                with timing.stage(name):
+                    await asyncio.sleep(0.01)
+            await asyncio.gather(*(asyncio.create_task(page()) for _ in range(3)))
+        return timer.report()['stages']
+
+    async def both():
+        return await asyncio.gather(one_run('a'), one_run('b'))
+
+    first, second = asyncio.run(both())
+    assert list(first) == ['a'] and first['a']['count'] == 3
+    assert list(second) == ['b'] and second['b']['count'] == 3
+
+
+def test_parse_worker_samples_are_merged():
+    html = open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testing', 'nuxt_job_page_sample.html'), encoding='utf-8').read()
+    job, samples = scraper_main.parse_job_detail_timed('https://www.upwork.com/jobs/~01', html, False)
+    assert job['job_id'] == '01'
+    assert set(samples) == {'detail_nuxt_decode', 'detail_soup', 'detail_attributes', 'detail_reviews'}
+    timer = timing.StageTimer()
+    timer.merge(samples)
+    timer.merge(samples)
+    assert timer.report()['stages']['detail_soup']['count'] == 2
+
+
+def test_fetch_time_leaves_out_the_rate_limit_wait():
+    page = open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testing', 'nuxt_job_page_sample.html'), encoding='utf-8').read()
+
+    async def handler(request):
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, text=page)
+
+    async def fetch_all():
+        timer = timing.StageTimer()
+        # one request every 0.2s: the second and third wait for their token
+        hooks = {'request': [rate_limit_hook(rate=5, burst=1)]}
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), event_hooks=hooks) as client:
+            with timing.use_timer(timer):
+                for n in range(3):
+                    html, failure, _, _ = await scraper_main._get_job_page(client, f'https://wait.example/jobs/~0{n}')
+                    assert html and failure is None
+        return timer.report()['stages']
+
+    stages = asyncio.run(fetch_all())
+    assert stages['rate_limit_wait']['total_seconds'] >= 0.3
+    assert stages['detail_fetch']['count'] == 3 and stages['detail_fetch']['max_ms'] < 150
+
+
+def test_run_report_covers_every_stage(tmp_path):
+    report = run(30, {'rate_limit': 1000, 'parse_workers': 0, 'output_dir': str(tmp_path)}, pages=1)
+    stages = report['timing']['stages']
+    for name in ('rate_limit_wait', 'search_page', 'search_links', 'detail_fetch', 'detail_nuxt_decode',
+                 'detail_soup', 'detail_attributes', 'detail_reviews', 'output_write'):
+        assert name in stages, name
+    assert stages['detail_fetch']['count'] == 50 and stages['detail_fetch']['bytes'] > 0
+    assert report['timing']['jobs'] == 30
+    # the same report is written next to the output files
+    (path,) = (tmp_path / 'reports').iterdir()
+    assert json.loads(path.read_text(encoding='utf-8'))['stages'].keys() == stages.keys()
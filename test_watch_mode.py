@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for watch mode: recency-sorted polling that stops at the first job already seen.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import main as scraper_main
+from utils.session_vault import SessionVault
+
+
+SEARCH_URL = "https://www.upwork.com/nx/search/jobs/?q=python&sort=recency"
+
+
+def search_page(job_ids):
+    tiles = ''.join(
+        f'<article><a data-test="job-tile-title-link UpLink" href="/jobs/Job_~{job_id}/">Job {job_id}</a></article>'
+        for job_id in job_ids
+    )
+    return f'<html><body>{tiles}</body></html>'
+
+
+def run_watch_poll(pages, seen, limit=200):
+    requested = []
+
+    def handler(request):
+        page = int(request.url.params.get('page', 1))
+        requested.append(page)
+        return httpx.Response(200, text=search_page(pages[page - 1]))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [url async for url in scraper_main.iter_new_job_urls(client, SEARCH_URL, seen, limit)]
+
+    return asyncio.run(run()), requested
+
+
+def test_stops_paginating_at_first_seen_job():
+    pages = [[f"{n:03d}" for n in range(100, 50, -1)][:50], [f"{n:03d}" for n in range(50, 0, -1)]]
+    urls, requested = run_watch_poll(pages, seen={"045", "044"})
+    assert [scraper_main.job_id_from_url(u) for u in urls] == [f"{n:03d}" for n in range(100, 45, -1)]
+    assert requested == [1, 2]
+
+    urls, requested = run_watch_poll(pages, seen={"098"})
+    assert len(urls) == 2
+    assert requested == [1]
+
+
+def test_limit_and_short_last_page():
+    pages = [[str(n) for n in range(50)], [str(n) for n in range(50, 60)], ["never"]]
+    urls, requested = run_watch_poll(pages, seen=set(), limit=55)
+    assert len(urls) == 55 and requested == [1, 2]
+
+    urls, requested = run_watch_poll(pages, seen=set())
+    assert len(urls) == 60 and requested == [1, 2]
+
+
+def test_challenge_raises_session_expired():
+    def handler(request):
+        return httpx.Response(403, text='<title>Just a moment...</title>')
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [url async for url in scraper_main.iter_new_job_urls(client, SEARCH_URL, set())]
+
+    with pytest.raises(scraper_main.SessionExpiredError):
+        asyncio.run(run())
+
+
+def test_watch_forces_newest_sort():
+    assert scraper_main.watch_search_params({'query': 'a', 'sort': 'relevance'}) == {'query': 'a', 'sort': 'newest'}
+    assert scraper_main.watch_search_params([{'query': 'a'}, None]) == [{'query': 'a', 'sort': 'newest'}, {'sort': 'newest'}]
+    searches = scraper_main.build_search_batch(scraper_main.watch_search_params({'query': 'a'}), False, buffer=0)
+    assert 'sort=recency' in searches[0]['url']
+
+
+def test_rejected_session_waits_and_caps_logins(monkeypatch, tmp_path):
+    logins = []
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    def handler(request):
+        return httpx.Response(403, text='<title>Just a moment...</title>')
+
+    async def open_session(*args, **kwargs):
+        logins.append(args)
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def browser_login_session(*args, **kwargs):
+        logins.append(args)
+        return {'cookies': [], 'user_agent': 'renewed'}
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(scraper_main, 'open_session', open_session)
+    monkeypatch.setattr(scraper_main, 'browser_login_session', browser_login_session)
+    monkeypatch.setattr(scraper_main.asyncio, 'sleep', sleep)
+    json_input = {'search': {'query': 'python'}, 'general': {'store_jobs': False, 'parse_workers': 0, 'max_reauth': 2,
+                                                              'session_vault': str(tmp_path / 'vault.bin')}}
+
+    async def run():
+        async for _ in scraper_main.watch_jobs(json_input, interval=60):
+            pass
+
+    with pytest.raises(scraper_main.SessionExpiredError):
+        asyncio.run(run())
+    # the first login and two more, each after waiting one interval
+    assert len(logins) == 3
+    assert sleeps.count(60) == 2
+
+
+def test_stale_stored_session_is_dropped_and_found_jobs_kept(monkeypatch, tmp_path):
+    vault_path = str(tmp_path / 'vault.bin')
+    cookie = {'name': 'session', 'domain': '.upwork.com', 'path': '/', 'expires': -1}
+    SessionVault(vault_path).save('anonymous', [dict(cookie, value='stale')], 'stale agent')
+    searched = []
+    logins = []
+    fetched = []
+
+    def handler(request):
+        query = request.url.params['q']
+        searched.append((query, request.headers['User-Agent']))
+        if request.headers['User-Agent'] == 'stale agent' and query == 'second':
+            return httpx.Response(403, text='<title>Just a moment...</title>')
+        # the first search's job drops off the results before the next poll
+        job_ids = {'first': ['01'] if len(searched) == 1 else [], 'second': ['02']}[query]
+        return httpx.Response(200, text=search_page(job_ids))
+
+    async def probe_session(*args, **kwargs):
+        # the stored session still opens the search page
+        return True
+
+    async def browser_login_session(*args, **kwargs):
+        logins.append(args)
+        return {'cookies': [dict(cookie, value='fresh')], 'user_agent': 'fresh agent'}
+
+    async def iter_job_details(client, urls, *args, **kwargs):
+        fetched.extend(urls)
+        for url in urls:
+            yield {'url': url, 'title': 'Job'}
+
+    class MockClient(httpx.AsyncClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs, transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(scraper_main.httpx, 'AsyncClient', MockClient)
+    monkeypatch.setattr(scraper_main, 'probe_session', probe_session)
+    monkeypatch.setattr(scraper_main, 'browser_login_session', browser_login_session)
+    monkeypatch.setattr(scraper_main, 'iter_job_details', iter_job_details)
+    json_input = {'search': [{'query': 'first'}, {'query': 'second'}],
+                  'general': {'store_jobs': False, 'parse_workers': 0, 'session_vault': vault_path}}
+
+    async def run():
+        return [jobs async for jobs in scraper_main.watch_jobs(json_input, interval=0, max_cycles=2)]
+
+    polls = asyncio.run(run())
+    assert len(logins) == 1
+    assert SessionVault(vault_path).load('anonymous')['user_agent'] == 'fresh agent'
+    assert [agent for query, agent in searched] == ['stale agent'] * 2 + ['fresh agent'] * 2
+    # the job found before the rejection is fetched with the next poll's
+    assert sorted(fetched) == ["https://www.upwork.com/jobs/~01", "https://www.upwork.com/jobs/~02"]
+    assert [len(jobs) for jobs in polls] == [2]
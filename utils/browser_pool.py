@@ -0,0 +1,126 @@
+"""
+Pool of long-lived Camoufox browsers shared by concurrent scraper runs.
+
+Launching Camoufox is the slowest and most memory-hungry step of a run. The API
+servers start a pool once and every run borrows a warm browser, getting a fresh
+BrowserContext (isolated cookies/storage) that is closed when the run returns it.
+Browsers are health-checked before each borrow and relaunched after a crash or
+after ``max_uses`` borrows, so a leaking browser never lives forever.
+"""
+import asyncio
+import contextlib
+import logging
+from typing import AsyncIterator
+
+logger = logging.getLogger("Upwork")
+
+CAMOUFOX_LAUNCH_OPTIONS = {
+    'headless': True,
+    'geoip': True,
+    'humanize': True,
+    'i_know_what_im_doing': True,
+    'config': {'forceScopeAccess': True},
+    'disable_coop': True,
+}
+
+
+class _PooledBrowser:
+    """One launched browser and the context manager that owns its Playwright instance."""
+    __slots__ = ('manager', 'browser', 'uses', 'broken')
+
+    def __init__(self, manager, browser):
+        self.manager = manager
+        self.browser = browser
+        self.uses = 0
+        self.broken = False
+
+    def healthy(self) -> bool:
+        return not self.broken and self.browser.is_connected()
+
+
+class BrowserPool:
+    def __init__(self, size: int = 2, max_uses: int = 20, launch_options: dict | None = None):
+        """
+        :param size: Number of browsers kept warm (and maximum number of concurrent borrows)
+        :param max_uses: Borrows after which a browser is closed and relaunched
+        :param launch_options: Options passed to AsyncCamoufox (defaults to CAMOUFOX_LAUNCH_OPTIONS)
+        """
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.launch_options = launch_options or CAMOUFOX_LAUNCH_OPTIONS
+        self._idle: asyncio.Queue | None = None
+        self._browsers: set[_PooledBrowser] = set()
+        self._closed = False
+        self._start_lock = asyncio.Lock()
+
+    async def _launch(self) -> _PooledBrowser:
+        from camoufox.async_api import AsyncCamoufox
+
+        manager = AsyncCamoufox(**self.launch_options)
+        browser = await manager.__aenter__()
+        pooled = _PooledBrowser(manager, browser)
+        browser.on('disconnected', lambda _: setattr(pooled, 'broken', True))
+        self._browsers.add(pooled)
+        return pooled
+
+    async def _dispose(self, pooled: _PooledBrowser) -> None:
+        self._browsers.discard(pooled)
+        try:
+            await pooled.manager.__aexit__(None, None, None)
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser: {e}")
+
+    async def start(self) -> None:
+        """Launch the browsers. Called once at server startup."""
+        self._idle = asyncio.Queue()
+        launched = await asyncio.gather(*(self._launch() for _ in range(self.size)), return_exceptions=True)
+        for pooled in launched:
+            if isinstance(pooled, Exception):
+                logger.warning(f"⚠️ Could not launch pooled browser, it will be retried on first use: {pooled}")
+                pooled = None
+            self._idle.put_nowait(pooled)
+        logger.info(f"🌐 Browser pool started with {len(self._browsers)}/{self.size} browsers")
+
+    async def close(self) -> None:
+        """Close every browser. Called once at server shutdown."""
+        self._closed = True
+        await asyncio.gather(*(self._dispose(p) for p in list(self._browsers)))
+
+    @contextlib.asynccontextmanager
+    async def borrow(self) -> AsyncIterator:
+        """
+        Borrow a browser and yield a fresh BrowserContext on it. Waits while every browser is in use.
+
+        :return: Async context manager yielding a Playwright BrowserContext
+        """
+        async with self._start_lock:
+            if self._idle is None:
+                await self.start()
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        pooled = await self._idle.get()
+        try:
+            if pooled is not None and (not pooled.healthy() or pooled.uses >= self.max_uses):
+                logger.debug(f"Recycling pooled browser after {pooled.uses} uses (healthy: {pooled.healthy()})")
+                await self._dispose(pooled)
+                pooled = None
+            if pooled is None:
+                pooled = await self._launch()
+            pooled.uses += 1
+            context = await pooled.browser.new_context()
+            try:
+                yield context
+            finally:
+                try:
+                    await context.close()
+                except Exception as e:
+                    # a context that cannot be closed means the browser is in a bad state
+                    logger.debug(f"Error closing pooled context, recycling browser: {e}")
+                    pooled.broken = True
+        except BaseException:
+            if pooled is not None and not pooled.healthy():
+                await self._dispose(pooled)
+                pooled = None
+            raise
+        finally:
+            self._idle.put_nowait(pooled)
@@ -0,0 +1,130 @@
+"""
+AIMD (additive increase, multiplicative decrease) limit on concurrent job detail requests.
+
+The limit starts low and grows by one after every ``limit`` consecutive healthy responses,
+i.e. roughly once per round of requests. A throttling signal (429, 403, Cloudflare challenge,
+timeout), or a round whose smoothed latency is above ``target_latency``, cuts it by ``backoff``. Signals from
+requests that were started before the previous cut are ignored, so one burst of 429s from
+requests already in flight only halves the limit once.
+"""
+import asyncio
+import collections
+import contextlib
+import logging
+import time
+from typing import AsyncIterator
+
+logger = logging.getLogger("Upwork")
+
+# Reasons a response is treated as a sign that Upwork wants us to slow down
+HTTP_429 = 'http_429'
+HTTP_403 = 'http_403'
+CHALLENGE = 'challenge'
+TIMEOUT = 'timeout'
+LATENCY = 'latency'
+
+
+class _Slot:
+    __slots__ = ('started', 'throttled', 'latency')
+
+    def __init__(self, started: float):
+        self.started = started
+        # set by the caller to one of the reasons above when the response asks us to slow down
+        self.throttled = None
+        # server response time, if the caller knows it; defaults to the time spent in the slot
+        self.latency = None
+
+
+class AdaptiveLimiter:
+    def __init__(self, maximum: int = 25, minimum: int = 2, initial: int | None = None, target_latency: float = 5.0,
+                 backoff: float = 0.5, history_size: int = 20):
+        """
+        :param maximum: Upper bound of the limit
+        :param minimum: Lower bound of the limit
+        :param initial: Starting limit (defaults to a quarter of the maximum)
+        :param target_latency: Smoothed response time in seconds above which the limit is cut
+        :param backoff: Factor the limit is multiplied by on a throttling signal
+        :param history_size: Number of recent limit changes kept for the run stats
+        """
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = min(self.maximum, max(self.minimum, initial or self.maximum // 4))
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.in_flight = 0
+        self.peak = self.limit
+        self.latency = None
+        self.requests = 0
+        self.backoffs = collections.Counter()
+        self.history = collections.deque(maxlen=history_size)
+        self._healthy = 0
+        self._last_cut = 0.0
+        self._created = time.monotonic()
+        self._cond = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[_Slot]:
+        """
+        Wait until a request may start, then yield a slot for it. Set ``slot.throttled`` to a reason
+        before leaving the block when the response asks to slow down.
+
+        :return: Async context manager yielding a _Slot
+        """
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        slot = _Slot(time.monotonic())
+        try:
+            yield slot
+        finally:
+            self._record(slot, slot.latency if slot.latency is not None else time.monotonic() - slot.started)
+            # waiters re-check the limit, which may have grown or shrunk
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def _record(self, slot: _Slot, elapsed: float) -> None:
+        self.requests += 1
+        self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+        if slot.throttled is not None:
+            # responses to requests sent before the last cut describe the old limit
+            if slot.started >= self._last_cut:
+                self._cut(slot.throttled)
+            self._healthy = 0
+            return
+        self._healthy += 1
+        # latency is judged once per round of requests, so one slow round costs a single cut
+        if self._healthy >= self.limit:
+            if self.latency > self.target_latency:
+                self._cut(LATENCY)
+            else:
+                self._set_limit(self.limit + 1, 'healthy')
+
+    def _cut(self, reason: str) -> None:
+        self.backoffs[reason] += 1
+        self._set_limit(int(self.limit * self.backoff), reason)
+        self._last_cut = time.monotonic()
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        limit = min(self.maximum, max(self.minimum, limit))
+        self._healthy = 0
+        if limit == self.limit:
+            return
+        logger.debug(f"Detail concurrency {self.limit} -> {limit} ({reason})")
+        self.history.append({'after_seconds': round(time.monotonic() - self._created, 1), 'limit': limit, 'reason': reason})
+        self.limit = limit
+        self.peak = max(self.peak, limit)
+
+    def stats(self) -> dict:
+        """Current limit, bounds, smoothed latency and why the limit was cut, for the run stats."""
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'peak': self.peak,
+            'requests': self.requests,
+            'latency_seconds': round(self.latency, 3) if self.latency is not None else None,
+            'backoffs': dict(self.backoffs),
+            'recent_changes': list(self.history),
+        }
@@ -0,0 +1,129 @@
+"""
+Pluggable HTML parser backends for the extractors in main.py.
+
+- ``html.parser``: BeautifulSoup with Python's built-in parser (no extra dependencies)
+- ``lxml``: BeautifulSoup on top of the C-backed lxml tree builder
+- ``selectolax``: Lexbor CSS engine for search-result link extraction; job detail pages,
+  which need the full BeautifulSoup navigation API, are built with lxml
+
+Backends whose optional dependency is missing fall back to ``html.parser`` with a warning.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+logger = logging.getLogger("Upwork")
+
+HTML_PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_HTML_PARSER = 'html.parser'
+
+JOB_TILE_LINK_SELECTOR = 'a[data-test="job-tile-title-link UpLink"]'
+_JOB_ID_RE = re.compile(r'~([0-9a-zA-Z]+)')
+
+
+def _module_available(name: str) -> bool:
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_html_parser(name: str | None) -> str:
+    """
+    Validate a backend name from config/jsonInput and fall back if its dependency is not installed.
+
+    :param name: Requested backend name (None selects the default)
+    :type name: str or None
+    :return: Usable backend name
+    :rtype: str
+    """
+    if not name:
+        return DEFAULT_HTML_PARSER
+    name = str(name).strip().lower()
+    if name not in HTML_PARSER_BACKENDS:
+        logger.warning(f"Unknown html_parser '{name}', using '{DEFAULT_HTML_PARSER}'. Options: {', '.join(HTML_PARSER_BACKENDS)}")
+        return DEFAULT_HTML_PARSER
+    if name == 'selectolax' and not _module_available('selectolax'):
+        logger.warning("selectolax is not installed, falling back to 'lxml'")
+        name = 'lxml'
+    if name == 'lxml' and not _module_available('lxml'):
+        logger.warning(f"lxml is not installed, falling back to '{DEFAULT_HTML_PARSER}'")
+        name = DEFAULT_HTML_PARSER
+    return name
+
+
+def make_soup(html: str, backend: str = DEFAULT_HTML_PARSER) -> BeautifulSoup:
+    """
+    Build a BeautifulSoup tree using the tree builder that corresponds to the backend.
+
+    :param html: HTML content
+    :type html: str
+    :param backend: Backend name (see HTML_PARSER_BACKENDS)
+    :type backend: str
+    :return: Parsed BeautifulSoup tree
+    :rtype: BeautifulSoup
+    """
+    from bs4 import BeautifulSoup
+
+    features = 'lxml' if backend in ('lxml', 'selectolax') else 'html.parser'
+    return BeautifulSoup(html, features)
+
+
+def extract_job_links(html: str, backend: str = DEFAULT_HTML_PARSER) -> list[str]:
+    """
+    Extract job IDs (``~0123...``) from the job tiles of an Upwork search results page.
+
+    :param html: HTML content of the search page
+    :type html: str
+    :param backend: Backend name (see HTML_PARSER_BACKENDS)
+    :type backend: str
+    :return: Job IDs including the leading '~', in page order
+    :rtype: list[str]
+    """
+    if backend == 'selectolax':
+        hrefs = _selectolax_tile_hrefs(html)
+    else:
+        hrefs = _soup_tile_hrefs(make_soup(html, backend))
+    job_ids = []
+    for href in hrefs:
+        match = _JOB_ID_RE.search(href)
+        if match:
+            job_ids.append(match.group(0))
+    return job_ids
+
+
+def _soup_tile_hrefs(soup: BeautifulSoup) -> list[str]:
+    hrefs = []
+    for article in soup.find_all('article'):
+        a_tag = article.find('a', attrs={'data-test': 'job-tile-title-link UpLink'})
+        if not a_tag:
+            for a in article.find_all('a', href=True):
+                if '/jobs/' in a['href'] and '~' in a['href']:
+                    a_tag = a
+                    break
+        if a_tag and a_tag.has_attr('href'):
+            hrefs.append(a_tag['href'])
+    return hrefs
+
+
+def _selectolax_tile_hrefs(html: str) -> list[str]:
+    from selectolax.lexbor import LexborHTMLParser
+
+    hrefs = []
+    for article in LexborHTMLParser(html).css('article'):
+        a_tag = article.css_first(JOB_TILE_LINK_SELECTOR)
+        if a_tag is None:
+            for a in article.css('a[href]'):
+                href = a.attributes.get('href') or ''
+                if '/jobs/' in href and '~' in href:
+                    a_tag = a
+                    break
+        if a_tag is not None and 'href' in a_tag.attributes:
+            hrefs.append(a_tag.attributes['href'] or '')
+    return hrefs
@@ -0,0 +1,153 @@
+"""
+SQLite store of scraped jobs, keyed on ``job_id``.
+
+Every run upserts the jobs it fetched. A job keeps the time it was first and last fetched,
+and a hash of its normalized record tells whether it changed since the
+previous run, so repeated runs know which jobs are new, changed or unchanged.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger("Upwork")
+
+DEFAULT_JOB_STORE_PATH = os.path.join('data', 'jobs', 'jobs.sqlite')
+
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+# Fields that describe the run rather than the job, left out of the record hash
+RUN_FIELDS = ('matched_queries',)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id       TEXT PRIMARY KEY,
+    url          TEXT,
+    record       TEXT NOT NULL,
+    record_hash  TEXT NOT NULL,
+    first_seen   TEXT NOT NULL,
+    last_seen    TEXT NOT NULL,
+    last_changed TEXT NOT NULL,
+    times_seen   INTEGER NOT NULL DEFAULT 1,
+    versions     INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen);
+CREATE INDEX IF NOT EXISTS jobs_last_changed ON jobs (last_changed);
+"""
+
+
+def record_hash(job: dict) -> str:
+    """
+    Hash of a job record that does not depend on key order or on run-specific fields.
+
+    :param job: Job attribute dictionary
+    :type job: dict
+    :return: SHA-256 hex digest
+    :rtype: str
+    """
+    normalized = {k: v for k, v in job.items() if k not in RUN_FIELDS}
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class JobStore:
+    def __init__(self, path: str = DEFAULT_JOB_STORE_PATH):
+        """
+        :param path: SQLite database file (created on first use)
+        """
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def upsert(self, job: dict, seen_at: str | None = None) -> str:
+        """
+        Insert a job, or update it if the job_id is already stored.
+
+        :param job: Job attribute dictionary with a 'job_id'
+        :param seen_at: ISO timestamp of the run (defaults to now)
+        :return: 'new', 'changed' or 'unchanged'
+        """
+        with self.conn:
+            return self._upsert(job, seen_at or datetime.datetime.now().isoformat(timespec='seconds'))
+
+    def _upsert(self, job: dict, seen_at: str) -> str:
+        digest = record_hash(job)
+        record = json.dumps(job, ensure_ascii=False, default=str)
+        row = self.conn.execute('SELECT record_hash FROM jobs WHERE job_id = ?', (job['job_id'],)).fetchone()
+        if row is None:
+            self.conn.execute(
+                'INSERT INTO jobs (job_id, url, record, record_hash, first_seen, last_seen, last_changed) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job['job_id'], job.get('url'), record, digest, seen_at, seen_at, seen_at),
+            )
+            return NEW
+        if row['record_hash'] == digest:
+            self.conn.execute(
+                'UPDATE jobs SET last_seen = ?, times_seen = times_seen + 1 WHERE job_id = ?',
+                (seen_at, job['job_id']),
+            )
+            return UNCHANGED
+        self.conn.execute(
+            'UPDATE jobs SET url = ?, record = ?, record_hash = ?, last_seen = ?, last_changed = ?, '
+            'times_seen = times_seen + 1, versions = versions + 1 WHERE job_id = ?',
+            (job.get('url'), record, digest, seen_at, seen_at, job['job_id']),
+        )
+        return CHANGED
+
+    def upsert_many(self, jobs: list[dict]) -> dict[str, int]:
+        """
+        Upsert the jobs of a run in one transaction.
+
+        :param jobs: Job attribute dictionaries
+        :return: Number of 'new', 'changed' and 'unchanged' jobs
+        """
+        seen_at = datetime.datetime.now().isoformat(timespec='seconds')
+        counts = {NEW: 0, CHANGED: 0, UNCHANGED: 0}
+        with self.conn:
+            for job in jobs:
+                if job.get('job_id'):
+                    counts[self._upsert(job, seen_at)] += 1
+        return counts
+
+    def get(self, job_id: str) -> dict | None:
+        """
+        :param job_id: Upwork job ID
+        :return: Stored record plus its tracking columns, or None if the job is not stored
+        """
+        row = self.conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry['record'] = json.loads(entry['record'])
+        return entry
+
+    def fresh_record(self, job_id: str, max_age_hours: float) -> dict | None:
+        """
+        :param job_id: Upwork job ID
+        :param max_age_hours: Maximum time since the job was last fetched
+        :return: Stored record if the job was fetched within max_age_hours, otherwise None
+        """
+        cutoff = (datetime.datetime.now() - datetime.timedelta(hours=max_age_hours)).isoformat(timespec='seconds')
+        row = self.conn.execute('SELECT record FROM jobs WHERE job_id = ? AND last_seen >= ?', (job_id, cutoff)).fetchone()
+        return json.loads(row['record']) if row else None
+
+    def job_ids(self) -> set[str]:
+        """IDs of every stored job."""
+        return {row[0] for row in self.conn.execute('SELECT job_id FROM jobs')}
@@ -0,0 +1,174 @@
+"""
+Prometheus metrics of the scraper process, served by the API servers on ``/metrics``.
+
+A small registry that writes the Prometheus text exposition format (version 0.0.4), so the
+servers need no client library. Metrics are process-wide: every run of the process adds to
+the same series. Stage durations come from utils.timing, which observes every timed stage
+into ``upwork_stage_duration_seconds``.
+"""
+import contextlib
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# seconds; from a parsed page (ms) up to a Cloudflare solve or a login (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_registry: list['_Metric'] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        """
+        :param name: Metric name
+        :param documentation: Help text
+        :param labels: Label names; every update passes a value for each of them
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labels)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            # a series without labels exists from the start, so alerts on it work before the first update
+            self._values[()] = self._initial()
+        _registry.append(self)
+
+    @abstractmethod
+    def _initial(self) -> object:
+        ...
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _initial(self) -> float:
+        return 0
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    @contextlib.contextmanager
+    def track(self, **labels) -> Iterator[None]:
+        """Count the block as in progress while it runs."""
+        self.inc(1, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        """
+        :param name: Metric name
+        :param documentation: Help text
+        :param labels: Label names; every observation passes a value for each of them
+        :param buckets: Upper bounds of the buckets, ascending (+Inf is added)
+        """
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labels)
+
+    def _initial(self) -> tuple:
+        return [0] * len(self.buckets), 0.0
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> Iterator[str]:
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames + ('le',), key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+def render() -> str:
+    """Every metric of the process in the Prometheus text format."""
+    return '\n'.join(metric.render() for metric in _registry) + '\n'
+
+
+async def response_status_hook(response) -> None:
+    """httpx response event hook counting the status codes of every response."""
+    HTTP_RESPONSES.inc(status=response.status_code)
+
+
+RUNS_STARTED = Counter('upwork_runs_started_total', 'Scraper runs started')
+RUNS_FINISHED = Counter('upwork_runs_finished_total', 'Scraper runs that ended, by status (succeeded, failed, cancelled)', ('status',))
+JOBS_FETCHED = Counter('upwork_jobs_fetched_total', 'Job detail pages fetched and parsed')
+STAGE_SECONDS = Histogram('upwork_stage_duration_seconds', 'Duration of the stages of a run, e.g. detail_fetch, detail_soup, captcha_solve', ('stage',))
+HTTP_RESPONSES = Counter('upwork_http_responses_total', 'HTTP responses received, by status code', ('status',))
+FETCH_FAILURES = Counter('upwork_fetch_failures_total', 'Failed job page requests by kind (network, http_status, challenge, nuxt_missing, parse_error), retried or not', ('kind',))
+IN_FLIGHT = Gauge('upwork_http_requests_in_flight', 'Search and job page requests waiting for their response')
+CAPTCHA_SOLVES = Counter('upwork_captcha_solves_total', 'Cloudflare challenge solves in the browser, by outcome (solved, not_solved)', ('outcome',))
+LOGIN_ATTEMPTS = Counter('upwork_login_attempts_total', 'Browser login attempts, by outcome (succeeded, rejected, error)', ('outcome',))
+SESSION_RENEWALS = Counter('upwork_session_renewals_total', 'Logins repeated because Upwork rejected the session mid-run, by outcome', ('outcome',))
@@ -0,0 +1,339 @@
+"""
+Native decoder for the ``window.__NUXT__`` payload embedded in Upwork pages.
+
+Nuxt serializes its state as an IIFE whose parameters are de-duplicated values::
+
+    window.__NUXT__=(function(a,b,c){b.x=c;return {state:{job:{title:a,meta:b}}}}("Title",{},null));
+
+The decoder below understands that format (plus plain object literals) and
+produces the same dict as evaluating the script with js2py and calling
+``to_dict()``, without spinning up a JavaScript interpreter.
+"""
+import json
+import re
+
+NUXT_SCRIPT_PREFIX = '<script>window.__NUXT__='
+
+_WS = re.compile(r'\s*')
+_IDENT = re.compile(r'[A-Za-z_$][\w$]*')
+_NUMBER = re.compile(r'-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+_SINGLE_QUOTED_ESCAPE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.S)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_CONSTANTS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+_scanstring = json.decoder.scanstring
+
+
+class NuxtDecodeError(ValueError):
+    """Raised when a payload uses syntax the native decoder does not support."""
+
+
+class _Ref:
+    """Placeholder for an IIFE parameter referenced before the arguments are known."""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+def find_nuxt_script(html: str) -> str | None:
+    """
+    Locate the window.__NUXT__ script in an HTML document and return its JavaScript source.
+
+    :param html: HTML content as a string
+    :type html: str
+    :return: JavaScript assigned to window.__NUXT__ (without the trailing semicolon), or None if absent
+    :rtype: str or None
+    """
+    start = html.find(NUXT_SCRIPT_PREFIX)
+    if start == -1:
+        return None
+    start += len(NUXT_SCRIPT_PREFIX)
+    end = html.find('</script>', start)
+    if end == -1:
+        return None
+    return html[start:end].strip().rstrip(';')
+
+
+def decode_nuxt_payload(js_code: str) -> dict:
+    """
+    Decode a window.__NUXT__ payload (IIFE or object literal) into Python data.
+
+    :param js_code: JavaScript assigned to window.__NUXT__
+    :type js_code: str
+    :return: Decoded payload, equivalent to js2py's ``to_dict()`` output
+    :rtype: dict
+    :raises NuxtDecodeError: If the payload contains unsupported syntax
+    """
+    try:
+        result = _PayloadParser(js_code).parse()
+    except NuxtDecodeError:
+        raise
+    except (IndexError, ValueError, TypeError, KeyError, AttributeError, RecursionError) as e:
+        raise NuxtDecodeError(f"Malformed Nuxt payload: {e}") from e
+    if not isinstance(result, dict):
+        raise NuxtDecodeError(f"Nuxt payload decoded to {type(result).__name__}, expected an object")
+    return result
+
+
+class _PayloadParser:
+    """Recursive-descent parser for the subset of JavaScript Nuxt emits."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        # (container, key, _Ref) triples filled in once the IIFE arguments are parsed
+        self.holes = []
+        # inside the function body identifiers refer to IIFE parameters
+        self.allow_refs = False
+
+    # ------------------------------------------------------------------ helpers
+
+    def error(self, message: str):
+        snippet = self.text[self.pos:self.pos + 40]
+        raise NuxtDecodeError(f"{message} at offset {self.pos}: {snippet!r}")
+
+    def skip_ws(self) -> None:
+        self.pos = _WS.match(self.text, self.pos).end()
+
+    def peek(self) -> str:
+        self.skip_ws()
+        return self.text[self.pos:self.pos + 1]
+
+    def expect(self, token: str) -> None:
+        self.skip_ws()
+        if not self.text.startswith(token, self.pos):
+            self.error(f"Expected {token!r}")
+        self.pos += len(token)
+
+    def accept(self, token: str) -> bool:
+        self.skip_ws()
+        if self.text.startswith(token, self.pos):
+            self.pos += len(token)
+            return True
+        return False
+
+    def ident(self) -> str:
+        self.skip_ws()
+        match = _IDENT.match(self.text, self.pos)
+        if not match:
+            self.error("Expected identifier")
+        self.pos = match.end()
+        return match.group(0)
+
+    # ---------------------------------------------------------------- top level
+
+    def parse(self):
+        wrapped = self.accept('(')
+        if self.peek() != 'f':
+            value = self.value()
+            if wrapped:
+                self.expect(')')
+            self.finish()
+            return value
+
+        self.expect('function')
+        self.expect('(')
+        params = []
+        if not self.accept(')'):
+            while True:
+                params.append(self.ident())
+                if self.accept(')'):
+                    break
+                self.expect(',')
+        self.expect('{')
+        self.allow_refs = True
+        assignments = []
+        while not self.accept('return'):
+            assignments.append(self.assignment())
+        result = self.value()
+        self.accept(';')
+        self.expect('}')
+        self.allow_refs = False
+
+        # both `(function(){...}(args))` and `(function(){...})(args)` are valid
+        closed_early = wrapped and self.accept(')')
+        self.expect('(')
+        args = []
+        if not self.accept(')'):
+            while True:
+                args.append(self.value())
+                if self.accept(')'):
+                    break
+                self.expect(',')
+        if wrapped and not closed_early:
+            self.expect(')')
+        self.finish()
+
+        env = dict.fromkeys(params)
+        env.update(zip(params, args))
+        for container, key, ref in self.holes:
+            container[key] = env[ref.name]
+        for target, path, value in assignments:
+            obj = env[target]
+            for key in path[:-1]:
+                obj = obj[key]
+            obj[path[-1]] = env[value.name] if type(value) is _Ref else value
+        if type(result) is _Ref:
+            result = env[result.name]
+        return result
+
+    def finish(self) -> None:
+        self.accept(';')
+        self.skip_ws()
+        if self.pos != len(self.text):
+            self.error("Unexpected trailing content")
+
+    def assignment(self):
+        """Parse ``a.b[0].c=value;`` statements that precede ``return`` in the IIFE body."""
+        target = self.ident()
+        path = []
+        while True:
+            if self.accept('.'):
+                path.append(self.ident())
+            elif self.accept('['):
+                key = self.value()
+                if type(key) is _Ref or isinstance(key, (dict, list)):
+                    self.error("Unsupported computed member")
+                path.append(int(key) if isinstance(key, (int, float)) else key)
+                self.expect(']')
+            else:
+                break
+        if not path:
+            self.error("Unsupported assignment target")
+        self.expect('=')
+        value = self.value()
+        self.accept(';')
+        return target, path, value
+
+    # ------------------------------------------------------------------- values
+
+    def value(self):
+        self.skip_ws()
+        text = self.text
+        ch = text[self.pos:self.pos + 1]
+        if ch == '{':
+            return self.object()
+        if ch == '[':
+            return self.array()
+        if ch == '"':
+            value, self.pos = _scanstring(text, self.pos + 1)
+            return value
+        if ch == "'":
+            return self.single_quoted()
+        if ch == '!':
+            # minified booleans: !0 / !1
+            self.pos += 1
+            operand = self.value()
+            if type(operand) is _Ref or isinstance(operand, (dict, list)):
+                self.error("Unsupported negation")
+            return not operand
+        if ch == '-' or ch == '.' or ch.isdigit():
+            return self.number()
+        match = _IDENT.match(text, self.pos)
+        if not match:
+            self.error("Unexpected token")
+        name = match.group(0)
+        self.pos = match.end()
+        if name in _CONSTANTS:
+            return _CONSTANTS[name]
+        if name == 'void':
+            self.value()
+            return None
+        if self.allow_refs:
+            return _Ref(name)
+        self.error(f"Unsupported identifier {name!r}")
+
+    def number(self):
+        match = _NUMBER.match(self.text, self.pos)
+        if not match:
+            self.error("Invalid number")
+        self.pos = match.end()
+        literal = match.group(0)
+        if literal.lstrip('-')[:2] in ('0x', '0X'):
+            return int(literal, 16)
+        value = float(literal)
+        # js2py hands back integral JS numbers as Python ints
+        if value.is_integer():
+            return int(value)
+        return value
+
+    def single_quoted(self) -> str:
+        text = self.text
+        start = self.pos + 1
+        end = start
+        while True:
+            end = text.index("'", end)
+            backslashes = 0
+            while text[end - 1 - backslashes] == '\\':
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            end += 1
+        self.pos = end + 1
+        raw = text[start:end]
+        if '\\' not in raw:
+            return raw
+        return _SINGLE_QUOTED_ESCAPE.sub(_unescape, raw)
+
+    def object(self) -> dict:
+        self.pos += 1
+        obj = {}
+        if self.accept('}'):
+            return obj
+        text = self.text
+        holes = self.holes
+        while True:
+            self.skip_ws()
+            ch = text[self.pos:self.pos + 1]
+            if ch == '"':
+                key, self.pos = _scanstring(text, self.pos + 1)
+            elif ch == "'":
+                key = self.single_quoted()
+            elif ch.isdigit():
+                key = str(self.number())
+            else:
+                key = self.ident()
+            self.expect(':')
+            value = self.value()
+            if type(value) is _Ref:
+                holes.append((obj, key, value))
+            obj[key] = value
+            if self.accept(','):
+                if self.accept('}'):
+                    return obj
+                continue
+            self.expect('}')
+            return obj
+
+    def array(self) -> list:
+        self.pos += 1
+        arr = []
+        if self.accept(']'):
+            return arr
+        holes = self.holes
+        while True:
+            if self.peek() == ',':
+                self.error("Sparse arrays are not supported")
+            value = self.value()
+            if type(value) is _Ref:
+                holes.append((arr, len(arr), value))
+            arr.append(value)
+            if self.accept(','):
+                if self.accept(']'):
+                    return arr
+                continue
+            self.expect(']')
+            return arr
+
+
+def _unescape(match: re.Match) -> str:
+    esc = match.group(1)
+    if esc.startswith('u{'):
+        return chr(int(esc[2:-1], 16))
+    if esc[0] in 'ux' and len(esc) > 1:
+        return chr(int(esc[1:], 16))
+    if esc in '\r\n':
+        # line continuation
+        return ''
+    return _SIMPLE_ESCAPES.get(esc, esc)
@@ -0,0 +1,271 @@
+"""
+Output sinks that write scraped jobs incrementally, one record at a time.
+
+- ``csv``: user-friendly column names, fixed header, nested fields JSON-encoded
+- ``jsonl``: one JSON object per line, nested fields kept as-is
+- ``parquet``: fixed typed schema, written in row groups (optional ``pip install pyarrow``)
+
+Every sink has ``write(job)`` and ``close()`` and can be used as a context manager.
+Formats whose optional dependency is missing fall back to ``jsonl`` with a warning.
+"""
+import csv
+import datetime
+from abc import ABC, abstractmethod
+import json
+import logging
+import os
+
+logger = logging.getLogger("Upwork")
+
+OUTPUT_FORMATS = ('csv', 'jsonl', 'parquet')
+DEFAULT_OUTPUT_FORMAT = 'csv'
+DEFAULT_OUTPUT_DIR = os.path.join('data', 'jobs')
+
+# Every column a job record can have, in output order. Fixed so that incremental writers
+# (CSV header, Parquet schema) do not depend on which fields the first job happened to have.
+JOB_COLUMNS = (
+    'job_id', 'url', 'title', 'description', 'type', 'duration', 'level', 'currency',
+    'fixed_budget_amount', 'hourly_min', 'hourly_max',
+    'category', 'category_name', 'category_urlSlug', 'categoryGroup_name', 'categoryGroup_urlSlug',
+    'skills', 'questions', 'qualifications',
+    'applicants', 'clientActivity_totalHired', 'clientActivity_totalInvitedToInterview',
+    'clientActivity_invitationsSent', 'clientActivity_unansweredInvites', 'connects_required',
+    'payment_verified', 'phone_verified', 'enterpriseJob', 'isContractToHire', 'premium',
+    'contractorTier', 'numberOfPositionsToHire',
+    'ts_create', 'ts_publish', 'lastBuyerActivity',
+    'client_country', 'client_industry', 'client_company_size', 'client_total_spent', 'client_hires',
+    'client_rating', 'client_reviews',
+    'buyer_company_contractDate', 'buyer_location_city', 'buyer_location_localTime',
+    'buyer_location_countryTimezone', 'buyer_location_offsetFromUtcMillis',
+    'buyer_jobs_postedCount', 'buyer_jobs_openCount', 'buyer_avgHourlyJobsRate_amount',
+    'buyer_stats_hoursCount', 'buyer_stats_totalJobsWithHires', 'buyer_stats_activeAssignmentsCount',
+    'total_reviews_count',
+) + tuple(
+    f'client_review_{i}_{field}'
+    for i in (1, 2, 3)
+    for field in ('project_title', 'rating', 'stars', 'text', 'freelancer_name', 'freelancer_rating',
+                  'date_range', 'project_type', 'budget')
+) + ('matched_queries',)
+
+# Parquet column types; columns not listed are strings, nested structures are JSON-encoded
+_FLOAT_COLUMNS = {'fixed_budget_amount', 'hourly_min', 'hourly_max', 'buyer_avgHourlyJobsRate_amount', 'buyer_stats_hoursCount'}
+_INT_COLUMNS = {
+    'applicants', 'clientActivity_totalHired', 'clientActivity_totalInvitedToInterview',
+    'clientActivity_invitationsSent', 'clientActivity_unansweredInvites', 'connects_required',
+    'contractorTier', 'numberOfPositionsToHire', 'buyer_location_offsetFromUtcMillis',
+    'buyer_jobs_postedCount', 'buyer_jobs_openCount', 'buyer_stats_totalJobsWithHires',
+    'buyer_stats_activeAssignmentsCount', 'total_reviews_count',
+}
+_BOOL_COLUMNS = {'payment_verified', 'phone_verified', 'enterpriseJob', 'isContractToHire', 'premium'}
+_LIST_COLUMNS = {'skills', 'matched_queries'}
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _flat_value(value):
+    """Value for a flat (CSV) cell: nested structures become JSON, scalars are kept."""
+    if isinstance(value, (list, dict)):
+        return _json(value)
+    return value
+
+
+class _Sink(ABC):
+    extension = ''
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._unknown_columns = set()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _warn_unknown(self, job: dict) -> None:
+        unknown = job.keys() - set(JOB_COLUMNS) - self._unknown_columns
+        if unknown:
+            self._unknown_columns |= unknown
+            logger.warning(f"⚠️ {os.path.basename(self.path)}: columns {sorted(unknown)} are not in the output schema and are left out")
+
+    @abstractmethod
+    def write(self, job: dict) -> None:
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+
+class JsonlSink(_Sink):
+    extension = 'jsonl'
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, job: dict) -> None:
+        self._file.write(_json(job) + '\n')
+        # keep the file readable by tail -f while a long run or watch is in progress
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvSink(_Sink):
+    extension = 'csv'
+
+    def __init__(self, path: str, rename=None):
+        """
+        :param path: Output file
+        :param rename: Function mapping a job dict to a dict with user-friendly column names
+        """
+        super().__init__(path)
+        self.rename = rename or (lambda job: job)
+        # same column order as before: user-friendly names, sorted
+        self.columns = sorted(self.rename(dict.fromkeys(JOB_COLUMNS)))
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction='ignore')
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, job: dict) -> None:
+        self._warn_unknown(job)
+        self._writer.writerow({key: _flat_value(value) for key, value in self.rename(job).items()})
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink(_Sink):
+    extension = 'parquet'
+
+    def __init__(self, path: str, row_group_size: int = 500):
+        """
+        :param path: Output file
+        :param row_group_size: Records buffered before a row group is written
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path)
+        self._pa = pa
+        self.schema = parquet_schema()
+        self.row_group_size = max(1, row_group_size)
+        self._rows = []
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, job: dict) -> None:
+        self._warn_unknown(job)
+        self._rows.append({column: _parquet_value(column, job.get(column)) for column in JOB_COLUMNS})
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def parquet_schema():
+    """Fixed Arrow schema of the Parquet output."""
+    import pyarrow as pa
+
+    fields = []
+    for column in JOB_COLUMNS:
+        if column in _FLOAT_COLUMNS:
+            fields.append(pa.field(column, pa.float64()))
+        elif column in _INT_COLUMNS:
+            fields.append(pa.field(column, pa.int64()))
+        elif column in _BOOL_COLUMNS:
+            fields.append(pa.field(column, pa.bool_()))
+        elif column in _LIST_COLUMNS:
+            fields.append(pa.field(column, pa.list_(pa.string())))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def _parquet_value(column: str, value):
+    if value is None:
+        return None
+    try:
+        if column in _FLOAT_COLUMNS:
+            return float(value)
+        if column in _INT_COLUMNS:
+            return int(float(value))
+        if column in _BOOL_COLUMNS:
+            return value if isinstance(value, bool) else str(value).strip().lower() in ('true', '1', 'yes')
+    except (TypeError, ValueError):
+        # e.g. a text fallback like "5 to 10" in a numeric column
+        logger.debug(f"Unparseable value {value!r} for column {column}, writing null")
+        return None
+    if column in _LIST_COLUMNS:
+        return [str(item) for item in value] if isinstance(value, list) else [str(value)]
+    if isinstance(value, (list, dict)):
+        return _json(value)
+    return str(value)
+
+
+def resolve_output_formats(value) -> list[str]:
+    """
+    Validate the ``general.output`` option: a format name, a list of them, or None for the default.
+
+    :param value: Requested format(s)
+    :type value: str or list[str] or None
+    :return: Usable format names, without duplicates
+    :rtype: list[str]
+    """
+    requested = value if isinstance(value, list) else [value or DEFAULT_OUTPUT_FORMAT]
+    formats = []
+    for name in requested:
+        name = str(name).strip().lower()
+        if name not in OUTPUT_FORMATS:
+            logger.warning(f"Unknown output format '{name}', using '{DEFAULT_OUTPUT_FORMAT}'. Options: {', '.join(OUTPUT_FORMATS)}")
+            name = DEFAULT_OUTPUT_FORMAT
+        if name == 'parquet':
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                logger.warning("pyarrow is not installed, writing 'jsonl' instead of 'parquet'")
+                name = 'jsonl'
+        if name not in formats:
+            formats.append(name)
+    return formats
+
+
+def open_sinks(formats: list[str], output_dir: str = DEFAULT_OUTPUT_DIR, prefix: str = 'job_results', rename=None) -> list:
+    """
+    Open one sink per format, writing to ``<output_dir>/<format>/<prefix>_<timestamp>.<ext>``.
+
+    :param formats: Format names from resolve_output_formats
+    :param output_dir: Base output directory
+    :param prefix: File name prefix
+    :param rename: Column renaming function used by the CSV sink
+    :return: Open sinks
+    """
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    sinks = []
+    for fmt in formats:
+        path = os.path.join(output_dir, fmt, f"{prefix}_{timestamp}.{fmt}")
+        if fmt == 'csv':
+            sinks.append(CsvSink(path, rename))
+        elif fmt == 'parquet':
+            sinks.append(ParquetSink(path))
+        else:
+            sinks.append(JsonlSink(path))
+    return sinks
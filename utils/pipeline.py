@@ -0,0 +1,118 @@
+"""
+Two-stage fetch/parse pipeline.
+
+Network fetches run as asyncio tasks and feed raw payloads through a bounded
+queue into parser workers that run on an executor (normally a
+``ProcessPoolExecutor``), so downloading and CPU-heavy parsing overlap and
+parsing scales with cores instead of being serialized by the GIL.
+"""
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Iterable
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+logger = logging.getLogger("Upwork")
+
+_DONE = object()
+
+
+async def _iterate(items):
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def fetch_parse_pipeline(
+        items: Iterable | AsyncIterable,
+        fetch: Callable[[Any], Awaitable[Any]],
+        parse: Callable[[Any, Any], Any],
+        fetch_concurrency: int = 25,
+        executor: Optional[Executor] = None,
+        parse_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        on_parse_error: Optional[Callable[[Any, Exception], None]] = None
+) -> AsyncIterator[Any]:
+    """
+    Fetch every item concurrently and parse the fetched payloads on an executor, yielding parsed results as they finish
+
+    :param items: Work items (e.g. URLs), sync or async iterable
+    :param fetch: Coroutine function ``fetch(item)`` returning a payload, or None if the fetch failed
+    :param parse: Picklable function ``parse(item, payload)`` run on the executor, returning a result or None
+    :param fetch_concurrency: Number of concurrent fetch tasks
+    :param executor: Executor for the parse stage (None uses the event loop's default thread pool)
+    :param parse_concurrency: Number of parses submitted to the executor at once (defaults to the executor's worker count)
+    :param queue_size: Capacity of the bounded queues between stages (defaults to twice the fetch concurrency)
+    :param on_parse_error: Called with the item and the exception when a parse raises; the item is skipped and the pipeline goes on
+    :return: Async iterator over non-None parse results, in completion order
+    """
+    loop = asyncio.get_running_loop()
+    fetch_concurrency = max(1, fetch_concurrency)
+    if parse_concurrency is None:
+        parse_concurrency = getattr(executor, '_max_workers', None) or 4
+    parse_concurrency = max(1, parse_concurrency)
+    queue_size = queue_size or fetch_concurrency * 2
+
+    item_queue = asyncio.Queue(maxsize=queue_size)
+    payload_queue = asyncio.Queue(maxsize=queue_size)
+    result_queue = asyncio.Queue(maxsize=queue_size)
+
+    async def feed():
+        async for item in _iterate(items):
+            await item_queue.put(item)
+        for _ in range(fetch_concurrency):
+            await item_queue.put(_DONE)
+
+    async def fetch_worker():
+        while (item := await item_queue.get()) is not _DONE:
+            payload = await fetch(item)
+            if payload is not None:
+                await payload_queue.put((item, payload))
+
+    async def parse_worker():
+        while (entry := await payload_queue.get()) is not _DONE:
+            item, payload = entry
+            try:
+                result = await loop.run_in_executor(executor, parse, item, payload)
+            except Exception as e:
+                # also a crashed worker process (BrokenProcessPool): the item fails, the pipeline goes on
+                logger.debug(f"Parse failed for {item}: {e!r}")
+                if on_parse_error is not None:
+                    on_parse_error(item, e)
+                continue
+            if result is not None:
+                await result_queue.put(result)
+
+    async def supervise():
+        try:
+            fetchers = [asyncio.create_task(fetch_worker()) for _ in range(fetch_concurrency)]
+            parsers = [asyncio.create_task(parse_worker()) for _ in range(parse_concurrency)]
+            try:
+                await asyncio.gather(feed(), *fetchers)
+                for _ in parsers:
+                    await payload_queue.put(_DONE)
+                await asyncio.gather(*parsers)
+            finally:
+                for task in fetchers + parsers:
+                    task.cancel()
+            await result_queue.put(_DONE)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await result_queue.put(e)
+
+    supervisor = asyncio.create_task(supervise())
+    try:
+        while (result := await result_queue.get()) is not _DONE:
+            if isinstance(result, Exception):
+                raise result
+            yield result
+    finally:
+        supervisor.cancel()
+        try:
+            await supervisor
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,134 @@
+"""
+Per-host token buckets that pace every outbound HTTP request of the process.
+
+Buckets live in a process-wide registry keyed by host and settings, so concurrent runs
+of the API servers with the same settings share one budget for www.upwork.com instead of
+each pacing on its own, and a run never changes the pace of another. The HTTP clients go through :func:`rate_limit_hook`, an httpx request event hook that
+waits for a token before the request is sent.
+
+The hook times the wait as the ``rate_limit_wait`` stage and notes it on the request, so code timing
+a request can leave it out with :func:`rate_limit_wait`.
+
+A bucket holds up to ``burst`` tokens and refills at ``rate`` tokens per second. A
+request takes one token; when none is left it reserves the next one and sleeps until
+it is due, so waiting requests are served in arrival order without a lock tied to an
+event loop.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Awaitable, Callable
+
+from utils import timing
+
+logger = logging.getLogger("Upwork")
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+
+# request extension holding the seconds the request waited for a token
+WAIT_EXTENSION = 'rate_limit_wait'
+
+
+class TokenBucket:
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """
+        :param rate: Tokens added per second
+        :param burst: Maximum number of tokens, i.e. requests that may start at once after an idle period
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.requests = 0
+        self.waited = 0.0
+        # the Flask server and tests may use several event loops in one process
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, borrowing against the refill if the bucket is empty.
+
+        :return: Seconds to wait before the request may be sent
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            self.requests += 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += delay
+            return delay
+
+    async def acquire(self) -> None:
+        """Wait until the request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        """Settings, requests paced and total time spent waiting."""
+        return {'rate': self.rate, 'burst': self.burst, 'requests': self.requests, 'waited_seconds': round(self.waited, 3)}
+
+
+_buckets: dict[tuple[str, float, int], TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def host_bucket(host: str, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST) -> TokenBucket:
+    """
+    Shared bucket of a host for the given settings. Callers asking for other settings get a bucket
+    of their own, so one run's options never re-pace the requests of another.
+
+    :param host: Host name, e.g. 'www.upwork.com'
+    :param rate: Requests per second
+    :param burst: Bucket capacity
+    :return: TokenBucket shared by the whole process
+    """
+    key = (host, float(rate), max(1, int(burst)))
+    with _registry_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            if any(other == host for other, _, _ in _buckets):
+                logger.debug(f"Separate rate limit for {host}: {rate:g}/s, burst {burst}")
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+
+def rate_limit_stats() -> dict[str, list[dict]]:
+    """Stats of every bucket, grouped by host."""
+    with _registry_lock:
+        stats = {}
+        for (host, _, _), bucket in _buckets.items():
+            stats.setdefault(host, []).append(bucket.stats())
+        return stats
+
+
+def rate_limit_hook(rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST) -> Callable[..., Awaitable[None]]:
+    """
+    httpx request event hook that paces requests through the bucket of their host.
+
+    :param rate: Requests per second per host
+    :param burst: Bucket capacity per host
+    :return: Coroutine function for ``httpx.AsyncClient(event_hooks={'request': [...]})``
+    """
+    async def hook(request) -> None:
+        with timing.stage('rate_limit_wait') as sample:
+            await host_bucket(request.url.host, rate, burst).acquire()
+        request.extensions[WAIT_EXTENSION] = sample.seconds
+
+    return hook
+
+
+def rate_limit_wait(response) -> float:
+    """
+    Seconds the request of a response waited for a rate limit token.
+
+    :param response: httpx.Response
+    :return: Seconds, 0 if the request was not paced
+    """
+    return response.request.extensions.get(WAIT_EXTENSION, 0.0)
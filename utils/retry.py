@@ -0,0 +1,102 @@
+"""
+Failure classes, jittered retry delays and a shared session renewal for job page fetches.
+
+A failed fetch is classified as one of the kinds below. Network errors, retryable HTTP
+statuses and pages without Nuxt data are retried after a jittered exponential delay.
+Challenge pages and login redirects mean the session itself is no longer accepted: the
+first fetch that sees one renews the session for everybody through :class:`SessionRenewer`,
+while the others wait for it and then retry with the new cookies.
+"""
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import Awaitable, Callable
+
+from utils import metrics
+
+logger = logging.getLogger("Upwork")
+
+NETWORK = 'network'
+HTTP_STATUS = 'http_status'
+CHALLENGE = 'challenge'
+NUXT_MISSING = 'nuxt_missing'
+# not a fetch failure: the page was downloaded but parsing it raised
+PARSE_ERROR = 'parse_error'
+
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    :param value: Retry-After header, in seconds or as an HTTP date
+    :return: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0, retry_after: float | None = None) -> float:
+    """
+    Full-jitter exponential delay, so retries of many failed requests do not arrive together.
+
+    :param attempt: Retry number, starting at 1
+    :param base: Upper bound of the first delay in seconds
+    :param cap: Upper bound of any delay in seconds
+    :param retry_after: Delay requested by the server, used as a minimum
+    :return: Seconds to wait before the retry
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+class SessionRenewer:
+    def __init__(self, renew_fn: Callable[[], Awaitable[None]], max_renewals: int = 1):
+        """
+        :param renew_fn: Coroutine function that logs in again and updates the shared client in place
+        :param max_renewals: Number of renewals allowed before challenges count as failures
+        """
+        self.renew_fn = renew_fn
+        self.max_renewals = max_renewals
+        self.renewals = 0
+        # bumped by every successful renewal; fetches remember the generation they were sent with
+        self.generation = 0
+        self._lock = asyncio.Lock()
+
+    async def renew(self, generation: int) -> bool:
+        """
+        Renew the session, unless another fetch already did since ``generation``.
+
+        :param generation: Value of ``generation`` when the rejected request was sent
+        :return: True if the request should be retried with the renewed session
+        """
+        async with self._lock:
+            if self.generation != generation:
+                return True
+            if self.renewals >= self.max_renewals:
+                return False
+            self.renewals += 1
+            logger.warning(f"🔁 Session rejected, logging in again ({self.renewals}/{self.max_renewals})...")
+            try:
+                await self.renew_fn()
+            except Exception as e:
+                logger.error(f"⚠️ Could not renew the session: {e}")
+                metrics.SESSION_RENEWALS.inc(outcome='failed')
+                # do not make every other rejected fetch try again
+                self.renewals = self.max_renewals
+                return False
+            self.generation += 1
+            metrics.SESSION_RENEWALS.inc(outcome='succeeded')
+            logger.info("✅ Session renewed, resuming")
+            return True
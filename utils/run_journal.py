@@ -0,0 +1,148 @@
+"""
+Append-only journal of a run, so a crashed or killed run can be resumed.
+
+Each run gets a directory ``<root>/<run_id>/`` holding the run's input (without the
+password) and ``journal.jsonl``, to which one line is appended, and flushed, for every
+job URL the searches found, every finished job record, the end of the search stage and
+the end of the run. Resuming replays the finished records and only fetches the URLs
+that have no record yet.
+"""
+import datetime
+import json
+import logging
+import os
+import shutil
+import uuid
+
+logger = logging.getLogger("Upwork")
+
+DEFAULT_JOURNAL_DIR = os.path.join('data', 'runs')
+
+
+def new_run_id() -> str:
+    return f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+class RunJournal:
+    def __init__(self, run_id: str, root: str = DEFAULT_JOURNAL_DIR):
+        """
+        :param run_id: Run ID, also the name of the run's directory
+        :param root: Directory the run directories are created in
+        """
+        self.run_id = run_id
+        self.directory = os.path.join(root, run_id)
+        self.path = os.path.join(self.directory, 'journal.jsonl')
+        self.input_path = os.path.join(self.directory, 'input.json')
+        # state replayed from an existing journal
+        self.urls: dict[str, list[str]] = {}
+        self.jobs: dict[str, dict] = {}
+        self.reused: set[str] = set()
+        self.search_done = False
+        self.finished = False
+        self._file = None
+
+    @classmethod
+    def create(cls, json_input: dict, root: str = DEFAULT_JOURNAL_DIR) -> 'RunJournal':
+        """
+        Start the journal of a new run.
+
+        :param json_input: Input of the run; the password is not written
+        :param root: Directory the run directories are created in
+        :return: Open journal
+        """
+        journal = cls(new_run_id(), root)
+        os.makedirs(journal.directory, exist_ok=True)
+        credentials = dict(json_input.get('credentials') or {})
+        credentials.pop('password', None)
+        with open(journal.input_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(json_input, credentials=credentials), f, ensure_ascii=False, indent=2, default=str)
+        journal._open()
+        return journal
+
+    @classmethod
+    def resume(cls, run_id: str, root: str = DEFAULT_JOURNAL_DIR) -> 'RunJournal':
+        """
+        Reopen the journal of an earlier run and replay its state.
+
+        :param run_id: ID of the run to resume
+        :param root: Directory the run directories are in
+        :return: Open journal
+        :raises FileNotFoundError: If the run has no journal
+        """
+        journal = cls(run_id, root)
+        if not os.path.exists(journal.path):
+            raise FileNotFoundError(f"No journal for run {run_id} in {root}")
+        with open(journal.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line may be cut off by the crash
+                    logger.debug(f"Skipping unreadable journal line in {journal.path}")
+                    continue
+                journal._replay(entry)
+        journal._open()
+        return journal
+
+    def _replay(self, entry: dict) -> None:
+        kind = entry.get('type')
+        if kind == 'url':
+            labels = self.urls.setdefault(entry['url'], [])
+            labels.extend(label for label in entry.get('queries', []) if label not in labels)
+        elif kind == 'job':
+            self.jobs[entry['record']['url']] = entry['record']
+            if entry.get('reused'):
+                self.reused.add(entry['record']['url'])
+        elif kind == 'search_done':
+            self.search_done = True
+        elif kind == 'finished':
+            self.finished = True
+
+    def _open(self) -> None:
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _append(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        # a crash must not lose what was already written
+        self._file.flush()
+
+    def load_input(self) -> dict:
+        """Input the run was started with (without the password)."""
+        with open(self.input_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def pending_urls(self) -> list[str]:
+        """URLs found by the searches that have no finished record yet, in the order they were found."""
+        return [url for url in self.urls if url not in self.jobs]
+
+    def record_url(self, url: str, queries: list[str]) -> None:
+        self.urls[url] = list(queries)
+        self._append({'type': 'url', 'url': url, 'queries': list(queries)})
+
+    def record_job(self, job: dict, reused: bool = False) -> None:
+        self.jobs[job['url']] = job
+        entry = {'type': 'job', 'record': job}
+        if reused:
+            self.reused.add(job['url'])
+            entry['reused'] = True
+        self._append(entry)
+
+    def record_search_done(self) -> None:
+        self.search_done = True
+        self._append({'type': 'search_done', 'urls': len(self.urls)})
+
+    def finish(self, keep: bool = False) -> None:
+        """
+        Mark the run as finished and close the journal.
+
+        :param keep: Keep the run directory; by default it is removed, as a finished run needs no resume
+        """
+        self.finished = True
+        self._append({'type': 'finished', 'jobs': len(self.jobs)})
+        self.close()
+        if not keep:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def close(self) -> None:
+        if self._file and not self._file.closed:
+            self._file.close()
@@ -0,0 +1,136 @@
+"""
+Local queue of scraper runs for the API servers.
+
+Callers submit a jsonInput and get a run ID back immediately; a fixed number of
+worker tasks execute the queued runs, and the status, progress counters and
+results of each run can be polled by ID. Finished runs are kept in memory until
+``keep_finished`` newer runs have finished.
+"""
+import asyncio
+import datetime
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger("Upwork")
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+class RunQueue:
+    def __init__(self, run_fn: Callable[[dict, dict], Awaitable[list]], concurrency: int = 2, keep_finished: int = 100):
+        """
+        :param run_fn: Coroutine function ``run_fn(json_input, progress)`` returning the run's results
+        :param concurrency: Number of runs executed at the same time
+        :param keep_finished: Number of finished runs whose status and results are kept
+        """
+        self.run_fn = run_fn
+        self.concurrency = max(1, concurrency)
+        self.keep_finished = max(1, keep_finished)
+        self._runs: OrderedDict[str, dict] = OrderedDict()
+        self._results: dict[str, list] = {}
+        self._pending: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._pending = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Cancel the workers. Runs still queued or running are marked as failed."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for run in list(self._runs.values()):
+            if run['status'] in (QUEUED, RUNNING):
+                self._finish(run, FAILED, error='Server shut down before the run finished')
+
+    async def submit(self, json_input: dict) -> dict:
+        """
+        Queue a run.
+
+        :param json_input: Input for the scraper, as accepted by main.main
+        :return: Status of the new run
+        """
+        self.start()
+        run_id = uuid.uuid4().hex
+        run = {
+            'run_id': run_id,
+            'status': QUEUED,
+            'submitted_at': _now(),
+            'started_at': None,
+            'finished_at': None,
+            'progress': {},
+            'count': None,
+            'error': None,
+        }
+        self._runs[run_id] = run
+        await self._pending.put((run_id, json_input))
+        logger.info(f"📥 Queued run {run_id} ({self._pending.qsize()} waiting)")
+        return self.status(run_id)
+
+    def status(self, run_id: str) -> dict | None:
+        """
+        :param run_id: Run ID returned by submit
+        :return: Copy of the run's status (with its queue position while queued), or None if unknown
+        """
+        run = self._runs.get(run_id)
+        if run is None:
+            return None
+        status = dict(run, progress=dict(run['progress']))
+        if run['status'] == QUEUED:
+            queued = [r for r in self._runs.values() if r['status'] == QUEUED]
+            status['position'] = queued.index(run) + 1
+        return status
+
+    def results(self, run_id: str) -> list | None:
+        """
+        :param run_id: Run ID returned by submit
+        :return: Results of a succeeded run, or None if the run is unknown or has not succeeded
+        """
+        return self._results.get(run_id)
+
+    def list_runs(self) -> list[dict]:
+        """Status of every known run, oldest first."""
+        return [self.status(run_id) for run_id in self._runs]
+
+    async def _worker(self) -> None:
+        while True:
+            run_id, json_input = await self._pending.get()
+            run = self._runs.get(run_id)
+            if run is None:
+                continue
+            run['status'] = RUNNING
+            run['started_at'] = _now()
+            logger.info(f"🏃 Starting run {run_id}")
+            try:
+                results = await self.run_fn(json_input, run['progress'])
+            except asyncio.CancelledError:
+                raise
+            except (Exception, SystemExit) as e:
+                # main() exits on fatal errors; that must only fail this run, not the server
+                logger.error(f"⚠️ Run {run_id} failed: {e!r}")
+                error = (str(e) or type(e).__name__) if isinstance(e, Exception) else 'Scraper exited with an error, see the server log'
+                self._finish(run, FAILED, error=error)
+            else:
+                self._results[run_id] = results
+                self._finish(run, SUCCEEDED, count=len(results))
+
+    def _finish(self, run: dict, status: str, **fields: Any) -> None:
+        run.update(status=status, finished_at=_now(), **fields)
+        finished = [r for r, v in self._runs.items() if v['status'] in (SUCCEEDED, FAILED)]
+        for run_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._runs[run_id]
+            self._results.pop(run_id, None)
@@ -0,0 +1,124 @@
+"""
+Encrypted on-disk store for browser sessions (cookies + user agent), keyed by account.
+
+Sessions are encrypted with Fernet. The key is read from the ``UPWORK_SESSION_KEY``
+environment variable, or generated once into a key file next to the vault
+(readable by the current user only).
+"""
+import datetime
+import json
+import logging
+import os
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+
+logger = logging.getLogger("Upwork")
+
+DEFAULT_VAULT_PATH = os.path.join('data', 'sessions', 'vault.bin')
+SESSION_KEY_ENV = 'UPWORK_SESSION_KEY'
+ANONYMOUS_ACCOUNT = 'anonymous'
+
+
+def account_key(username: str | None) -> str:
+    """
+    Vault key for an account: the lower-cased username, or 'anonymous' when running without login.
+
+    :param username: Upwork username/email, or None
+    :type username: str or None
+    :return: Vault key
+    :rtype: str
+    """
+    return username.strip().lower() if username else ANONYMOUS_ACCOUNT
+
+
+class SessionVault:
+    def __init__(self, path: str = DEFAULT_VAULT_PATH, key: bytes | str | None = None, max_age_hours: float = 24):
+        """
+        :param path: File holding the encrypted sessions
+        :param key: Fernet key (defaults to $UPWORK_SESSION_KEY, then a key file next to the vault)
+        :param max_age_hours: Sessions older than this are treated as missing
+        """
+        self.path = path
+        self.max_age = max_age_hours * 3600
+        self.fernet = Fernet(key or self._load_or_create_key())
+
+    def _load_or_create_key(self) -> bytes:
+        env_key = os.environ.get(SESSION_KEY_ENV)
+        if env_key:
+            return env_key.encode()
+        key_path = self.path + '.key'
+        if os.path.exists(key_path):
+            with open(key_path, 'rb') as f:
+                return f.read().strip()
+        os.makedirs(os.path.dirname(key_path) or '.', exist_ok=True)
+        key = Fernet.generate_key()
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+
+    def _read_all(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(self.fernet.decrypt(f.read()))
+        except (InvalidToken, ValueError) as e:
+            logger.warning(f"⚠️ Session vault {self.path} could not be decrypted, ignoring it: {e}")
+            return {}
+
+    def _write_all(self, sessions: dict) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.fernet.encrypt(json.dumps(sessions).encode()))
+        os.replace(tmp_path, self.path)
+
+    def load(self, account: str) -> dict | None:
+        """
+        Load a stored session, dropping cookies that have already expired.
+
+        :param account: Vault key (see account_key)
+        :return: Dict with 'cookies', 'user_agent' and 'saved_at', or None if missing/too old
+        """
+        session = self._read_all().get(account)
+        if not session:
+            return None
+        if time.time() - session.get('saved_ts', 0) > self.max_age:
+            logger.debug(f"Stored session for {account} is older than {self.max_age / 3600:g}h, ignoring it")
+            return None
+        now = time.time()
+        # Playwright uses -1 for session cookies
+        session['cookies'] = [c for c in session.get('cookies', []) if c.get('expires', -1) in (-1, None) or c['expires'] > now]
+        if not session['cookies']:
+            return None
+        return session
+
+    def save(self, account: str, cookies: list[dict], user_agent: str) -> None:
+        """
+        Store (or replace) the session of an account.
+
+        :param account: Vault key (see account_key)
+        :param cookies: Cookies as returned by Playwright's BrowserContext.cookies()
+        :param user_agent: User-agent of the browser the cookies belong to
+        """
+        sessions = self._read_all()
+        sessions[account] = {
+            'cookies': cookies,
+            'user_agent': user_agent,
+            'saved_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'saved_ts': time.time(),
+        }
+        self._write_all(sessions)
+
+    def discard(self, account: str) -> None:
+        """
+        Remove the session of an account, e.g. after the server rejected it.
+
+        :param account: Vault key (see account_key)
+        """
+        sessions = self._read_all()
+        if sessions.pop(account, None) is not None:
+            self._write_all(sessions)
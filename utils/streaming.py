@@ -0,0 +1,58 @@
+"""
+Event formatting for the streaming run endpoints.
+
+A stream carries one ``job`` event per scraped job, followed by a single
+``summary`` event (or an ``error`` event if the run failed). Two wire formats
+are supported:
+
+- ``ndjson``: one ``{"event": ..., "data": ...}`` JSON object per line
+- ``sse``: Server-Sent Events (``event: ...`` / ``data: ...`` blocks)
+"""
+import json
+import logging
+import time
+from typing import AsyncIterator
+
+logger = logging.getLogger("Upwork")
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream',
+}
+
+
+def format_event(event: str, data, fmt: str = 'ndjson') -> str:
+    """
+    Serialize one stream event.
+
+    :param event: Event name ('job', 'summary' or 'error')
+    :param data: JSON-serializable payload
+    :param fmt: Wire format, see STREAM_FORMATS
+    :return: Serialized event, including its trailing newline(s)
+    """
+    if fmt == 'sse':
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    return json.dumps({'event': event, 'data': data}, ensure_ascii=False, default=str) + "\n"
+
+
+async def iter_stream_events(jobs: AsyncIterator[dict], fmt: str = 'ndjson') -> AsyncIterator[str]:
+    """
+    Turn a stream of jobs into serialized events, ending with a summary (or error) event.
+
+    :param jobs: Async iterator over job dictionaries (see main.stream_jobs)
+    :param fmt: Wire format, see STREAM_FORMATS
+    :return: Async iterator over serialized events
+    """
+    start_time = time.time()
+    count = 0
+    try:
+        async for job in jobs:
+            count += 1
+            yield format_event('job', job, fmt)
+    except (Exception, SystemExit) as e:
+        # the response has already started, so failures can only be reported in-band
+        logger.error(f"⚠️ Streaming run failed: {e!r}")
+        error = (str(e) or type(e).__name__) if isinstance(e, Exception) else 'Scraper exited with an error, see the server log'
+        yield format_event('error', {'error': error, 'count': count}, fmt)
+        return
+    yield format_event('summary', {'count': count, 'elapsed_seconds': round(time.time() - start_time, 2)}, fmt)
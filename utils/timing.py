@@ -0,0 +1,153 @@
+"""
+Per-stage timings of a run, aggregated into the run report.
+
+Code times a stage with ``with stage('search_page') as sample:`` and may set ``sample.bytes``
+to the size of what the stage transferred, and ``sample.excluded`` to seconds inside the block that
+another stage already accounts for (e.g. the wait for a rate limit token). Samples go to the :class:`StageTimer` of the
+current run, which is found through a context variable, so runs sharing the event loop (the
+API's run queue) are kept apart and outside a run only the metric below is updated. Parse workers run in
+other processes: they time into a timer of their own and send its samples back with the
+result, and the run merges them with :func:`merge_samples`.
+
+Every sample is also observed into the process's ``upwork_stage_duration_seconds`` metric
+(see utils.metrics), including stages timed outside a run (e.g. streaming API runs).
+"""
+import collections
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Iterator
+
+from utils.metrics import STAGE_SECONDS
+
+_current: contextvars.ContextVar['StageTimer | None'] = contextvars.ContextVar('stage_timer', default=None)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted samples (0 for no samples)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))]
+
+
+class _Sample:
+    __slots__ = ('bytes', 'excluded', 'seconds')
+
+    def __init__(self):
+        self.bytes = 0
+        self.excluded = 0.0
+        # set when the block is over
+        self.seconds = 0.0
+
+
+class StageTimer:
+    def __init__(self, observe: bool = True):
+        """
+        :param observe: Also observe the samples into the stage duration metric; off for the timers of
+            parse workers, whose samples are observed when they are merged into the run's timer
+        """
+        self.observe = observe
+        self.started = time.time()
+        self._seconds: dict[str, list[float]] = collections.defaultdict(list)
+        self._bytes: collections.Counter = collections.Counter()
+        # stages are also timed from worker threads (search link extraction, in-process parsing)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, nbytes: int = 0) -> None:
+        with self._lock:
+            self._seconds[name].append(seconds)
+            if nbytes:
+                self._bytes[name] += nbytes
+        if self.observe:
+            STAGE_SECONDS.observe(seconds, stage=name)
+
+    def samples(self) -> dict[str, tuple[list[float], int]]:
+        """Raw samples as {stage: (seconds, bytes)}, picklable for merging into another timer."""
+        with self._lock:
+            return {name: (list(seconds), self._bytes[name]) for name, seconds in self._seconds.items()}
+
+    def merge(self, samples: dict[str, tuple[list[float], int]]) -> None:
+        with self._lock:
+            for name, (seconds, nbytes) in samples.items():
+                self._seconds[name].extend(seconds)
+                if nbytes:
+                    self._bytes[name] += nbytes
+        if self.observe:
+            _observe(samples)
+
+    def report(self) -> dict:
+        """
+        :return: Wall time since the timer was created, total bytes and, per stage in the order first
+            seen, the count, total seconds, p50/p95/max milliseconds and bytes transferred
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    'count': len(seconds),
+                    'total_seconds': round(sum(seconds), 3),
+                    'p50_ms': round(percentile(seconds, 50) * 1000, 1),
+                    'p95_ms': round(percentile(seconds, 95) * 1000, 1),
+                    'max_ms': round(max(seconds) * 1000, 1),
+                    'bytes': self._bytes[name],
+                }
+                for name, seconds in self._seconds.items()
+            }
+        return {
+            'elapsed_seconds': round(time.time() - self.started, 3),
+            'bytes_total': sum(stage['bytes'] for stage in stages.values()),
+            'stages': stages,
+        }
+
+
+def _observe(samples: dict[str, tuple[list[float], int]]) -> None:
+    for name, (seconds, _) in samples.items():
+        for value in seconds:
+            STAGE_SECONDS.observe(value, stage=name)
+
+
+def current_timer() -> StageTimer | None:
+    return _current.get()
+
+
+def merge_samples(samples: dict[str, tuple[list[float], int]]) -> None:
+    """Merge the samples of a parse worker into the current run's timer (only observe them outside a run)."""
+    timer = _current.get()
+    if timer is not None:
+        timer.merge(samples)
+    else:
+        _observe(samples)
+
+
+@contextlib.contextmanager
+def use_timer(timer: StageTimer) -> Iterator[StageTimer]:
+    """Make timer the current run's timer for the code (and the tasks it starts) inside the block."""
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[_Sample]:
+    """
+    Time the block as one sample of a stage, recorded into the current run's timer (outside a run it is
+    only observed into the stage duration metric). Blocks that raise are recorded too.
+
+    :param name: Stage name
+    :return: Sample whose ``bytes`` and ``excluded`` can be set inside the block, and that holds the recorded
+        ``seconds`` after it
+    """
+    sample = _Sample()
+    timer = _current.get()
+    start = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        seconds = sample.seconds = max(0.0, time.perf_counter() - start - sample.excluded)
+        if timer is not None:
+            timer.record(name, seconds, sample.bytes)
+        else:
+            STAGE_SECONDS.observe(seconds, stage=name)